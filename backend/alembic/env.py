@@ -16,7 +16,8 @@ from app.models import (
     content_pattern,
     strategy,
     user,
-    scraped_web_page
+    scraped_web_page,
+    analytics_snapshot
 )
 
 # this is the Alembic Config object, which provides
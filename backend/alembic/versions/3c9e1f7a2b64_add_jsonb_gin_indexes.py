@@ -0,0 +1,40 @@
+"""add_jsonb_gin_indexes
+
+Revision ID: 3c9e1f7a2b64
+Revises: f16c8d54a203
+Create Date: 2026-10-15 10:12:41.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1f7a2b64'
+down_revision: Union[str, Sequence[str], None] = 'f16c8d54a203'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, but avoids locking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_contentdraft_ai_analysis_gin', 'contentdraft', ['ai_analysis'],
+            postgresql_using='gin', postgresql_ops={'ai_analysis': 'jsonb_path_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_contentpattern_pattern_data_gin', 'contentpattern', ['pattern_data'],
+            postgresql_using='gin', postgresql_ops={'pattern_data': 'jsonb_path_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_contentpattern_pattern_data_gin', table_name='contentpattern', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_contentdraft_ai_analysis_gin', table_name='contentdraft', postgresql_concurrently=True, if_exists=True)
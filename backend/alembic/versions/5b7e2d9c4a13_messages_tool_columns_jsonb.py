@@ -0,0 +1,44 @@
+"""messages_tool_columns_jsonb
+
+Revision ID: 5b7e2d9c4a13
+Revises: 8d2a4c6e1f90
+Create Date: 2026-10-15 11:02:17.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2d9c4a13'
+down_revision: Union[str, Sequence[str], None] = '8d2a4c6e1f90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rewrites the table under an ACCESS EXCLUSIVE lock; run in a maintenance window
+    op.execute(
+        "ALTER TABLE messages "
+        "ALTER COLUMN tool_arguments TYPE jsonb USING tool_arguments::jsonb, "
+        "ALTER COLUMN tool_result TYPE jsonb USING tool_result::jsonb"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_tool_result_gin', 'messages', ['tool_result'],
+            postgresql_using='gin', postgresql_ops={'tool_result': 'jsonb_path_ops'},
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_messages_tool_result_gin', table_name='messages', postgresql_concurrently=True, if_exists=True)
+    op.execute(
+        "ALTER TABLE messages "
+        "ALTER COLUMN tool_arguments TYPE json USING tool_arguments::json, "
+        "ALTER COLUMN tool_result TYPE json USING tool_result::json"
+    )
@@ -0,0 +1,46 @@
+"""add_composite_lookup_indexes
+
+Revision ID: 8d2a4c6e1f90
+Revises: 3c9e1f7a2b64
+Create Date: 2026-10-15 11:02:17.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2a4c6e1f90'
+down_revision: Union[str, Sequence[str], None] = '3c9e1f7a2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, but avoids locking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_socialaccount_user_platform_active', 'socialaccount', ['user_id', 'platform'],
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_contentpattern_user_type_platform', 'contentpattern', ['user_id', 'pattern_type', 'platform'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_scraped_analytics_user_platform_scraped_at', 'scraped_analytics',
+            ['user_id', 'platform', sa.text('scraped_at DESC')],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_scraped_analytics_user_platform_scraped_at', table_name='scraped_analytics', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_contentpattern_user_type_platform', table_name='contentpattern', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_socialaccount_user_platform_active', table_name='socialaccount', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,41 @@
+"""add_brin_timestamp_indexes
+
+Revision ID: a4f6c8e2b1d7
+Revises: 5b7e2d9c4a13
+Create Date: 2026-10-15 11:20:05.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f6c8e2b1d7'
+down_revision: Union[str, Sequence[str], None] = '5b7e2d9c4a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BRIN_INDEXES = (
+    ('ix_contentperformance_recorded_at_brin', 'contentperformance', 'recorded_at'),
+    ('ix_scraped_analytics_scraped_at_brin', 'scraped_analytics', 'scraped_at'),
+    ('ix_messages_created_at_brin', 'messages', 'created_at'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, column in BRIN_INDEXES:
+            op.create_index(
+                name, table, [column],
+                postgresql_using='brin', postgresql_with={'pages_per_range': 32},
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(BRIN_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,34 @@
+"""strategyaction_expiring_index
+
+Revision ID: a5c7e9b1d3f6
+Revises: f4b6d8a0c2e5
+Create Date: 2026-10-15 15:08:39.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5c7e9b1d3f6'
+down_revision: Union[str, Sequence[str], None] = 'f4b6d8a0c2e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_strategyaction_expiring', 'strategyaction', ['expires_at'],
+            postgresql_where=sa.text("status = 'pending' AND expires_at IS NOT NULL"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_strategyaction_expiring', table_name='strategyaction', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,34 @@
+"""add_socialaccount_expiry_index
+
+Revision ID: a7c9e1b3d5f8
+Revises: f3a5c7e9b2d4
+Create Date: 2026-10-15 13:10:52.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c9e1b3d5f8'
+down_revision: Union[str, Sequence[str], None] = 'f3a5c7e9b2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_socialaccount_expiry_active', 'socialaccount', ['expires_at'],
+            postgresql_where=sa.text('is_active AND refresh_token_encrypted IS NOT NULL'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_socialaccount_expiry_active', table_name='socialaccount', postgresql_concurrently=True, if_exists=True)
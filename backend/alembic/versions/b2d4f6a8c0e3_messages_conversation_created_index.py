@@ -0,0 +1,38 @@
+"""messages_conversation_created_index
+
+Revision ID: b2d4f6a8c0e3
+Revises: a1c3e5f7b9d2
+Create Date: 2026-10-15 19:12:44.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6a8c0e3'
+down_revision: Union[str, Sequence[str], None] = 'a1c3e5f7b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build the composite first so conversation lookups never lose their index
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_conversation_created', 'messages', ['conversation_id', 'created_at'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index('ix_messages_conversation_id', table_name='messages', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_conversation_id', 'messages', ['conversation_id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index('ix_messages_conversation_created', table_name='messages', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,46 @@
+"""strategyaction_typed_outcome_columns
+
+Revision ID: b6d8f0a2c4e7
+Revises: a5c7e9b1d3f6
+Create Date: 2026-10-15 15:46:18.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d8f0a2c4e7'
+down_revision: Union[str, Sequence[str], None] = 'a5c7e9b1d3f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('strategyaction', sa.Column('actual_views', sa.Integer(), nullable=True))
+    op.add_column('strategyaction', sa.Column('actual_likes', sa.Integer(), nullable=True))
+    # Non-numeric values are left NULL rather than failing the cast
+    op.execute("""
+        UPDATE strategyaction SET
+            actual_views = CASE WHEN jsonb_typeof(actual_outcome::jsonb -> 'views') = 'number'
+                                THEN (actual_outcome ->> 'views')::numeric::int END,
+            actual_likes = CASE WHEN jsonb_typeof(actual_outcome::jsonb -> 'likes') = 'number'
+                                THEN (actual_outcome ->> 'likes')::numeric::int END
+        WHERE actual_outcome::jsonb ?| array['views', 'likes']
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_strategyaction_actual_views', 'strategyaction', ['actual_views'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_strategyaction_actual_views', table_name='strategyaction', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('strategyaction', 'actual_likes')
+    op.drop_column('strategyaction', 'actual_views')
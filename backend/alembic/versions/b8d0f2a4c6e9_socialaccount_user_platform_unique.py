@@ -0,0 +1,44 @@
+"""socialaccount_user_platform_unique
+
+Revision ID: b8d0f2a4c6e9
+Revises: a7c9e1b3d5f8
+Create Date: 2026-10-15 13:34:20.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d0f2a4c6e9'
+down_revision: Union[str, Sequence[str], None] = 'a7c9e1b3d5f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows left behind by the old select-then-insert race: keep the newest
+    op.execute("""
+        DELETE FROM socialaccount s
+        USING socialaccount newer
+        WHERE s.user_id = newer.user_id
+          AND s.platform = newer.platform
+          AND (s.updated_at, s.id) < (newer.updated_at, newer.id)
+    """)
+    # Build the index without blocking writes, then promote it to the constraint
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_socialaccount_user_platform', 'socialaccount', ['user_id', 'platform'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True
+        )
+    op.execute(
+        "ALTER TABLE socialaccount ADD CONSTRAINT uq_socialaccount_user_platform "
+        "UNIQUE USING INDEX uq_socialaccount_user_platform"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_socialaccount_user_platform', 'socialaccount', type_='unique')
@@ -0,0 +1,38 @@
+"""messages_content_lz4
+
+Revision ID: c2e8a1f4d6b9
+Revises: a4f6c8e2b1d7
+Create Date: 2026-10-15 11:41:33.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e8a1f4d6b9'
+down_revision: Union[str, Sequence[str], None] = 'a4f6c8e2b1d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _supports_lz4() -> bool:
+    # Column compression needs PostgreSQL 14+ built with lz4
+    version = op.get_bind().exec_driver_sql("SHOW server_version_num").scalar()
+    return int(version) >= 140000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Only affects newly written values; existing rows keep pglz until the
+    # table is rewritten (VACUUM FULL in a maintenance window).
+    # Check with: SELECT pg_column_compression(content) FROM messages LIMIT 10;
+    if _supports_lz4():
+        op.execute("ALTER TABLE messages ALTER COLUMN content SET COMPRESSION lz4")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _supports_lz4():
+        op.execute("ALTER TABLE messages ALTER COLUMN content SET COMPRESSION pglz")
@@ -0,0 +1,30 @@
+"""conversation_rolling_summary
+
+Revision ID: c3e5a7b9d1f4
+Revises: b2d4f6a8c0e3
+Create Date: 2026-10-15 19:48:03.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a7b9d1f4'
+down_revision: Union[str, Sequence[str], None] = 'b2d4f6a8c0e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('conversations', sa.Column('rolling_summary', sa.Text(), nullable=True))
+    op.add_column('conversations', sa.Column('summarized_through', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('conversations', 'summarized_through')
+    op.drop_column('conversations', 'rolling_summary')
@@ -0,0 +1,43 @@
+"""strategy_bigint_primary_keys
+
+Revision ID: c7e9a1b3d5f8
+Revises: b6d8f0a2c4e7
+Create Date: 2026-10-15 16:20:41.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e9a1b3d5f8'
+down_revision: Union[str, Sequence[str], None] = 'b6d8f0a2c4e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Nothing references these ids by foreign key, so the UUID can move to
+# public_id and a fresh identity column can take over as the primary key
+TABLES = ('strategyaction', 'contentprediction', 'weeklystrategy')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.alter_column(table, 'id', new_column_name='public_id')
+        op.drop_constraint(f'{table}_pkey', table, type_='primary')
+        op.create_index(f'ix_{table}_public_id', table, ['public_id'], unique=True)
+        op.add_column(table, sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False))
+        op.create_primary_key(f'{table}_pkey', table, ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_constraint(f'{table}_pkey', table, type_='primary')
+        op.drop_column(table, 'id')
+        op.drop_index(f'ix_{table}_public_id', table_name=table)
+        op.alter_column(table, 'public_id', new_column_name='id', existing_type=postgresql.UUID())
+        op.create_primary_key(f'{table}_pkey', table, ['id'])
@@ -0,0 +1,43 @@
+"""agentmemory_user_key_unique
+
+Revision ID: c9e1a3b5d7f0
+Revises: b8d0f2a4c6e9
+Create Date: 2026-10-15 14:02:44.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e1a3b5d7f0'
+down_revision: Union[str, Sequence[str], None] = 'b8d0f2a4c6e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicates from the old select-then-insert race: keep the newest
+    op.execute("""
+        DELETE FROM agentmemory m
+        USING agentmemory newer
+        WHERE m.user_id = newer.user_id
+          AND m.key = newer.key
+          AND (m.timestamp, m.id) < (newer.timestamp, newer.id)
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_agentmemory_user_key', 'agentmemory', ['user_id', 'key'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True
+        )
+    op.execute(
+        "ALTER TABLE agentmemory ADD CONSTRAINT uq_agentmemory_user_key "
+        "UNIQUE USING INDEX uq_agentmemory_user_key"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_agentmemory_user_key', 'agentmemory', type_='unique')
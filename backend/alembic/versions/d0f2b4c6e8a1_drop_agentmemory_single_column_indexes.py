@@ -0,0 +1,32 @@
+"""drop_agentmemory_single_column_indexes
+
+Revision ID: d0f2b4c6e8a1
+Revises: c9e1a3b5d7f0
+Create Date: 2026-10-15 14:21:07.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0f2b4c6e8a1'
+down_revision: Union[str, Sequence[str], None] = 'c9e1a3b5d7f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # uq_agentmemory_user_key serves (user_id, key) and user_id-only lookups
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_agentmemory_key', table_name='agentmemory', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_agentmemory_user_id', table_name='agentmemory', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_agentmemory_user_id', 'agentmemory', ['user_id'], postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_agentmemory_key', 'agentmemory', ['key'], postgresql_concurrently=True, if_not_exists=True)
@@ -0,0 +1,71 @@
+"""enum_status_columns
+
+Revision ID: d8f0b2c4e6a9
+Revises: c7e9a1b3d5f8
+Create Date: 2026-10-15 16:48:03.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f0b2c4e6a9'
+down_revision: Union[str, Sequence[str], None] = 'c7e9a1b3d5f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, enum type, values; the first value is the default)
+ENUM_COLUMNS = (
+    ('strategyaction', 'status', 'action_status', ('pending', 'taken', 'skipped', 'expired')),
+    ('strategyaction', 'category', 'action_category', ('content', 'timing', 'platform', 'engagement')),
+    ('contentprediction', 'status', 'prediction_status', ('predicted', 'posted', 'measured')),
+    ('user', 'tier', 'user_tier', ('free', 'pro', 'enterprise')),
+)
+
+# Partial indexes whose predicates reference a converted column
+PARTIAL_INDEXES = (
+    ('ix_strategyaction_pending', 'strategyaction', ['user_id', 'recommended_time'], "status = 'pending'"),
+    ('ix_strategyaction_expiring', 'strategyaction', ['expires_at'], "status = 'pending' AND expires_at IS NOT NULL"),
+    ('ix_contentprediction_unmeasured', 'contentprediction', ['user_id', 'planned_post_time'], "status <> 'measured'"),
+)
+
+
+def _drop_partial_indexes() -> None:
+    for name, table, _, _ in PARTIAL_INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+
+def _create_partial_indexes() -> None:
+    for name, table, columns, predicate in PARTIAL_INDEXES:
+        op.create_index(name, table, columns, postgresql_where=sa.text(predicate))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The column type changes rewrite these tables anyway, so the partial
+    # indexes are rebuilt in the same transaction rather than concurrently
+    _drop_partial_indexes()
+    for table, column, type_name, values in ENUM_COLUMNS:
+        postgresql.ENUM(*values, name=type_name).create(op.get_bind(), checkfirst=True)
+        # Anything outside the documented values falls back to the default
+        op.execute(
+            sa.text(f'UPDATE "{table}" SET {column} = :default WHERE {column} IS NULL OR {column} <> ALL(:values)')
+            .bindparams(default=values[0], values=list(values))
+        )
+        op.execute(f'ALTER TABLE "{table}" ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name}')
+        op.alter_column(table, column, server_default=values[0], nullable=False)
+    _create_partial_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _drop_partial_indexes()
+    for table, column, type_name, _ in ENUM_COLUMNS:
+        op.alter_column(table, column, server_default=None)
+        op.execute(f'ALTER TABLE "{table}" ALTER COLUMN {column} TYPE VARCHAR USING {column}::text')
+        postgresql.ENUM(name=type_name).drop(op.get_bind(), checkfirst=True)
+    _create_partial_indexes()
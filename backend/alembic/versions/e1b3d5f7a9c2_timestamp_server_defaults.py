@@ -0,0 +1,56 @@
+"""timestamp_server_defaults
+
+Revision ID: e1b3d5f7a9c2
+Revises: c2e8a1f4d6b9
+Create Date: 2026-10-15 12:05:48.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b3d5f7a9c2'
+down_revision: Union[str, Sequence[str], None] = 'c2e8a1f4d6b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMP_COLUMNS = (
+    ('user', 'created_at'),
+    ('user', 'updated_at'),
+    ('agentmemory', 'timestamp'),
+    ('contentdraft', 'created_at'),
+    ('contentperformance', 'recorded_at'),
+    ('contentpattern', 'created_at'),
+    ('contentpattern', 'updated_at'),
+    ('patternrecommendation', 'created_at'),
+    ('contentprediction', 'created_at'),
+    ('conversations', 'created_at'),
+    ('conversations', 'last_message_at'),
+    ('messages', 'created_at'),
+    ('agent_contexts', 'created_at'),
+    ('scraped_analytics', 'scraped_at'),
+    ('scraped_analytics', 'created_at'),
+    ('scraped_web_page', 'scraped_at'),
+    ('scraped_web_page', 'created_at'),
+    ('socialaccount', 'created_at'),
+    ('socialaccount', 'updated_at'),
+    ('weeklystrategy', 'created_at'),
+    ('weeklystrategy', 'updated_at'),
+    ('strategyaction', 'created_at'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Catalog-only change: no table rewrite, existing rows untouched
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, server_default=sa.text("timezone('utc', now())"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, server_default=None)
@@ -0,0 +1,47 @@
+"""strategy_jsonb_gin_indexes
+
+Revision ID: e2a4c6e8b0d3
+Revises: d0f2b4c6e8a1
+Create Date: 2026-10-15 14:40:31.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a4c6e8b0d3'
+down_revision: Union[str, Sequence[str], None] = 'd0f2b4c6e8a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSONB_COLUMNS = (
+    ('ix_strategyaction_actual_outcome_gin', 'strategyaction', 'actual_outcome'),
+    ('ix_contentprediction_prediction_factors_gin', 'contentprediction', 'prediction_factors'),
+    ('ix_weeklystrategy_insights_gin', 'weeklystrategy', 'insights'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for _, table, column in JSONB_COLUMNS:
+        op.execute(f"UPDATE {table} SET {column} = '{{}}' WHERE {column} IS NULL")
+        op.alter_column(table, column, server_default=sa.text("'{}'"), nullable=False)
+    with op.get_context().autocommit_block():
+        for name, table, column in JSONB_COLUMNS:
+            op.create_index(
+                name, table, [column],
+                postgresql_using='gin', postgresql_ops={column: 'jsonb_path_ops'},
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(JSONB_COLUMNS):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    for _, table, column in JSONB_COLUMNS:
+        op.alter_column(table, column, server_default=None, nullable=True)
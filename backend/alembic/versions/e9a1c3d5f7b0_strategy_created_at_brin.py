@@ -0,0 +1,41 @@
+"""strategy_created_at_brin
+
+Revision ID: e9a1c3d5f7b0
+Revises: d8f0b2c4e6a9
+Create Date: 2026-10-15 17:30:26.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9a1c3d5f7b0'
+down_revision: Union[str, Sequence[str], None] = 'd8f0b2c4e6a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BRIN_INDEXES = (
+    ('ix_strategyaction_created_at_brin', 'strategyaction', 'created_at'),
+    ('ix_contentprediction_created_at_brin', 'contentprediction', 'created_at'),
+    ('ix_weeklystrategy_created_at_brin', 'weeklystrategy', 'created_at'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, column in BRIN_INDEXES:
+            op.create_index(
+                name, table, [column],
+                postgresql_using='brin', postgresql_with={'pages_per_range': 32},
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(BRIN_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
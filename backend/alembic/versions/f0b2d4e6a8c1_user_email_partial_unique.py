@@ -0,0 +1,40 @@
+"""user_email_partial_unique
+
+Revision ID: f0b2d4e6a8c1
+Revises: e9a1c3d5f7b0
+Create Date: 2026-10-15 18:05:37.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f0b2d4e6a8c1'
+down_revision: Union[str, Sequence[str], None] = 'e9a1c3d5f7b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_user_email_active', 'user', ['email'], unique=True,
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index('ix_user_email', table_name='user', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails if an email was reused after deactivation; resolve those first
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_email', 'user', ['email'], unique=True,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index('uq_user_email_active', table_name='user', postgresql_concurrently=True, if_exists=True)
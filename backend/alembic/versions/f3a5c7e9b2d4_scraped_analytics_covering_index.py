@@ -0,0 +1,44 @@
+"""scraped_analytics_covering_index
+
+Revision ID: f3a5c7e9b2d4
+Revises: e1b3d5f7a9c2
+Create Date: 2026-10-15 12:31:09.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a5c7e9b2d4'
+down_revision: Union[str, Sequence[str], None] = 'e1b3d5f7a9c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = 'ix_scraped_analytics_user_platform_scraped_at'
+COLUMNS = ['user_id', 'platform', sa.text('scraped_at DESC')]
+INCLUDE = ['views', 'followers', 'subscribers', 'engagement_rate', 'watch_time_minutes']
+
+
+def _swap(include) -> None:
+    # Build the replacement first so lookups never lose their index
+    with op.get_context().autocommit_block():
+        op.create_index(
+            f'{INDEX}_new', 'scraped_analytics', COLUMNS,
+            postgresql_include=include,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.drop_index(INDEX, table_name='scraped_analytics', postgresql_concurrently=True, if_exists=True)
+    op.execute(f'ALTER INDEX {INDEX}_new RENAME TO {INDEX}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _swap(INCLUDE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _swap([])
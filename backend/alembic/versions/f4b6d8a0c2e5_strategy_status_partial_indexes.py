@@ -0,0 +1,40 @@
+"""strategy_status_partial_indexes
+
+Revision ID: f4b6d8a0c2e5
+Revises: e2a4c6e8b0d3
+Create Date: 2026-10-15 14:55:12.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b6d8a0c2e5'
+down_revision: Union[str, Sequence[str], None] = 'e2a4c6e8b0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_strategyaction_pending', 'strategyaction', ['user_id', 'recommended_time'],
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_contentprediction_unmeasured', 'contentprediction', ['user_id', 'planned_post_time'],
+            postgresql_where=sa.text("status <> 'measured'"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_contentprediction_unmeasured', table_name='contentprediction', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_strategyaction_pending', table_name='strategyaction', postgresql_concurrently=True, if_exists=True)
@@ -1,4 +1,4 @@
-from app.services.agent_memory import save_memory, load_memory
+from app.services.agent_memory import save_memory_many, load_memory
 from app.db.session import engine
 from sqlmodel import Session
 
@@ -15,10 +15,10 @@ class AgentMemory:
         Stores two entries: one for the observation and one for the decision.
         """
         with Session(engine) as session:
-            # Store observation
-            save_memory(session, user_id, "last_observation", observation)
-            # Store decision
-            save_memory(session, user_id, "last_decision", decision)
+            save_memory_many(session, user_id, {
+                "last_observation": observation,
+                "last_decision": decision,
+            })
 
     def load_observation(self, user_id: str):
         with Session(engine) as session:
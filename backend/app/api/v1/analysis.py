@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlmodel import Session
 from app.db.session import get_session
 from app.models.content import ContentDraft
+from app.models.analytics_snapshot import invalidate_analytics_snapshot
 from pydantic import BaseModel
 from typing import Optional
 from app.services.vision_ai import VisionAIService
@@ -28,12 +29,12 @@ class ProfileAnalyzeRequest(BaseModel):
     user_id: Optional[str] = None
     profile_data: ProfileData
 
-from app.core.dependencies import CurrentUser
+from app.core.dependencies import TokenUser
 
 @router.post("/analyze")
 def analyze_content(
     request: AnalyzeRequest, 
-    current_user: CurrentUser,
+    current_user: TokenUser,
     db: Session = Depends(get_session)
 ):
     user_id = request.user_id or str(current_user.id)
@@ -59,6 +60,7 @@ def analyze_content(
         ai_analysis=ai_results
     )
     db.add(draft)
+    invalidate_analytics_snapshot(db, user_id)
     db.commit()
     db.refresh(draft)
     
@@ -70,7 +72,7 @@ def analyze_content(
 @router.post("/analyze/profile")
 def analyze_profile(
     request: ProfileAnalyzeRequest,
-    current_user: CurrentUser
+    current_user: TokenUser
 ):
     user_id = request.user_id or str(current_user.id)
     data = request.profile_data
@@ -3,7 +3,8 @@ from sqlmodel import Session, select
 from app.db.session import get_session
 from app.models.content import ContentDraft, ContentPerformance
 from app.models.scraped_analytics import ScrapedAnalytics
-from app.core.dependencies import CurrentUser
+from app.models.analytics_snapshot import invalidate_analytics_snapshot
+from app.core.dependencies import TokenUser
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
@@ -38,6 +39,7 @@ def sync_analytics(req: AnalyticsSyncRequest, db: Session = Depends(get_session)
         shares=req.shares
     )
     db.add(perf)
+    invalidate_analytics_snapshot(db, draft.user_id)
     db.commit()
     
     return {"status": "synced", "new_views": req.views}
@@ -57,7 +59,7 @@ class ScrapedAnalyticsRequest(BaseModel):
 @router.post("/sync/scraped")
 async def sync_scraped_analytics(
     req: ScrapedAnalyticsRequest, 
-    current_user: CurrentUser,
+    current_user: TokenUser,
     db: Session = Depends(get_session)
 ):
     """
@@ -98,6 +100,7 @@ async def sync_scraped_analytics(
         )
         
         db.add(scraped)
+        invalidate_analytics_snapshot(db, user_id)
         db.commit()
         db.refresh(scraped)
         
@@ -3,7 +3,6 @@ from typing import Annotated
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
 from sqlmodel import Session, select
 from pydantic import BaseModel
 
@@ -12,6 +11,7 @@ from app.core.config import settings
 from app.db.session import get_session
 from app.models.user import User
 from app.core.rate_limit import limiter
+from app.core.dependencies import AuthError, decode_token, is_token_revoked, revoke_token, validate_payload
 
 router = APIRouter()
 
@@ -39,23 +39,20 @@ class UserResponse(BaseModel):
     is_active: bool
 
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_session)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+    """
+    Full User row on the request's sync Session, for routes that modify it.
+    Same token checks (including logout and account-change revocation) as
+    core.dependencies.get_current_user.
+    """
+    payload = decode_token(token)
+    email = validate_payload(payload)
+    if await is_token_revoked(payload):
+        raise AuthError("Token has been revoked")
     
-    statement = select(User).where(User.email == email)
+    statement = select(User).where(User.email == email, User.is_active)
     user = db.exec(statement).first()
     if user is None:
-        raise credentials_exception
+        raise AuthError()
     return user
 
 @router.post(
@@ -68,7 +65,7 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Se
 )
 @limiter.limit("5/minute")
 def register_user(user_in: UserCreate, request: Request, db: Session = Depends(get_session)):
-    statement = select(User).where(User.email == user_in.email)
+    statement = select(User).where(User.email == user_in.email, User.is_active)
     existing_user = db.exec(statement).first()
     if existing_user:
         raise HTTPException(
@@ -98,7 +95,7 @@ def register_user(user_in: UserCreate, request: Request, db: Session = Depends(g
 )
 @limiter.limit("5/minute")
 def login_for_access_token(request: Request, form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: Session = Depends(get_session)):
-    statement = select(User).where(User.email == form_data.username)
+    statement = select(User).where(User.email == form_data.username, User.is_active)
     user = db.exec(statement).first()
     if not user or not security.verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
@@ -109,10 +106,17 @@ def login_for_access_token(request: Request, form_data: Annotated[OAuth2Password
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
-        subject=user.email, expires_delta=access_token_expires
+        subject=user.email,
+        expires_delta=access_token_expires,
+        claims={"uid": str(user.id), "tier": user.tier, "active": user.is_active},
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(token: Annotated[str, Depends(oauth2_scheme)]):
+    """Revoke the presented access token."""
+    await revoke_token(token)
+
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(current_user: Annotated[User, Depends(get_current_user)]):
     return current_user
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
 from sqlmodel import Session
-from app.db.session import get_session
-from app.core.dependencies import CurrentUser
-from app.models.social_account import get_user_token, SocialAccount
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_async_session, get_session
+from app.core.dependencies import TokenUser
+from app.models.social_account import get_user_platforms_async, get_user_token
+from app.core.token_cache import get_cached_token
 from app.integrations.youtube import get_youtube_connector, YouTubeConnector
 from app.integrations.instagram import InstagramConnector
 import os
@@ -17,35 +19,55 @@ router = APIRouter()
 @router.get("/youtube/channel/{channel_id}")
 async def get_youtube_channel(
     channel_id: str, 
-    user: CurrentUser, 
+    user: TokenUser, 
     db: Session = Depends(get_session)
 ):
     """
     Get YouTube channel statistics.
     """
     token = get_user_token(db, str(user.id), "youtube")
-    connector = YouTubeConnector(access_token=token) if token else get_youtube_connector()
+    connector = YouTubeConnector(db=db, user_id=str(user.id)) if token else get_youtube_connector()
     return connector.get_channel_stats(channel_id)
 
 
 @router.get("/youtube/video/{video_id}")
 async def get_youtube_video(
     video_id: str, 
-    user: CurrentUser, 
+    user: TokenUser, 
     db: Session = Depends(get_session)
 ):
     """
     Get YouTube video statistics.
     """
     token = get_user_token(db, str(user.id), "youtube")
-    connector = YouTubeConnector(access_token=token) if token else get_youtube_connector()
+    connector = YouTubeConnector(db=db, user_id=str(user.id)) if token else get_youtube_connector()
     return connector.get_video_stats(video_id)
 
 
+@router.get("/youtube/videos")
+def get_youtube_videos(
+    user: TokenUser,
+    ids: str = Query(..., description="Comma-separated video ids"),
+    db: Session = Depends(get_session)
+):
+    """
+    Get statistics for several YouTube videos in one call.
+
+    Plain def: the connector and its ETag cache block, so FastAPI runs
+    this in the threadpool instead of on the event loop.
+    """
+    video_ids = [v.strip() for v in ids.split(",") if v.strip()]
+    if not video_ids:
+        raise HTTPException(status_code=400, detail="No video ids given")
+    token = get_user_token(db, str(user.id), "youtube")
+    connector = YouTubeConnector(db=db, user_id=str(user.id)) if token else get_youtube_connector()
+    return connector.get_videos_stats(video_ids)
+
+
 @router.get("/youtube/channel/{channel_id}/videos")
 async def get_channel_videos(
     channel_id: str, 
-    user: CurrentUser, 
+    user: TokenUser, 
     limit: int = Query(10, le=50),
     db: Session = Depends(get_session)
 ):
@@ -53,14 +75,14 @@ async def get_channel_videos(
     Get recent videos from a YouTube channel.
     """
     token = get_user_token(db, str(user.id), "youtube")
-    connector = YouTubeConnector(access_token=token) if token else get_youtube_connector()
+    connector = YouTubeConnector(db=db, user_id=str(user.id)) if token else get_youtube_connector()
     return connector.get_channel_videos(channel_id, limit)
 
 
 @router.get("/youtube/search")
 async def search_youtube(
     q: str, 
-    user: CurrentUser, 
+    user: TokenUser, 
     limit: int = Query(10, le=50),
     db: Session = Depends(get_session)
 ):
@@ -68,7 +90,7 @@ async def search_youtube(
     Search YouTube videos.
     """
     token = get_user_token(db, str(user.id), "youtube")
-    connector = YouTubeConnector(access_token=token) if token else get_youtube_connector()
+    connector = YouTubeConnector(db=db, user_id=str(user.id)) if token else get_youtube_connector()
     return connector.search_videos(q, limit)
 
 
@@ -78,68 +100,68 @@ async def search_youtube(
 
 @router.get("/instagram/profile")
 async def get_instagram_profile(
-    user: CurrentUser, 
-    db: Session = Depends(get_session)
+    user: TokenUser, 
+    db: AsyncSession = Depends(get_async_session)
 ):
     """
     Get Instagram profile information.
     """
-    token = get_user_token(db, str(user.id), "instagram")
-    if not token and not os.getenv("INSTAGRAM_ACCESS_TOKEN"):
+    access_token = await get_cached_token(db, str(user.id), "instagram")
+    if not access_token and not os.getenv("INSTAGRAM_ACCESS_TOKEN"):
         raise HTTPException(status_code=401, detail="Instagram not connected")
         
-    connector = InstagramConnector(access_token=token)
-    return connector.get_profile()
+    connector = InstagramConnector(access_token=access_token)
+    return await connector.get_profile()
 
 
 @router.get("/instagram/media")
 async def get_instagram_media(
-    user: CurrentUser, 
+    user: TokenUser, 
     limit: int = Query(10, le=50),
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """
     Get recent Instagram posts.
     """
-    token = get_user_token(db, str(user.id), "instagram")
-    if not token and not os.getenv("INSTAGRAM_ACCESS_TOKEN"):
+    access_token = await get_cached_token(db, str(user.id), "instagram")
+    if not access_token and not os.getenv("INSTAGRAM_ACCESS_TOKEN"):
         raise HTTPException(status_code=401, detail="Instagram not connected")
 
-    connector = InstagramConnector(access_token=token)
-    return connector.get_media(limit=limit)
+    connector = InstagramConnector(access_token=access_token)
+    return await connector.get_media(limit=limit)
 
 
 @router.get("/instagram/insights")
 async def get_instagram_insights(
-    user: CurrentUser, 
-    db: Session = Depends(get_session)
+    user: TokenUser, 
+    db: AsyncSession = Depends(get_async_session)
 ):
     """
     Get Instagram account insights.
     """
-    token = get_user_token(db, str(user.id), "instagram")
-    if not token and not os.getenv("INSTAGRAM_ACCESS_TOKEN"):
+    access_token = await get_cached_token(db, str(user.id), "instagram")
+    if not access_token and not os.getenv("INSTAGRAM_ACCESS_TOKEN"):
         raise HTTPException(status_code=401, detail="Instagram not connected")
 
-    connector = InstagramConnector(access_token=token)
-    return connector.get_insights()
+    connector = InstagramConnector(access_token=access_token)
+    return await connector.get_insights()
 
 
 @router.get("/instagram/media/{media_id}/insights")
 async def get_media_insights(
     media_id: str, 
-    user: CurrentUser, 
-    db: Session = Depends(get_session)
+    user: TokenUser, 
+    db: AsyncSession = Depends(get_async_session)
 ):
     """
     Get insights for a specific Instagram post.
     """
-    token = get_user_token(db, str(user.id), "instagram")
-    if not token and not os.getenv("INSTAGRAM_ACCESS_TOKEN"):
+    access_token = await get_cached_token(db, str(user.id), "instagram")
+    if not access_token and not os.getenv("INSTAGRAM_ACCESS_TOKEN"):
         raise HTTPException(status_code=401, detail="Instagram not connected")
 
-    connector = InstagramConnector(access_token=token)
-    return connector.get_media_insights(media_id)
+    connector = InstagramConnector(access_token=access_token)
+    return await connector.get_media_insights(media_id)
 
 
 # ========================================
@@ -148,20 +170,16 @@ async def get_media_insights(
 
 @router.get("/status")
 async def get_integration_status(
-    user: CurrentUser,
-    db: Session = Depends(get_session)
+    user: TokenUser,
+    db: AsyncSession = Depends(get_async_session)
 ):
     """
     Get connection status for all integrations.
     """
-    from sqlmodel import select
-    
     # Check user connections in DB
     user_platforms = []
     try:
-        statement = select(SocialAccount).where(SocialAccount.user_id == str(user.id), SocialAccount.is_active)
-        accounts = db.exec(statement).all()
-        user_platforms = [a.platform for a in accounts]
+        user_platforms = await get_user_platforms_async(db, str(user.id))
     except Exception:
         pass
 
@@ -12,6 +12,7 @@ from fastapi.responses import RedirectResponse
 from sqlmodel import Session
 from app.db.session import get_session
 from app.models.social_account import save_social_account, SocialAccount
+from app.core.token_cache import invalidate_token
 from datetime import datetime, timedelta
 import httpx
 from dotenv import load_dotenv
@@ -300,8 +301,13 @@ async def get_connected_accounts(user_id: str, db: Session = Depends(get_session
     Returns safe data (no tokens).
     """
     from sqlmodel import select
+    from sqlalchemy.orm import defer
     
-    statement = select(SocialAccount).where(SocialAccount.user_id == user_id)
+    # to_safe_dict never touches the tokens, so don't load the encrypted blobs
+    statement = select(SocialAccount).where(SocialAccount.user_id == user_id).options(
+        defer(SocialAccount.access_token_encrypted),
+        defer(SocialAccount.refresh_token_encrypted)
+    )
     accounts = db.exec(statement).all()
     
     return {
@@ -330,6 +336,7 @@ async def disconnect_account(account_id: str, db: Session = Depends(get_session)
     account.updated_at = datetime.utcnow()
     db.add(account)
     db.commit()
+    invalidate_token(account.user_id, account.platform)
     
     return {
         "status": "disconnected",
@@ -386,6 +393,7 @@ async def refresh_token(account_id: str, db: Session = Depends(get_session)):
             
             db.add(account)
             db.commit()
+            invalidate_token(account.user_id, account.platform)
     
     return {
         "status": "refreshed",
@@ -3,7 +3,7 @@ from sqlmodel import Session
 from app.db.session import get_session
 from app.services.nl_query_service import NLQueryService
 from app.core.cache import cache_response
-from app.core.dependencies import CurrentUser
+from app.core.dependencies import TokenUser
 from app.core.rate_limit import limiter
 from pydantic import BaseModel
 
@@ -32,7 +32,7 @@ class QueryResponse(BaseModel):
 async def ask_query(
     request: Request,
     query_request: QueryRequest,
-    current_user: CurrentUser,
+    current_user: TokenUser,
     db: Session = Depends(get_session)
 ):
     """
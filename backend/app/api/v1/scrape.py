@@ -9,7 +9,7 @@ from datetime import datetime
 from urllib.parse import urlparse
 
 from app.db.session import get_session
-from app.core.dependencies import CurrentUser
+from app.core.dependencies import TokenUser
 from app.models.scraped_web_page import ScrapedWebPage
 
 router = APIRouter()
@@ -30,7 +30,7 @@ class ScrapePageRequest(BaseModel):
 @router.post("/page")
 async def sync_scraped_page(
     req: ScrapePageRequest,
-    current_user: CurrentUser,
+    current_user: TokenUser,
     db: Session = Depends(get_session)
 ):
     """
@@ -80,7 +80,7 @@ async def sync_scraped_page(
 
 @router.get("/history")
 async def get_scrape_history(
-    current_user: CurrentUser,
+    current_user: TokenUser,
     db: Session = Depends(get_session),
     limit: int = 50,
     domain: Optional[str] = None
@@ -118,7 +118,7 @@ async def get_scrape_history(
 
 @router.get("/domains")
 async def get_scraped_domains(
-    current_user: CurrentUser,
+    current_user: TokenUser,
     db: Session = Depends(get_session)
 ):
     """Get summary of domains the user has visited."""
@@ -152,7 +152,7 @@ async def get_scraped_domains(
 
 @router.get("/analytics")
 async def get_scrape_analytics(
-    current_user: CurrentUser,
+    current_user: TokenUser,
     db: Session = Depends(get_session),
     days: int = 7
 ):
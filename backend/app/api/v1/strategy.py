@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session
 from app.db.session import get_session
+from app.core.dependencies import AuthUser, TokenUser
 from app.services.strategy_service import StrategyService
-from app.core.cache import cache_response
+from app.core.cache import cache_response, invalidate_cached_response
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
@@ -23,9 +24,24 @@ class OutcomeRequest(BaseModel):
     shares: int
 
 
+def _plan_owner(user_id: str, current_user: TokenUser) -> AuthUser:
+    """
+    The path's user must be the caller. Runs as a dependency so it is
+    checked before cache_response can serve a cached plan.
+    """
+    # The dashboard addresses users by email; the actions are stored by id
+    if user_id not in (str(current_user.id), current_user.email):
+        raise HTTPException(status_code=403, detail="Not your strategy")
+    return current_user
+
+
 @router.get("/weekly-plan/{user_id}")
 @cache_response(expire_seconds=300)
-async def get_weekly_plan(user_id: str, db: Session = Depends(get_session)):
+async def get_weekly_plan(
+    user_id: str,
+    current_user: AuthUser = Depends(_plan_owner),
+    db: Session = Depends(get_session)
+):
     """
     Get the weekly action plan with prioritized recommendations.
     
@@ -35,7 +51,7 @@ async def get_weekly_plan(user_id: str, db: Session = Depends(get_session)):
     - Category (content, timing, platform, engagement)
     """
     try:
-        service = StrategyService(db, user_id)
+        service = StrategyService(db, str(current_user.id))
         return service.generate_weekly_strategy()
     except Exception as e:
         print(f"Strategy error: {e}")
@@ -106,18 +122,50 @@ async def get_optimal_window(user_id: str, platform: str = "all", db: Session =
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _transition_response(service: StrategyService, current_user: AuthUser,
+                               action_id: str, result: Optional[dict]) -> dict:
+    """
+    Drop the user's cached weekly plan after a pending -> taken/skipped
+    transition (its statuses and progress changed), or turn a failed one
+    into 404 or 409.
+    """
+    if result is not None:
+        for user_id in (str(current_user.id), current_user.email):
+            await invalidate_cached_response(get_weekly_plan, user_id=user_id)
+        return result
+    if service.get_action_status(action_id) is None:
+        raise HTTPException(status_code=404, detail="Action not found")
+    raise HTTPException(status_code=409, detail="Action has already been resolved")
+
+
 @router.post("/actions/{action_id}/taken")
-async def mark_action_taken(action_id: str, db: Session = Depends(get_session)):
+async def mark_action_taken(action_id: str, current_user: TokenUser, db: Session = Depends(get_session)):
     """
     Mark an action as taken.
     
     Call this when the user decides to follow a recommendation.
     """
+    service = StrategyService(db, str(current_user.id))
     try:
-        service = StrategyService(db, "default")
-        return service.record_action_taken(action_id)
+        result = service.record_action_taken(action_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return await _transition_response(service, current_user, action_id, result)
+
+
+@router.post("/actions/{action_id}/skipped")
+async def mark_action_skipped(action_id: str, current_user: TokenUser, db: Session = Depends(get_session)):
+    """
+    Mark an action as skipped.
+    
+    Call this when the user dismisses a recommendation.
+    """
+    service = StrategyService(db, str(current_user.id))
+    try:
+        result = service.record_action_skipped(action_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return await _transition_response(service, current_user, action_id, result)
 
 
 @router.post("/actions/{action_id}/outcome")
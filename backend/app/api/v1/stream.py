@@ -2,10 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 from app.db.session import get_session
-from app.core.dependencies import CurrentUser
+from app.core.dependencies import TokenUser
+from app.core.session_lock import get_session_lock
 from pydantic import BaseModel
 import json
-import asyncio
 
 router = APIRouter()
 
@@ -15,7 +15,7 @@ class StreamAnalyzeRequest(BaseModel):
 @router.post("/profile")
 async def stream_profile_analysis(
     request: StreamAnalyzeRequest,
-    current_user: CurrentUser,
+    current_user: TokenUser,
     db: Session = Depends(get_session)
 ):
     """
@@ -27,7 +27,6 @@ async def stream_profile_analysis(
         name = data.get("name", "Unknown")
         
         yield f"data: {json.dumps({'status': 'starting', 'message': f'Analyzing profile for {name}...'})}\n\n"
-        await asyncio.sleep(0.5)
         
         # 1. Headline Analysis
         headline = data.get("headline", "")
@@ -39,7 +38,6 @@ async def stream_profile_analysis(
             insight = "💡 Suggestion: Make your headline more outcome-focused."
         
         yield f"data: {json.dumps({'status': 'insight', 'type': 'headline', 'content': insight})}\n\n"
-        await asyncio.sleep(0.8)
         
         # 2. Content Analysis
         posts = data.get("posts", [])
@@ -49,7 +47,6 @@ async def stream_profile_analysis(
             insight = f"✅ Found {len(posts)} recent posts. Good activity."
             
         yield f"data: {json.dumps({'status': 'insight', 'type': 'consistency', 'content': insight})}\n\n"
-        await asyncio.sleep(0.5)
         
         # 3. Final Summary
         yield f"data: {json.dumps({'status': 'complete', 'insights_count': 2, 'market_trends': ['AI Agents', 'Personal Branding']})}\n\n"
@@ -68,16 +65,21 @@ class StreamChatRequest(BaseModel):
     page_context: dict | None = None
 
 @router.post("/chat")
-async def stream_chat(request: StreamChatRequest, current_user: CurrentUser, db: Session = Depends(get_session)):
+async def stream_chat(request: StreamChatRequest, current_user: TokenUser, db: Session = Depends(get_session)):
     """Stream chat responses for the extension UI.
-    Returns a Server‑Sent Events (SSE) stream with a single JSON payload.
+    Returns a Server‑Sent Events (SSE) stream of {"delta": text} payloads as
+    the reply is generated, followed by the full response payload.
     """
     async def generator():
         try:
-            agent = CreatorAgent(db, str(current_user.id))
-            resp = await agent.chat(request.message, request.conversation_id, request.page_context)
-            # Ensure the response is JSON‑serialisable
-            yield f"data: {json.dumps(resp)}\n\n"
+            user_id = str(current_user.id)
+            agent = CreatorAgent(db, user_id)
+            async with get_session_lock(user_id, request.conversation_id):
+                async for event in agent.astream_chat(
+                    request.message, request.conversation_id, request.page_context
+                ):
+                    # Ensure the response is JSON‑serialisable
+                    yield f"data: {json.dumps(event)}\n\n"
         except Exception as e:
             yield f"data: {json.dumps({{'error': str(e)}})}\n\n"
     return StreamingResponse(generator(), media_type="text/event-stream")
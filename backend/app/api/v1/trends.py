@@ -1,18 +1,46 @@
 """
-Trends API - Real-time market trends using AI (Hugging Face)
+Trends API - Real-time market trends using AI (Hugging Face or Gemini)
 """
 from fastapi import APIRouter
+from fastapi.responses import Response
+from app.core.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional
+from contextlib import aclosing
 from datetime import datetime
 from app.core.config import settings
+import asyncio
 import json
+import logging
+import orjson
 import re
 import random
 import os
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Response parsing patterns, compiled once at import
+_ARRAY_START_RE = re.compile(r'\[\s*\{')
+_OBJ_RE = re.compile(r'\{[^{}]*"title"[^{}]*"description"[^{}]*"category"[^{}]*\}')
+_DECODER = json.JSONDecoder()
+
+_THINK_OPEN = '<think>'
+_THINK_CLOSE = '</think>'
+
+
+def _strip_think(text: str) -> str:
+    """Remove closed <think>...</think> reasoning blocks with plain string scans."""
+    start = text.find(_THINK_OPEN)
+    while start != -1:
+        end = text.find(_THINK_CLOSE, start)
+        if end == -1:
+            break
+        text = text[:start] + text[end + len(_THINK_CLOSE):]
+        start = text.find(_THINK_OPEN, start)
+    return text
+
 
 class Trend(BaseModel):
     id: str
@@ -31,44 +59,191 @@ class TrendsResponse(BaseModel):
     source: str
 
 
-@router.get("/latest")
-async def get_latest_trends(category: Optional[str] = None) -> TrendsResponse:
+@router.get("/latest", response_model=TrendsResponse)
+async def get_latest_trends(category: Optional[str] = None):
     """
     Get latest trending topics using AI.
     Optionally filter by category.
     """
+    now = datetime.utcnow()
+    now_iso = now.isoformat()
+    
     try:
-        trends = await generate_ai_trends(category)
-        return TrendsResponse(
-            trends=trends,
-            generated_at=datetime.utcnow().isoformat(),
-            source="AI-Generated based on current market analysis"
-        )
+        trends = await generate_ai_trends(category, now=now)
+        return ORJSONResponse({
+            "trends": trends,
+            "generated_at": now_iso,
+            "source": "AI-Generated based on current market analysis"
+        })
     except Exception as e:
-        print(f"Trends API error: {e}")
+        logger.info("Trends API error, serving fallback: %s", e)
         # Fallback to static trends if AI fails
-        return TrendsResponse(
-            trends=get_fallback_trends(category),
-            generated_at=datetime.utcnow().isoformat(),
-            source="Curated trends (AI temporarily unavailable)"
+        return fallback_trends_response(category, now_iso=now_iso)
+
+
+_SYSTEM_PROMPT = "You are a social media trends expert. Respond with ONLY a valid JSON array."
+
+
+# Shared LLM clients, created on first use so requests reuse one connection pool
+_hf_client = None
+_gemini_model = None
+
+
+def _get_hf_client():
+    global _hf_client
+    if _hf_client is None:
+        hf_token = settings.HF_TOKEN or os.getenv("HF_TOKEN")
+        if not hf_token:
+            raise ValueError("HF_TOKEN not configured")
+        
+        # Async OpenAI client for HF router
+        from openai import AsyncOpenAI
+        import httpx
+        
+        _hf_client = AsyncOpenAI(
+            api_key=hf_token,
+            base_url="https://router.huggingface.co/v1",
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=32)
+            )
         )
+    return _hf_client
+
+
+def _get_gemini_model():
+    global _gemini_model
+    if _gemini_model is None:
+        gemini_key = settings.GEMINI_API_KEY or settings.GOOGLE_API_KEY
+        if not gemini_key:
+            raise ValueError("GEMINI_API_KEY not configured")
+        
+        import google.generativeai as genai
+        
+        genai.configure(api_key=gemini_key)
+        _gemini_model = genai.GenerativeModel('gemini-2.0-flash', system_instruction=_SYSTEM_PROMPT)
+    return _gemini_model
+
+
+async def prewarm_clients() -> None:
+    """Build the configured provider's client and open its connection at startup."""
+    try:
+        if _PROVIDER == "gemini":
+            _get_gemini_model()
+        elif settings.HF_TOKEN or os.getenv("HF_TOKEN"):
+            # A cheap call establishes the TLS session in the shared pool
+            await asyncio.wait_for(_get_hf_client().models.list(), timeout=5)
+    except Exception as e:
+        logger.info("Trends client prewarm skipped: %s", e)
+
+
+async def close_clients() -> None:
+    """Release the shared HF connection pool on shutdown."""
+    global _hf_client
+    if _hf_client is not None:
+        await _hf_client.close()
+        _hf_client = None
+
+
+async def _stream_hf(prompt: str) -> AsyncIterator[str]:
+    """Stream the trends completion from the Hugging Face router."""
+    stream = await _get_hf_client().chat.completions.create(
+        model="meta-llama/Llama-3.2-3B-Instruct",  # Small and fast
+        messages=[
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=1200,
+        temperature=0.7,
+        stream=True
+    )
+    try:
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        # Closing the stream stops generation once enough trends are parsed
+        await stream.close()
+
+
+async def _stream_gemini(prompt: str) -> AsyncIterator[str]:
+    """Stream the trends completion from Gemini."""
+    response = await _get_gemini_model().generate_content_async(
+        prompt,
+        generation_config={"max_output_tokens": 1200, "temperature": 0.7},
+        stream=True
+    )
+    async for chunk in response:
+        # chunk.text raises on chunks without text parts (e.g. the final
+        # finish_reason/safety chunk), so skip those
+        if chunk.parts:
+            yield chunk.text
+
 
+_PROVIDERS = {
+    "huggingface": _stream_hf,
+    "gemini": _stream_gemini,
+}
+_PROVIDER = settings.TRENDS_PROVIDER.lower()
 
-async def generate_ai_trends(category: Optional[str] = None) -> List[Trend]:
-    """Generate trending topics using Hugging Face AI."""
+_TREND_COUNT = 6
+
+
+class _TrendStreamParser:
+    """
+    Incrementally pulls complete objects out of a streamed JSON array.
     
-    # Get HF token
-    hf_token = settings.HF_TOKEN or os.getenv("HF_TOKEN")
-    if not hf_token:
-        raise ValueError("HF_TOKEN not configured")
+    Text is fed as it arrives from the LLM; each top-level object is decoded
+    as soon as its closing brace is seen, so a truncated response still
+    yields every object that finished.
+    """
     
-    # Import OpenAI client for HF router
-    from openai import OpenAI
+    def __init__(self):
+        self.text = ""
+        self.items: List[dict] = []
+        self.done = False
+        self._pos: Optional[int] = None  # index past '[' once the array starts
     
-    client = OpenAI(
-        api_key=hf_token,
-        base_url="https://router.huggingface.co/v1"
-    )
+    def feed(self, chunk: str) -> None:
+        self.text += chunk
+        
+        if self._pos is None:
+            # Wait for any reasoning block to close before looking for the array
+            if _THINK_OPEN in self.text and _THINK_CLOSE not in self.text:
+                return
+            self.text = _strip_think(self.text)
+            match = _ARRAY_START_RE.search(self.text)
+            if not match:
+                return
+            self._pos = match.start() + 1
+        
+        text = self.text
+        while not self.done:
+            i = self._pos
+            while i < len(text) and text[i] in ' \t\r\n,':
+                i += 1
+            self._pos = i
+            if i >= len(text):
+                return
+            if text[i] != '{':
+                self.done = True
+                return
+            try:
+                obj, end = _DECODER.raw_decode(text, i)
+            except json.JSONDecodeError:
+                return  # Object still incomplete, wait for more text
+            if isinstance(obj, dict):
+                self.items.append(obj)
+            self._pos = end
+            if len(self.items) >= _TREND_COUNT:
+                self.done = True
+
+
+async def generate_ai_trends(category: Optional[str] = None, now: Optional[datetime] = None) -> List[dict]:
+    """Generate trending topics using the configured AI provider."""
+    
+    now = now or datetime.utcnow()
+    now_iso = now.isoformat()
+    stream_llm = _PROVIDERS.get(_PROVIDER, _stream_hf)
     
     category_filter = f" focusing on {category}" if category else ""
     
@@ -96,154 +271,149 @@ For each trend, provide:
 
 Return ONLY a valid JSON array with objects containing: title, description, category, relevance, platforms, engagement_potential
 
-Generate trends that are relevant to TODAY ({datetime.utcnow().strftime('%B %d, %Y')}) and are DIFFERENT from typical evergreen trends.
+Generate trends that are relevant to TODAY ({now.strftime('%B %d, %Y')}) and are DIFFERENT from typical evergreen trends.
 Be creative and specific!"""
 
     try:
-        response = client.chat.completions.create(
-            model="meta-llama/Llama-3.2-3B-Instruct",  # Small and fast
-            messages=[
-                {"role": "system", "content": "You are a social media trends expert. Respond with ONLY a valid JSON array."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=1200,
-            temperature=0.7
-        )
-        
-        # Parse the response
-        response_text = response.choices[0].message.content
-        print(f"Raw trends response (first 500 chars): {response_text[:500]}")
+        parser = _TrendStreamParser()
+        async with aclosing(stream_llm(prompt)) as stream:
+            async for chunk in stream:
+                parser.feed(chunk)
+                if parser.done:
+                    break
         
-        # Clean up response - remove thinking tokens, markdown, etc.
-        response_text = re.sub(r'<think>.*?</think>', '', response_text, flags=re.DOTALL)
-        response_text = re.sub(r'```json\s*', '', response_text)
-        response_text = re.sub(r'```\s*', '', response_text)
-        response_text = response_text.strip()
+        logger.debug("Raw trends response (first 500 chars): %.500s", parser.text)
         
-        # Extract JSON array from response
-        json_match = re.search(r'\[\s*\{[\s\S]*', response_text)
-        if json_match:
-            json_str = json_match.group()
-            
-            # Try to fix truncated/malformed JSON
-            # Count braces to determine if we need to close
-            open_braces = json_str.count('{')
-            close_braces = json_str.count('}')
-            open_brackets = json_str.count('[')
-            close_brackets = json_str.count(']')
-            
-            # Add missing closing braces/brackets
-            if open_braces > close_braces:
-                json_str += '}' * (open_braces - close_braces)
-            if open_brackets > close_brackets:
-                json_str += ']' * (open_brackets - close_brackets)
-            
-            # Try to parse, if fails try extracting just the complete objects
-            try:
-                trends_data = json.loads(json_str)
-            except json.JSONDecodeError:
-                # Find all complete trend objects
-                object_pattern = r'\{[^{}]*"title"[^{}]*"description"[^{}]*"category"[^{}]*\}'
-                objects = re.findall(object_pattern, json_str)
-                if objects:
-                    trends_data = [json.loads(obj) for obj in objects[:6]]
-                else:
-                    raise ValueError("Could not parse trends from response")
-        else:
-            print(f"No JSON array found in: {response_text[:300]}")
-            raise ValueError("No valid JSON array found in response")
+        trends_data = parser.items
+        if not trends_data:
+            # Last resort for output that isn't a well-formed array
+            objects = _OBJ_RE.findall(parser.text)
+            if not objects:
+                logger.debug("No JSON array found in: %.300s", parser.text)
+                raise ValueError("Could not parse trends from response")
+            trends_data = [json.loads(obj) for obj in objects[:_TREND_COUNT]]
         
-        # Convert to Trend objects
-        trends = []
-        for i, t in enumerate(trends_data):
-            trends.append(Trend(
-                id=f"trend-{i+1}-{random_seed}",
-                title=t.get("title", "Trending Topic"),
-                description=t.get("description", ""),
-                category=t.get("category", "General"),
-                relevance=t.get("relevance", "Stay ahead of the curve."),
-                platforms=t.get("platforms", ["YouTube", "Instagram"]),
-                engagement_potential=t.get("engagement_potential", "Medium"),
-                timestamp=datetime.utcnow().isoformat()
-            ))
+        # Build plain dicts; the response is serialized by orjson without re-validation
+        trends = [
+            {
+                "id": f"trend-{i+1}-{random_seed}",
+                "title": t.get("title", "Trending Topic"),
+                "description": t.get("description", ""),
+                "category": t.get("category", "General"),
+                "relevance": t.get("relevance", "Stay ahead of the curve."),
+                "platforms": t.get("platforms", ["YouTube", "Instagram"]),
+                "engagement_potential": t.get("engagement_potential", "Medium"),
+                "timestamp": now_iso
+            }
+            for i, t in enumerate(trends_data)
+        ]
         
         return trends
         
     except Exception as e:
-        print(f"AI trend generation failed: {e}")
+        logger.warning("AI trend generation failed: %s", e)
         raise
 
 
-def get_fallback_trends(category: Optional[str] = None) -> List[Trend]:
-    """Return curated fallback trends if AI is unavailable."""
-    
-    all_trends = [
-        Trend(
-            id="trend-1",
-            title="Short-Form Video Dominance",
-            description="Short-form videos continue to dominate across all platforms. TikTok, Reels, and Shorts are seeing record engagement.",
-            category="Social Media",
-            relevance="Creators should prioritize vertical, snappy content under 60 seconds for maximum reach.",
-            platforms=["TikTok", "Instagram", "YouTube"],
-            engagement_potential="High",
-            timestamp=datetime.utcnow().isoformat()
-        ),
-        Trend(
-            id="trend-2",
-            title="AI-Powered Content Creation",
-            description="AI tools for writing, editing, and generating content are becoming mainstream among creators.",
-            category="AI & Tech",
-            relevance="Use AI to speed up your workflow but maintain your unique voice and style.",
-            platforms=["YouTube", "LinkedIn", "Twitter"],
-            engagement_potential="High",
-            timestamp=datetime.utcnow().isoformat()
-        ),
-        Trend(
-            id="trend-3",
-            title="Authentic Behind-the-Scenes Content",
-            description="Audiences are craving authenticity. BTS content and 'day in my life' videos are outperforming polished content.",
-            category="Lifestyle",
-            relevance="Show your real process and personality to build deeper connections with your audience.",
-            platforms=["Instagram", "TikTok", "YouTube"],
-            engagement_potential="High",
-            timestamp=datetime.utcnow().isoformat()
-        ),
-        Trend(
-            id="trend-4",
-            title="Community Building & Memberships",
-            description="Creators are focusing on building paid communities through Discord, Patreon, and YouTube memberships.",
-            category="Business",
-            relevance="Diversify income and reduce platform dependency by building a direct relationship with your top fans.",
-            platforms=["YouTube", "Discord", "Patreon"],
-            engagement_potential="Medium",
-            timestamp=datetime.utcnow().isoformat()
-        ),
-        Trend(
-            id="trend-5",
-            title="Educational Content Boom",
-            description="How-to videos, tutorials, and educational content are seeing massive growth across all demographics.",
-            category="Entertainment",
-            relevance="Share your expertise. Even niche knowledge has an audience hungry to learn.",
-            platforms=["YouTube", "LinkedIn", "TikTok"],
-            engagement_potential="High",
-            timestamp=datetime.utcnow().isoformat()
-        ),
-        Trend(
-            id="trend-6",
-            title="Live Shopping & Product Integration",
-            description="Live shopping events and seamless product integrations are becoming key revenue streams.",
-            category="Business",
-            relevance="Partner with brands for live shopping events to monetize your audience in new ways.",
-            platforms=["Instagram", "TikTok", "YouTube"],
-            engagement_potential="Medium",
-            timestamp=datetime.utcnow().isoformat()
-        )
-    ]
-    
-    if category:
-        return [t for t in all_trends if t.category.lower() == category.lower()]
-    
-    return all_trends
+# Curated fallback trends, served when AI generation is unavailable.
+# "__TS__" is swapped for the response timestamp when serving.
+_TS_PLACEHOLDER = "__TS__"
+
+_FALLBACK_TRENDS = [
+    {
+        "id": "trend-1",
+        "title": "Short-Form Video Dominance",
+        "description": "Short-form videos continue to dominate across all platforms. TikTok, Reels, and Shorts are seeing record engagement.",
+        "category": "Social Media",
+        "relevance": "Creators should prioritize vertical, snappy content under 60 seconds for maximum reach.",
+        "platforms": ["TikTok", "Instagram", "YouTube"],
+        "engagement_potential": "High",
+        "timestamp": _TS_PLACEHOLDER
+    },
+    {
+        "id": "trend-2",
+        "title": "AI-Powered Content Creation",
+        "description": "AI tools for writing, editing, and generating content are becoming mainstream among creators.",
+        "category": "AI & Tech",
+        "relevance": "Use AI to speed up your workflow but maintain your unique voice and style.",
+        "platforms": ["YouTube", "LinkedIn", "Twitter"],
+        "engagement_potential": "High",
+        "timestamp": _TS_PLACEHOLDER
+    },
+    {
+        "id": "trend-3",
+        "title": "Authentic Behind-the-Scenes Content",
+        "description": "Audiences are craving authenticity. BTS content and 'day in my life' videos are outperforming polished content.",
+        "category": "Lifestyle",
+        "relevance": "Show your real process and personality to build deeper connections with your audience.",
+        "platforms": ["Instagram", "TikTok", "YouTube"],
+        "engagement_potential": "High",
+        "timestamp": _TS_PLACEHOLDER
+    },
+    {
+        "id": "trend-4",
+        "title": "Community Building & Memberships",
+        "description": "Creators are focusing on building paid communities through Discord, Patreon, and YouTube memberships.",
+        "category": "Business",
+        "relevance": "Diversify income and reduce platform dependency by building a direct relationship with your top fans.",
+        "platforms": ["YouTube", "Discord", "Patreon"],
+        "engagement_potential": "Medium",
+        "timestamp": _TS_PLACEHOLDER
+    },
+    {
+        "id": "trend-5",
+        "title": "Educational Content Boom",
+        "description": "How-to videos, tutorials, and educational content are seeing massive growth across all demographics.",
+        "category": "Entertainment",
+        "relevance": "Share your expertise. Even niche knowledge has an audience hungry to learn.",
+        "platforms": ["YouTube", "LinkedIn", "TikTok"],
+        "engagement_potential": "High",
+        "timestamp": _TS_PLACEHOLDER
+    },
+    {
+        "id": "trend-6",
+        "title": "Live Shopping & Product Integration",
+        "description": "Live shopping events and seamless product integrations are becoming key revenue streams.",
+        "category": "Business",
+        "relevance": "Partner with brands for live shopping events to monetize your audience in new ways.",
+        "platforms": ["Instagram", "TikTok", "YouTube"],
+        "engagement_potential": "Medium",
+        "timestamp": _TS_PLACEHOLDER
+    }
+]
+
+_FALLBACK_SOURCE = "Curated trends (AI temporarily unavailable)"
+
+
+def _serialize_fallback(trends: List[dict]) -> bytes:
+    return orjson.dumps({
+        "trends": trends,
+        "generated_at": _TS_PLACEHOLDER,
+        "source": _FALLBACK_SOURCE
+    })
+
+
+# Fallback trends grouped by lowercased category for O(1) filtering
+_FALLBACK_BY_CATEGORY: Dict[str, List[dict]] = {}
+for _t in _FALLBACK_TRENDS:
+    _FALLBACK_BY_CATEGORY.setdefault(_t["category"].lower(), []).append(_t)
+
+# Pre-serialized fallback payloads keyed by lowercased category (None = all)
+_FALLBACK_BYTES: Dict[Optional[str], bytes] = {None: _serialize_fallback(_FALLBACK_TRENDS)}
+for _cat, _trends in _FALLBACK_BY_CATEGORY.items():
+    _FALLBACK_BYTES[_cat] = _serialize_fallback(_trends)
+_EMPTY_FALLBACK_BYTES = _serialize_fallback([])
+
+
+def fallback_trends_response(category: Optional[str] = None, now_iso: Optional[str] = None) -> Response:
+    """Serve the pre-serialized fallback payload with a fresh timestamp."""
+    key = category.lower() if category else None
+    body = _FALLBACK_BYTES.get(key, _EMPTY_FALLBACK_BYTES)
+    now = (now_iso or datetime.utcnow().isoformat()).encode()
+    return Response(
+        content=body.replace(_TS_PLACEHOLDER.encode(), now),
+        media_type="application/json"
+    )
 
 
 @router.get("/categories")
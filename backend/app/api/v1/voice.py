@@ -7,8 +7,12 @@ from sqlmodel import Session
 from app.db.session import get_session
 from app.services.agent_service import CreatorAgent
 from app.core.dependencies import CurrentUser, OptionalUser
+from app.core.session_lock import get_session_lock
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
+from contextlib import nullcontext
+import asyncio
+import re
 import time
 
 router = APIRouter()
@@ -42,12 +46,41 @@ When responding for voice:
 - If data is complex, summarize the key insight
 """
 
+# Caps concurrent voice LLM calls so a burst can't exhaust upstream rate limits
+_VOICE_SEM = asyncio.Semaphore(8)
+
+# Markdown characters stripped from TTS output in a single translate pass
+_MD_STRIP = str.maketrans('', '', '*`#')
+
+_WORD_RE = re.compile(r'\w+')
+
+# (trigger keywords, suggested follow-ups) checked against the query's word set
+_FOLLOWUP_RULES = [
+    (frozenset({'analytics', 'stats', 'performance'}), [
+        "What was my best performing post?",
+        "When should I post next?"
+    ]),
+    (frozenset({'content', 'post', 'posts', 'idea', 'ideas'}), [
+        "Give me more content ideas",
+        "What's trending right now?"
+    ]),
+    (frozenset({'grow', 'growth', 'followers'}), [
+        "How can I grow faster?",
+        "What are my competitors doing?"
+    ]),
+]
+
+_DEFAULT_FOLLOWUPS = [
+    "Tell me more",
+    "What else should I know?",
+    "Any other suggestions?"
+]
+
 
 def shorten_for_tts(text: str, max_words: int = 50) -> str:
     """Shorten text for TTS while keeping meaning."""
     # Remove markdown formatting
-    text = text.replace('**', '').replace('*', '').replace('`', '')
-    text = text.replace('#', '').replace('- ', '')
+    text = text.translate(_MD_STRIP).replace('- ', '')
     
     # Split into sentences
     sentences = text.replace('!', '.').replace('?', '.').split('.')
@@ -73,32 +106,14 @@ def generate_followups(query: str, response: str) -> list[str]:
     # Simple keyword-based suggestions
     followups = []
     
-    query_lower = query.lower()
+    tokens = set(_WORD_RE.findall(query.lower()))
     
-    if any(w in query_lower for w in ['analytics', 'stats', 'performance']):
-        followups.extend([
-            "What was my best performing post?",
-            "When should I post next?"
-        ])
-    
-    if any(w in query_lower for w in ['content', 'post', 'idea']):
-        followups.extend([
-            "Give me more content ideas",
-            "What's trending right now?"
-        ])
-    
-    if any(w in query_lower for w in ['grow', 'growth', 'followers']):
-        followups.extend([
-            "How can I grow faster?",
-            "What are my competitors doing?"
-        ])
+    for keywords, suggestions in _FOLLOWUP_RULES:
+        if tokens & keywords:
+            followups.extend(suggestions)
     
     if not followups:
-        followups = [
-            "Tell me more",
-            "What else should I know?",
-            "Any other suggestions?"
-        ]
+        followups = list(_DEFAULT_FOLLOWUPS)
     
     return followups[:3]
 
@@ -130,12 +145,19 @@ async def voice_query(
         # Append voice system prompt for shorter responses
         voice_prompt = f"{request.message}\n\n[Voice Mode: Respond briefly in 1-3 sentences]"
         
-        # Get response
-        result = agent.chat(
-            message=voice_prompt,
-            conversation_id=None,  # Fresh conversation for voice
-            page_context=None
-        )
+        # Serialize repeat queries from the same signed-in user. Keyed on the
+        # user alone: every voice query starts a fresh conversation, so the
+        # client's conversation_id never reaches achat. Anonymous callers
+        # share one user_id, so they are not locked together
+        session_lock = get_session_lock(user_id, None) if current_user else nullcontext()
+        
+        # Get response (achat awaits the LLM instead of holding a worker thread)
+        async with session_lock, _VOICE_SEM:
+            result = await agent.achat(
+                message=voice_prompt,
+                conversation_id=None,  # Fresh conversation for voice
+                page_context=None
+            )
         
         content = result.get("content", "I'm sorry, I couldn't process that request.")
         conversation_id = result.get("conversation_id")
@@ -1,51 +1,271 @@
-import json
+import asyncio
 import functools
+import hashlib
+import logging
+import time
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
 # from app.core.celery_app import celery # Re-using the Redis connection from Celery
 import redis
+from redis.asyncio import ConnectionPool, Redis
+from sqlmodel import Session
 import os
 
-# Direct Redis Connection
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# Direct Redis Connection (async, so cache I/O never blocks the event loop)
 # In production, use environment variable or default to service name
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/1")
-redis_client = redis.from_url(REDIS_URL)
+redis_pool = ConnectionPool.from_url(REDIS_URL, max_connections=50)
+redis_client = Redis(connection_pool=redis_pool)
+
+# Sync client for code that runs outside the event loop (connectors, workers)
+sync_redis_client = redis.Redis(connection_pool=redis.ConnectionPool.from_url(REDIS_URL, max_connections=20))
+
+# Injected dependencies that are not part of the cached result's identity
+_NON_KEY_KWARGS = frozenset({"request", "response", "db", "session", "current_user", "user_id"})
+# Injected database sessions, replaced with fresh ones for background refreshes
+_SESSION_KWARGS = ("db", "session")
+
+# Stampede protection: one computation per key at a time
+LOCK_TTL_MS = 5000
+_LOCK_POLL_SECONDS = 0.1
+_inflight: dict[str, asyncio.Event] = {}
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+def _encode_fallback(obj):
+    """
+    orjson default hook for types it can't encode natively (pydantic models,
+    Decimal, bytes, ...). Uses the same conversion FastAPI applies when it
+    sends the response, so a cache hit is identical to the miss that filled it.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return jsonable_encoder(obj)
+
+
+def dumps(data) -> bytes:
+    return orjson.dumps(data, default=_encode_fallback, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def build_cache_key(prefix: str, args: tuple, kwargs: dict) -> str:
+    """
+    Build a cache key from the endpoint's identity and all semantic inputs,
+    so different query params never share an entry.
+    """
+    user_id = kwargs.get('user_id')
+    key_kwargs = {k: v for k, v in kwargs.items() if k not in _NON_KEY_KWARGS}
+    digest = hashlib.blake2b(
+        orjson.dumps([args, key_kwargs], option=orjson.OPT_SORT_KEYS, default=str),
+        digest_size=16
+    ).hexdigest()
+    return f"cache:{prefix}:{user_id or 'anon'}:{digest}"
+
+
+async def _read_entry(key: str):
+    """Return the cached {"data", "stale_at"} envelope, or None on miss/error."""
+    try:
+        cached_data = await redis_client.get(key)
+        if cached_data:
+            entry = orjson.loads(cached_data)
+            if isinstance(entry, dict) and "stale_at" in entry:
+                return entry
+    except Exception as e:
+        logger.warning("Redis read error: %s", e)
+        # Fallback to DB if Redis fails
+    return None
+
+
+async def _write_entry(key: str, data, expire_seconds: int, stale_seconds: int) -> bool:
+    """Store the entry and release the compute lease; returns False on Redis errors."""
+    try:
+        # Fresh for expire_seconds, then served stale for stale_seconds while refreshing
+        # orjson encodes datetime/UUID natively and returns bytes for Redis
+        payload = dumps({"data": data, "stale_at": time.time() + expire_seconds})
+        # SET with EX and the lease DEL go out in a single round trip
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(key, payload, ex=expire_seconds + stale_seconds)
+            pipe.delete(f"{key}:lock")
+            await pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning("Redis write error: %s", e)
+        return False
+
+
+async def _try_lock(key: str) -> bool:
+    """Take the cross-process compute lease; if Redis is down, compute anyway."""
+    try:
+        return bool(await redis_client.set(f"{key}:lock", "1", nx=True, px=LOCK_TTL_MS))
+    except Exception:
+        return True
+
+
+async def _release_lock(key: str) -> None:
+    try:
+        await redis_client.delete(f"{key}:lock")
+    except Exception:
+        pass
+
+
+async def _compute_and_store(key, func, args, kwargs, expire_seconds, stale_seconds):
+    """Run the wrapped function and store its result; caller holds the lease."""
+    event = asyncio.Event()
+    _inflight[key] = event
+    stored = False
+    try:
+        response_data = await func(*args, **kwargs)
+        stored = await _write_entry(key, response_data, expire_seconds, stale_seconds)
+        return response_data
+    finally:
+        _inflight.pop(key, None)
+        event.set()
+        if not stored:
+            await _release_lock(key)
+
+
+async def _refresh_in_background(key, func, args, kwargs, expire_seconds, stale_seconds):
+    # The request's Session is closed by its dependency teardown while this
+    # task still runs, so the refresh gets Sessions of its own
+    own_sessions = {name: Session(engine) for name in _SESSION_KWARGS if isinstance(kwargs.get(name), Session)}
+    try:
+        await _compute_and_store(key, func, args, {**kwargs, **own_sessions}, expire_seconds, stale_seconds)
+    except Exception as e:
+        logger.warning("Cache refresh failed for %s: %s", key, e)
+    finally:
+        for db in own_sessions.values():
+            db.close()
+
+
+def cache_response(expire_seconds: int = 300, stale_seconds: int | None = None):
+    """
+    Cache an async endpoint's result in Redis.
+
+    Concurrent misses for the same key are collapsed into one call of the
+    wrapped function (per-process Event plus a Redis SET NX lease across
+    workers). After expire_seconds an entry is served stale for up to
+    stale_seconds while a single background task refreshes it.
+    """
+    if stale_seconds is None:
+        stale_seconds = max(expire_seconds // 5, 30)
 
-def cache_response(expire_seconds: int = 300):
     def decorator(func):
+        prefix = f"{func.__module__}.{func.__qualname__}"
+
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            # 1. Generate a unique Cache Key based on User ID or Request URL
-            # Accessing 'request' from kwargs (FastAPI dependency injection)            # Accessing 'request' from kwargs (FastAPI dependency injection)
-            user_id = kwargs.get('user_id')
-            
-            if user_id:
-                key = f"cache:dashboard:{user_id}"
-            else:
-                key = f"cache:global:{func.__name__}"
+            # 1. Generate a unique Cache Key from the endpoint, user and params
+            key = build_cache_key(prefix, args, kwargs)
+
+            # 2. Check Redis
+            entry = await _read_entry(key)
+            if entry is not None:
+                if entry["stale_at"] <= time.time() and key not in _inflight and await _try_lock(key):
+                    # Serve stale and let one task refresh it
+                    task = asyncio.create_task(_refresh_in_background(
+                        key, func, args, kwargs, expire_seconds, stale_seconds
+                    ))
+                    _refresh_tasks.add(task)
+                    task.add_done_callback(_refresh_tasks.discard)
+                logger.debug("HIT %s", key)
+                return entry["data"]
+
+            # 3. Miss: wait for a computation already running in this process
+            event = _inflight.get(key)
+            if event is not None:
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=LOCK_TTL_MS / 1000)
+                except asyncio.TimeoutError:
+                    pass
+                entry = await _read_entry(key)
+                if entry is not None:
+                    return entry["data"]
+
+            # 4. Another worker holds the lease: poll briefly for its result
+            if not await _try_lock(key):
+                deadline = time.monotonic() + LOCK_TTL_MS / 1000
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(_LOCK_POLL_SECONDS)
+                    entry = await _read_entry(key)
+                    if entry is not None:
+                        return entry["data"]
+
+            # 5. Run the actual heavy DB function and save to Redis
+            logger.debug("MISS %s", key)
+            return await _compute_and_store(key, func, args, kwargs, expire_seconds, stale_seconds)
+        return wrapper
+    return decorator
+
 
+async def invalidate_cached_response(endpoint, **kwargs) -> None:
+    """
+    Drop a cache_response endpoint's entry for these arguments, e.g. after a
+    write its payload reflects. Pass the same keyword arguments the endpoint
+    is called with (injected ones like db are ignored).
+    """
+    key = build_cache_key(f"{endpoint.__module__}.{endpoint.__qualname__}", (), kwargs)
+    try:
+        await redis_client.delete(key)
+    except Exception as e:
+        logger.warning("Cache invalidation failed for %s: %s", key, e)
+
+
+def cache_api_result(ttl: int = 300, negative_ttl: int = 30, scope=None):
+    """
+    Cache a third-party API connector method's result dict in Redis.
+
+    Results with status "error" (not found, quota, bad credentials) are kept
+    for negative_ttl so repeated misses don't keep burning API quota.
+    scope(self) returns a string identifying whose view of the API this is
+    (e.g. a token hash) so per-account results are never shared.
+    Works on both sync and async methods.
+    """
+    def decorator(func):
+        prefix = f"{func.__module__}.{func.__qualname__}"
+
+        def make_key(self, args, kwargs):
+            key_prefix = f"{prefix}:{scope(self) if scope else 'public'}"
+            return "api" + build_cache_key(key_prefix, args, kwargs)[len("cache"):]
+
+        def expiry(result) -> int:
+            return negative_ttl if isinstance(result, dict) and result.get("status") == "error" else ttl
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                key = make_key(self, args, kwargs)
+                try:
+                    cached_data = await redis_client.get(key)
+                    if cached_data:
+                        return orjson.loads(cached_data)
+                except Exception as e:
+                    logger.warning("Redis read error: %s", e)
+                result = await func(self, *args, **kwargs)
+                try:
+                    await redis_client.set(key, dumps(result), ex=expiry(result))
+                except Exception as e:
+                    logger.warning("Redis write error: %s", e)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = make_key(self, args, kwargs)
             try:
-                # 2. Check Redis
-                cached_data = redis_client.get(key)
+                cached_data = sync_redis_client.get(key)
                 if cached_data:
-                    print(f"⚡ HIT CACHE: {key}")
-                    return json.loads(cached_data)
+                    return orjson.loads(cached_data)
             except Exception as e:
-                print(f"⚠️ Redis Error: {e}")
-                # Fallback to DB if Redis fails
-
-            # 3. Run the actual heavy DB function
-            response_data = await func(*args, **kwargs)
-
+                logger.warning("Redis read error: %s", e)
+            result = func(self, *args, **kwargs)
             try:
-                # 4. Save to Redis
-                print(f"🐢 MISS CACHE (DB CALL): {key}")
-                redis_client.setex(
-                    key,
-                    expire_seconds,
-                    json.dumps(response_data, default=str) # default=str handles Datetime objects
-                )
+                sync_redis_client.set(key, dumps(result), ex=expiry(result))
             except Exception as e:
-                print(f"⚠️ Redis Write Error: {e}")
-            
-            return response_data
+                logger.warning("Redis write error: %s", e)
+            return result
         return wrapper
     return decorator
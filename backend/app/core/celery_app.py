@@ -19,10 +19,25 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
     task_default_queue='default',
+    # Declared highest-first: with queue_order_strategy="priority" workers
+    # drain high_priority before taking anything from default
     task_queues=(
-        Queue('default', routing_key='default'),
         Queue('high_priority', routing_key='high_priority'),
+        Queue('default', routing_key='default'),
     ),
+    task_routes={
+        'app.worker.check_scheduled_posts': {'queue': 'high_priority'},
+        'app.worker.publish_post': {'queue': 'high_priority'},
+    },
+    broker_transport_options={
+        'priority_steps': list(range(10)),
+        'queue_order_strategy': 'priority',
+    },
+    # Reserve one task at a time and ack after it runs, so a long job can't
+    # hold short ones hostage in a worker's prefetch buffer
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
     # Periodic tasks (Beat)
     beat_schedule = {
         'check-scheduled-posts-every-minute': {
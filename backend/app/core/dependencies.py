@@ -2,17 +2,27 @@
 Core Authentication Dependencies
 Provides centralized auth utilities for all protected endpoints.
 """
-from typing import Annotated, Optional
+import hashlib
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Annotated, Optional, Union
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 from sqlmodel import Session, select
-from datetime import datetime
+from sqlmodel.ext.asyncio.session import AsyncSession
+from pydantic import BaseModel
+from sqlalchemy import event, inspect
 
+from app.core import cache
 from app.core.config import settings
-from app.db.session import get_session
+from app.db.session import get_async_session, get_session
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
 
 
@@ -26,44 +36,179 @@ class AuthError(HTTPException):
         )
 
 
+# Build the HMAC key once; jose otherwise re-constructs it on every decode.
+# With the cryptography extra installed this is an OpenSSL-backed key.
+JWT_VERIFY_KEY = jwk.construct(settings.SECRET_KEY, settings.ALGORITHM)
+JWT_ALGORITHMS = (settings.ALGORITHM,)
+
+# Verified token payloads, keyed by token digest -> (payload, evict_at).
+# Re-verifying the same bearer token on every request is pure overhead; entries
+# live at most _TOKEN_CACHE_TTL seconds and never past the token's own exp.
+_TOKEN_CACHE: "OrderedDict[bytes, tuple[dict, float]]" = OrderedDict()
+_TOKEN_CACHE_MAX = 10_000
+_TOKEN_CACHE_TTL = 60
+
+
 def decode_token(token: str) -> dict:
     """Decode and validate JWT token."""
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+    cached = _TOKEN_CACHE.get(key)
+    if cached is not None:
+        payload, evict_at = cached
+        if now < evict_at:
+            return payload
+        # pop, not del: another threadpool worker may have evicted it already
+        _TOKEN_CACHE.pop(key, None)
+
     try:
         payload = jwt.decode(
             token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
+            JWT_VERIFY_KEY, 
+            algorithms=JWT_ALGORITHMS
         )
-        return payload
     except JWTError as e:
         raise AuthError(f"Invalid token: {str(e)}")
 
+    # Only successfully verified tokens are cached
+    evict_at = now + _TOKEN_CACHE_TTL
+    exp = payload.get("exp")
+    if exp:
+        evict_at = min(evict_at, exp)
+    _TOKEN_CACHE[key] = (payload, evict_at)
+    if len(_TOKEN_CACHE) > _TOKEN_CACHE_MAX:
+        _TOKEN_CACHE.popitem(last=False)
+    return payload
 
-async def get_current_user(
-    token: Annotated[Optional[str], Depends(oauth2_scheme)],
-    db: Session = Depends(get_session)
-) -> User:
+
+_REVOKED_PREFIX = "auth:revoked:"
+# Unix time in milliseconds of the user's last is_active/tier change; tokens
+# issued at or before it carry stale claims and are rejected
+_USER_CHANGED_PREFIX = "auth:user_changed:"
+
+
+def _revocation_keys(payload: dict) -> tuple[Optional[str], Optional[str]]:
+    jti = payload.get("jti")
+    uid = payload.get("uid")
+    return (
+        f"{_REVOKED_PREFIX}{jti}" if jti else None,
+        f"{_USER_CHANGED_PREFIX}{uid}" if uid else None,
+    )
+
+
+def _is_revoked(payload: dict, state: dict, revoked_key: Optional[str], changed_key: Optional[str]) -> bool:
+    if revoked_key and state.get(revoked_key) is not None:
+        return True
+    changed_at_ms = state.get(changed_key) if changed_key else None
+    if changed_at_ms is None:
+        return False
+    # Tokens from before iat_ms existed only have whole seconds; take the
+    # start of that second so a stale one is never let through
+    issued_at_ms = payload.get("iat_ms") or payload.get("iat", 0) * 1000
+    return issued_at_ms <= int(changed_at_ms)
+
+
+async def is_token_revoked(payload: dict) -> bool:
     """
-    Get authenticated user from JWT token.
-    Use as dependency in protected endpoints.
+    Check the Redis denylist for this token's jti and whether the user's
+    account changed after it was issued, in one MGET (fails open if Redis
+    is down).
     """
-    if not token:
-        raise AuthError("Authentication required")
-    
+    revoked_key, changed_key = _revocation_keys(payload)
+    keys = [k for k in (revoked_key, changed_key) if k]
+    if not keys:
+        return False
+    try:
+        values = await cache.redis_client.mget(keys)
+    except Exception:
+        return False
+    return _is_revoked(payload, dict(zip(keys, values)), revoked_key, changed_key)
+
+
+def is_token_revoked_sync(payload: dict) -> bool:
+    """is_token_revoked for sync dependencies running in the threadpool."""
+    revoked_key, changed_key = _revocation_keys(payload)
+    keys = [k for k in (revoked_key, changed_key) if k]
+    if not keys:
+        return False
+    try:
+        values = cache.sync_redis_client.mget(keys)
+    except Exception:
+        return False
+    return _is_revoked(payload, dict(zip(keys, values)), revoked_key, changed_key)
+
+
+def invalidate_user_tokens(user_id: Union[str, uuid.UUID]) -> None:
+    """
+    Reject every token issued to the user so far. Kept for the access-token
+    lifetime, after which those tokens have expired anyway.
+    """
+    cache.sync_redis_client.set(
+        f"{_USER_CHANGED_PREFIX}{user_id}", int(time.time() * 1000),
+        ex=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_stale_claims(mapper, connection, target: User) -> None:
+    # Tokens carry active/tier claims; ORM updates that change either
+    # invalidate them (bulk UPDATE statements must call invalidate_user_tokens)
+    state = inspect(target)
+    if state.attrs.is_active.history.has_changes() or state.attrs.tier.history.has_changes():
+        try:
+            invalidate_user_tokens(target.id)
+        except Exception as e:
+            logger.error("Could not invalidate tokens for user %s: %s", target.id, e)
+
+
+async def revoke_token(token: str) -> None:
+    """Add a token's jti to the denylist until the token would have expired."""
     payload = decode_token(token)
-    
+    jti = payload.get("jti")
+    if not jti:
+        return
+    ttl = int(payload.get("exp", 0) - time.time())
+    if ttl > 0:
+        await cache.redis_client.set(f"{_REVOKED_PREFIX}{jti}", "1", ex=ttl)
+
+
+def validate_payload(payload: dict) -> str:
+    """Common claim checks; returns the subject email."""
     email: str = payload.get("sub")
     if not email:
         raise AuthError("Invalid token payload")
     
     # Check token expiration
     exp = payload.get("exp")
-    if exp and datetime.utcnow().timestamp() > exp:
+    if exp and time.time() > exp:
         raise AuthError("Token has expired")
+    return email
+
+
+async def get_current_user(
+    token: Annotated[Optional[str], Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_async_session)
+) -> User:
+    """
+    Get authenticated user from JWT token.
+    Use as dependency in protected endpoints that need the full User row;
+    endpoints that only need id/tier should use TokenUser instead.
+    """
+    if not token:
+        raise AuthError("Authentication required")
+    
+    payload = decode_token(token)
+    email = validate_payload(payload)
+    if await is_token_revoked(payload):
+        raise AuthError("Token has been revoked")
     
-    # Fetch user from database
-    statement = select(User).where(User.email == email)
-    user = db.exec(statement).first()
+    # Fetch user from database (primary-key lookup when the token carries uid)
+    uid = payload.get("uid")
+    if uid:
+        user = await db.get(User, uuid.UUID(uid))
+    else:
+        statement = select(User).where(User.email == email, User.is_active)
+        user = (await db.exec(statement)).first()
     
     if not user:
         raise AuthError("User not found")
@@ -76,7 +221,7 @@ async def get_current_user(
 
 async def get_current_user_optional(
     token: Annotated[Optional[str], Depends(oauth2_scheme)],
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ) -> Optional[User]:
     """
     Get authenticated user if token provided, otherwise return None.
@@ -91,6 +236,55 @@ async def get_current_user_optional(
         return None
 
 
+class AuthUser(BaseModel):
+    """Authenticated principal built from JWT claims, without a DB round trip."""
+    id: uuid.UUID
+    email: str
+    tier: str = "free"
+    is_active: bool = True
+
+
+async def get_token_user(
+    token: Annotated[Optional[str], Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_async_session)
+) -> AuthUser:
+    """
+    Get the authenticated principal from the token's uid/tier/active claims.
+    Tokens issued before those claims existed fall back to a user lookup.
+    """
+    if not token:
+        raise AuthError("Authentication required")
+    
+    payload = decode_token(token)
+    email = validate_payload(payload)
+    if await is_token_revoked(payload):
+        raise AuthError("Token has been revoked")
+    
+    uid = payload.get("uid")
+    if not uid:
+        user = await get_current_user(token, db)
+        return AuthUser(id=user.id, email=user.email, tier=user.tier, is_active=user.is_active)
+    
+    if not payload.get("active", True):
+        raise AuthError("User account is disabled")
+    
+    return AuthUser(id=uid, email=email, tier=payload.get("tier", "free"))
+
+
+async def get_token_user_optional(
+    token: Annotated[Optional[str], Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_async_session)
+) -> Optional[AuthUser]:
+    """Claims-based principal if a valid token is provided, otherwise None."""
+    if not token:
+        return None
+    
+    try:
+        return await get_token_user(token, db)
+    except AuthError:
+        return None
+
+
 def get_user_from_header(
     authorization: Optional[str] = Header(None),
     db: Session = Depends(get_session)
@@ -110,10 +304,10 @@ def get_user_from_header(
     try:
         payload = decode_token(token)
         email = payload.get("sub")
-        if not email:
+        if not email or is_token_revoked_sync(payload):
             return None
         
-        statement = select(User).where(User.email == email)
+        statement = select(User).where(User.email == email, User.is_active)
         user = db.exec(statement).first()
         return user
     except Exception:
@@ -122,7 +316,11 @@ def get_user_from_header(
 
 # Type aliases for cleaner endpoint signatures
 CurrentUser = Annotated[User, Depends(get_current_user)]
-OptionalUser = Annotated[Optional[User], Depends(get_current_user_optional)]
+TokenUser = Annotated[AuthUser, Depends(get_token_user)]
+OptionalUser = Annotated[Optional[AuthUser], Depends(get_token_user_optional)]
+
+
+_TIER_LEVEL = {"free": 0, "pro": 1, "enterprise": 2}
 
 
 def require_tier(required_tier: str):
@@ -130,12 +328,10 @@ def require_tier(required_tier: str):
     Dependency that checks user's subscription tier.
     Usage: Depends(require_tier("pro"))
     """
-    async def check_tier(user: CurrentUser) -> User:
-        tier_hierarchy = {"free": 0, "pro": 1, "enterprise": 2}
-        user_level = tier_hierarchy.get(user.tier, 0)
-        required_level = tier_hierarchy.get(required_tier, 0)
-        
-        if user_level < required_level:
+    required_level = _TIER_LEVEL.get(required_tier, 0)
+    
+    async def check_tier(user: TokenUser) -> AuthUser:
+        if _TIER_LEVEL.get(user.tier, 0) < required_level:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"This feature requires {required_tier} tier or higher"
@@ -159,11 +355,11 @@ async def get_current_user_ws(
     try:
         payload = decode_token(token)
         email: str = payload.get("sub")
-        if not email:
+        if not email or await is_token_revoked(payload):
             return None
         
         # Fetch user from database
-        statement = select(User).where(User.email == email)
+        statement = select(User).where(User.email == email, User.is_active)
         user = db.exec(statement).first()
         return user
     except Exception:
@@ -1,3 +1,4 @@
+from redis import ConnectionPool
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from app.core.config import settings
@@ -7,10 +8,15 @@ from app.core.config import settings
 def get_user_ip_key(request):
     return get_remote_address(request)
 
+# slowapi only drives synchronous storage, so share one bounded pool rather
+# than letting the storage open its own; limited routes run in the threadpool.
+rate_limit_pool = ConnectionPool.from_url(settings.REDIS_URL, max_connections=64)
+
 # Configure Limiter
 # storage_uri will use the REDIS_URL from settings
 limiter = Limiter(
     key_func=get_user_ip_key,
     storage_uri=settings.REDIS_URL,
+    storage_options={"connection_pool": rate_limit_pool},
     default_limits=["100/minute"]
 )
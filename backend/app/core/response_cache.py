@@ -0,0 +1,47 @@
+"""
+Redis cache for agent replies to repeated questions.
+Creators ask the same few things ("how's my engagement?") over and over.
+A reply is reused only for the same user, the same normalized question and
+the same analytics snapshot, so new data always gets a fresh answer.
+"""
+import hashlib
+import logging
+import re
+from typing import Any, Dict, Optional
+
+import orjson
+
+from app.core import cache
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL = 3600
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def _normalize(message: str) -> str:
+    # Case, spacing and punctuation don't change what is being asked
+    return " ".join(_NON_WORD.sub(" ", message.lower()).split())
+
+
+def response_key(user_id: str, message: str, analytics: Dict[str, Any]) -> str:
+    snapshot = hashlib.sha1(orjson.dumps(analytics, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    question = hashlib.sha1(_normalize(message).encode()).hexdigest()
+    return f"agent:reply:{user_id}:{snapshot}:{question}"
+
+
+async def get_cached_response(key: str) -> Optional[str]:
+    try:
+        raw = await cache.redis_client.get(key)
+    except Exception as e:
+        logger.warning("Response cache read failed for %s: %s", key, e)
+        return None
+    return raw.decode() if raw is not None else None
+
+
+async def cache_response(key: str, text: str) -> None:
+    try:
+        await cache.redis_client.set(key, text, ex=RESPONSE_CACHE_TTL)
+    except Exception as e:
+        logger.warning("Response cache write failed for %s: %s", key, e)
@@ -0,0 +1,15 @@
+"""
+Default JSON response class.
+FastAPI's own ORJSONResponse is deprecated in favour of response models, but
+most routes here return plain dicts, which otherwise go through stdlib
+json.dumps. This keeps those on orjson.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
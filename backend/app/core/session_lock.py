@@ -0,0 +1,24 @@
+"""
+Per-session locks for chat endpoints.
+Serializes concurrent agent calls on the same (user, conversation) so rapid
+repeat submissions don't race on message writes or double LLM spend, while
+different sessions still run concurrently.
+"""
+import asyncio
+import weakref
+from typing import Optional, Tuple
+
+# Entries disappear once no coroutine holds or awaits the lock
+_SESSION_LOCKS: "weakref.WeakValueDictionary[Tuple[str, Optional[str]], asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def get_session_lock(user_id: str, conversation_id: Optional[str]) -> asyncio.Lock:
+    """Return the lock shared by every request on this user's conversation."""
+    key = (user_id, conversation_id)
+    lock = _SESSION_LOCKS.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _SESSION_LOCKS[key] = lock
+    return lock
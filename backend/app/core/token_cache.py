@@ -0,0 +1,69 @@
+"""
+Redis cache for OAuth token lookups.
+The stored token only changes on reconnect/refresh, so integration calls
+read it from Redis instead of querying social accounts every time. The
+cached value stays Fernet-encrypted; Redis never holds a plaintext token.
+"""
+import logging
+from datetime import datetime
+from typing import Optional
+
+import orjson
+import redis
+
+from app.core import cache
+from app.models.social_account import SocialAccount, get_user_token_async
+
+logger = logging.getLogger(__name__)
+
+TOKEN_CACHE_TTL = 300
+
+
+def _key(user_id: str, platform: str) -> str:
+    return f"oauth:token:{user_id}:{platform}"
+
+
+def _decrypt(encrypted: str) -> Optional[str]:
+    try:
+        return SocialAccount._get_cipher().decrypt(encrypted.encode()).decode()
+    except Exception:
+        return None
+
+
+async def get_cached_token(db, user_id: str, platform: str) -> Optional[str]:
+    """
+    Return the user's decrypted access token for a platform, or None.
+    Falls back to Postgres when Redis is unavailable.
+    """
+    key = _key(user_id, platform)
+    try:
+        raw = await cache.redis_client.get(key)
+    except Exception as e:
+        logger.warning("Token cache read failed for %s: %s", key, e)
+        raw = None
+    if raw is not None:
+        return _decrypt(orjson.loads(raw))
+
+    account = await get_user_token_async(db, user_id, platform)
+    if not account or not account.access_token_encrypted:
+        return None
+
+    # Never cache past the token's own expiry
+    ttl = TOKEN_CACHE_TTL
+    if account.expires_at:
+        ttl = min(ttl, int((account.expires_at - datetime.utcnow()).total_seconds()))
+    if ttl > 0:
+        try:
+            await cache.redis_client.set(key, orjson.dumps(account.access_token_encrypted), ex=ttl)
+        except Exception as e:
+            logger.warning("Token cache write failed for %s: %s", key, e)
+
+    return _decrypt(account.access_token_encrypted)
+
+
+def invalidate_token(user_id: str, platform: str) -> None:
+    """Drop the cached token after it is saved, refreshed or disconnected."""
+    try:
+        cache.sync_redis_client.delete(_key(user_id, platform))
+    except redis.RedisError as e:
+        logger.warning("Token cache invalidation failed for %s/%s: %s", user_id, platform, e)
@@ -0,0 +1,44 @@
+"""
+Schema bootstrap, run once per deploy (not per worker):
+
+    python -m app.db.init_db
+
+The Alembic history only holds incremental changes, so a fresh database is
+built with create_all and stamped at head; an existing one is upgraded.
+"""
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlmodel import SQLModel
+
+from app.db.session import engine
+# Import models so SQLModel knows about them
+from app.models import (  # noqa: F401
+    agent_memory,
+    analytics_snapshot,
+    content,
+    content_pattern,
+    conversation_memory,
+    scraped_analytics,
+    scraped_web_page,
+    social_account,
+    strategy,
+    user,
+)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def init_db() -> None:
+    config = Config(str(ALEMBIC_INI))
+    if inspect(engine).has_table("alembic_version"):
+        command.upgrade(config, "head")
+    else:
+        SQLModel.metadata.create_all(engine)
+        command.stamp(config, "head")
+
+
+if __name__ == "__main__":
+    init_db()
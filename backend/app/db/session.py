@@ -1,12 +1,60 @@
+import uuid
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # Note: "localhost" works when running locally.
 # If running inside Docker, change "localhost" to "db" (or "postgres" based on our docker-compose service name)
 # We use "postgres" as the service name in docker-compose.yml
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+# Size the pool for FastAPI's threadpool instead of the 5+10 default.
+# LIFO reuse keeps recently used connections (and their server caches) warm.
+pool_kwargs = {}
+if settings.DATABASE_URL.startswith("postgresql"):
+    pool_kwargs = dict(
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        pool_use_lifo=True,
+    )
+
+engine = create_engine(settings.DATABASE_URL, **pool_kwargs)
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+def _async_url(url: str) -> str:
+    """Point a plain postgres URL at the asyncpg driver."""
+    for prefix in ("postgresql://", "postgres://", "postgresql+psycopg2://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+# Async engine for hot paths that shouldn't hold a threadpool thread per query.
+# Routes are migrated to it incrementally; both engines share the pool settings.
+# Behind PgBouncer (transaction mode) consecutive statements can land on
+# different server connections, so asyncpg must not reuse named prepared
+# statements: disable both statement caches and give each one a unique name.
+async_connect_args = {}
+if settings.POSTGRES_PGBOUNCER:
+    async_connect_args = dict(
+        statement_cache_size=0,
+        prepared_statement_cache_size=0,
+        prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+    )
+
+async_engine = create_async_engine(
+    _async_url(settings.DATABASE_URL), connect_args=async_connect_args, **pool_kwargs
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def get_async_session():
+    async with AsyncSessionLocal() as session:
+        yield session
@@ -7,8 +7,41 @@ https://developers.facebook.com/docs/instagram-api/
 
 from typing import Dict, Any
 from datetime import datetime
+import hashlib
 import os
 
+import httpx
+
+from app.core.cache import cache_api_result
+
+
+def _token_scope(connector) -> str:
+    """Graph API results ("me", insights) are per account token."""
+    if not connector.access_token:
+        return "none"
+    return hashlib.blake2b(connector.access_token.encode(), digest_size=8).hexdigest()
+
+
+# Shared async client so TCP/TLS connections are reused across Graph API
+# calls and requests don't block the event loop
+_http_client = None
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+        )
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class InstagramConnector:
     """
@@ -25,18 +58,16 @@ class InstagramConnector:
     def __init__(self, access_token: str = None):
         self.access_token = access_token or os.getenv("INSTAGRAM_ACCESS_TOKEN")
     
-    def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
+    async def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
         """Make API request."""
         if not self.access_token:
             return None
         
         try:
-            import httpx
-            
             params = params or {}
             params["access_token"] = self.access_token
             
-            response = httpx.get(f"{self.API_BASE}/{endpoint}", params=params)
+            response = await _get_http_client().get(f"{self.API_BASE}/{endpoint}", params=params)
             
             if response.status_code == 200:
                 return response.json()
@@ -47,11 +78,12 @@ class InstagramConnector:
             print(f"Instagram request error: {e}")
             return None
     
-    def get_profile(self, user_id: str = "me") -> Dict[str, Any]:
+    @cache_api_result(ttl=300, scope=_token_scope)
+    async def get_profile(self, user_id: str = "me") -> Dict[str, Any]:
         """
         Get user profile information.
         """
-        data = self._make_request(
+        data = await self._make_request(
             user_id,
             params={"fields": "id,username,account_type,media_count"}
         )
@@ -67,11 +99,12 @@ class InstagramConnector:
             }
         return {"status": "error", "error": "Profile not found or access denied"}
     
-    def get_media(self, user_id: str = "me", limit: int = 10) -> Dict[str, Any]:
+    @cache_api_result(ttl=300, scope=_token_scope)
+    async def get_media(self, user_id: str = "me", limit: int = 10) -> Dict[str, Any]:
         """
         Get user's recent media.
         """
-        data = self._make_request(
+        data = await self._make_request(
             f"{user_id}/media",
             params={
                 "fields": "id,caption,media_type,media_url,permalink,timestamp,like_count,comments_count",
@@ -99,11 +132,12 @@ class InstagramConnector:
             }
         return {"status": "error", "error": "Media not found"}
     
-    def get_insights(self, user_id: str = "me") -> Dict[str, Any]:
+    @cache_api_result(ttl=300, scope=_token_scope)
+    async def get_insights(self, user_id: str = "me") -> Dict[str, Any]:
         """
         Get account insights (requires Instagram Business account).
         """
-        data = self._make_request(
+        data = await self._make_request(
             f"{user_id}/insights",
             params={
                 "metric": "impressions,reach,profile_views,follower_count",
@@ -124,11 +158,12 @@ class InstagramConnector:
             }
         return {"status": "error", "error": "Insights not available (Business account required)"}
     
-    def get_media_insights(self, media_id: str) -> Dict[str, Any]:
+    @cache_api_result(ttl=300, scope=_token_scope)
+    async def get_media_insights(self, media_id: str) -> Dict[str, Any]:
         """
         Get insights for a specific media item.
         """
-        data = self._make_request(
+        data = await self._make_request(
             f"{media_id}/insights",
             params={"metric": "impressions,reach,engagement,saved"}
         )
@@ -9,10 +9,69 @@ Free tier: 10,000 units/day
 https://developers.google.com/youtube/v3
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
 import os
 
+import orjson
+
+from app.core.cache import cache_api_result, sync_redis_client
+
+
+def _credential_scope(connector) -> str:
+    """
+    OAuth results include the owner's private and unlisted items, so they are
+    per user; API-key results are public data and shared.
+    """
+    if connector._access_token:
+        return f"oauth:{connector.user_id}"
+    return "key" if connector._api_key else "none"
+
+
+# channels.list / videos.list accept up to 50 comma-separated ids per call
+# for the same 1-unit quota cost as a single id
+_MAX_IDS_PER_CALL = 50
+
+# Last response per resource, kept alongside its ETag for conditional GETs
+_ETAG_TTL = 24 * 3600
+
+
+def _format_channel(item: Dict[str, Any], fetched_at: str) -> Dict[str, Any]:
+    stats = item.get("statistics", {})
+    snippet = item.get("snippet", {})
+    return {
+        "status": "success",
+        "channel_id": item.get("id"),
+        "title": snippet.get("title"),
+        "description": snippet.get("description", "")[:200],
+        "thumbnail": snippet.get("thumbnails", {}).get("default", {}).get("url"),
+        "stats": {
+            "subscribers": int(stats.get("subscriberCount", 0)),
+            "total_views": int(stats.get("viewCount", 0)),
+            "video_count": int(stats.get("videoCount", 0))
+        },
+        "fetched_at": fetched_at
+    }
+
+
+def _format_video(item: Dict[str, Any], fetched_at: str) -> Dict[str, Any]:
+    stats = item.get("statistics", {})
+    snippet = item.get("snippet", {})
+    return {
+        "status": "success",
+        "video_id": item.get("id"),
+        "title": snippet.get("title"),
+        "description": snippet.get("description", "")[:200],
+        "thumbnail": snippet.get("thumbnails", {}).get("high", {}).get("url"),
+        "published_at": snippet.get("publishedAt"),
+        "stats": {
+            "views": int(stats.get("viewCount", 0)),
+            "likes": int(stats.get("likeCount", 0)),
+            "comments": int(stats.get("commentCount", 0))
+        },
+        "fetched_at": fetched_at
+    }
+
 
 class YouTubeConnector:
     """
@@ -81,10 +140,49 @@ class YouTubeConnector:
         
         return None
     
+    def _execute_with_etag(self, request, resource_key: str) -> Dict[str, Any]:
+        """
+        Execute a list request as a conditional GET.
+        The last response is stored with its ETag; on 304 Not Modified the
+        stored response is returned instead of downloading it again.
+        """
+        from googleapiclient.errors import HttpError
+
+        key = f"yt:etag:{_credential_scope(self)}:{resource_key}"
+        stored = None
+        try:
+            raw = sync_redis_client.get(key)
+            if raw:
+                stored = orjson.loads(raw)
+                request.headers["If-None-Match"] = stored["etag"]
+        except Exception as e:
+            print(f"ETag cache read error: {e}")
+
+        try:
+            response = request.execute()
+        except HttpError as e:
+            if stored is not None and e.resp.status == 304:
+                try:
+                    sync_redis_client.expire(key, _ETAG_TTL)
+                except Exception:
+                    pass
+                return stored["response"]
+            raise
+
+        if response.get("etag"):
+            try:
+                sync_redis_client.set(
+                    key, orjson.dumps({"etag": response["etag"], "response": response}), ex=_ETAG_TTL
+                )
+            except Exception as e:
+                print(f"ETag cache write error: {e}")
+        return response
+
     # ========================================
     # REAL API IMPLEMENTATION
     # ========================================
 
+    @cache_api_result(ttl=300, scope=_credential_scope)
     def get_channel_stats(self, channel_id: str) -> Dict[str, Any]:
         """
         Get channel statistics.
@@ -95,35 +193,20 @@ class YouTubeConnector:
             return {"status": "error", "error": "No YouTube credentials found"}
         
         try:
-            response = client.channels().list(
+            response = self._execute_with_etag(client.channels().list(
                 part="statistics,snippet,contentDetails",
                 id=channel_id
-            ).execute()
+            ), f"channels:{channel_id}")
             
             if response.get("items"):
-                item = response["items"][0]
-                stats = item.get("statistics", {})
-                snippet = item.get("snippet", {})
-                
-                return {
-                    "status": "success",
-                    "channel_id": channel_id,
-                    "title": snippet.get("title"),
-                    "description": snippet.get("description", "")[:200],
-                    "thumbnail": snippet.get("thumbnails", {}).get("default", {}).get("url"),
-                    "stats": {
-                        "subscribers": int(stats.get("subscriberCount", 0)),
-                        "total_views": int(stats.get("viewCount", 0)),
-                        "video_count": int(stats.get("videoCount", 0))
-                    },
-                    "fetched_at": datetime.utcnow().isoformat()
-                }
+                return _format_channel(response["items"][0], datetime.utcnow().isoformat())
             return {"status": "error", "error": "Channel not found"}
             
         except Exception as e:
             print(f"YouTube API error: {e}")
             return {"status": "error", "error": str(e)}
     
+    @cache_api_result(ttl=300, scope=_credential_scope)
     def get_video_stats(self, video_id: str) -> Dict[str, Any]:
         """
         Get video statistics.
@@ -134,35 +217,64 @@ class YouTubeConnector:
             return {"status": "error", "error": "No YouTube credentials found"}
 
         try:
-            response = client.videos().list(
+            response = self._execute_with_etag(client.videos().list(
                 part="statistics,snippet,contentDetails",
                 id=video_id
-            ).execute()
+            ), f"videos:{video_id}")
             
             if response.get("items"):
-                item = response["items"][0]
-                stats = item.get("statistics", {})
-                snippet = item.get("snippet", {})
-                
-                return {
-                    "status": "success",
-                    "video_id": video_id,
-                    "title": snippet.get("title"),
-                    "description": snippet.get("description", "")[:200],
-                    "thumbnail": snippet.get("thumbnails", {}).get("high", {}).get("url"),
-                    "published_at": snippet.get("publishedAt"),
-                    "stats": {
-                        "views": int(stats.get("viewCount", 0)),
-                        "likes": int(stats.get("likeCount", 0)),
-                        "comments": int(stats.get("commentCount", 0))
-                    },
-                    "fetched_at": datetime.utcnow().isoformat()
-                }
+                return _format_video(response["items"][0], datetime.utcnow().isoformat())
             return {"status": "error", "error": "Video not found"}
         except Exception as e:
             print(f"YouTube API error: {e}")
             return {"status": "error", "error": str(e)}
     
+    def _list_many(self, resource: str, ids: List[str], formatter) -> Dict[str, Any]:
+        """Fetch statistics for many ids, 50 per API call."""
+        client = self._get_client()
+        if not client:
+            return {"status": "error", "error": "No YouTube credentials found"}
+
+        ids = list(dict.fromkeys(ids))  # dedupe, keep order
+        fetched_at = datetime.utcnow().isoformat()
+        items = {}
+        try:
+            for start in range(0, len(ids), _MAX_IDS_PER_CALL):
+                chunk = ",".join(ids[start:start + _MAX_IDS_PER_CALL])
+                response = self._execute_with_etag(getattr(client, resource)().list(
+                    part="statistics,snippet,contentDetails",
+                    id=chunk
+                ), f"{resource}:{chunk}")
+                for item in response.get("items", []):
+                    items[item["id"]] = formatter(item, fetched_at)
+        except Exception as e:
+            print(f"YouTube API error: {e}")
+            return {"status": "error", "error": str(e)}
+
+        return {
+            "status": "success",
+            "items": items,
+            "missing": [i for i in ids if i not in items],
+            "fetched_at": fetched_at
+        }
+
+    @cache_api_result(ttl=300, scope=_credential_scope)
+    def get_channels_stats(self, channel_ids: List[str]) -> Dict[str, Any]:
+        """
+        Get statistics for many channels, keyed by channel id.
+        Cost: 1 unit per 50 channels
+        """
+        return self._list_many("channels", channel_ids, _format_channel)
+
+    @cache_api_result(ttl=300, scope=_credential_scope)
+    def get_videos_stats(self, video_ids: List[str]) -> Dict[str, Any]:
+        """
+        Get statistics for many videos, keyed by video id.
+        Cost: 1 unit per 50 videos
+        """
+        return self._list_many("videos", video_ids, _format_video)
+
+    @cache_api_result(ttl=300, scope=_credential_scope)
     def get_channel_videos(self, channel_id: str, max_results: int = 10) -> Dict[str, Any]:
         """
         Get recent videos from a channel.
@@ -201,6 +313,7 @@ class YouTubeConnector:
             print(f"YouTube API error: {e}")
             return {"status": "error", "error": str(e)}
     
+    @cache_api_result(ttl=900, scope=_credential_scope)
     def search_videos(self, query: str, max_results: int = 10) -> Dict[str, Any]:
         """
         Search for videos.
@@ -1,9 +1,13 @@
+from contextlib import asynccontextmanager
+import functools
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.session import engine
+from app.db.session import async_engine
 from sqlmodel import SQLModel
 # Import models so SQLModel knows about them
 from app.core.config import settings
+from app.core.responses import ORJSONResponse
+from app.services.agent_memory import MemoryCacheMiddleware
 import sentry_sdk
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -27,16 +31,53 @@ from app.api.v1 import stream
 from app.api.v1 import trends
 from app.api.v1 import analyze
 from app.api.v1 import agents
-from app.api.v1 import stream
 from app.api.v1 import voice
+from app.integrations.youtube import get_youtube_connector
+from app.integrations.instagram import close_http_client as close_instagram_client
+
+# Probes hit these every few seconds; tracing them is pure overhead
+_UNTRACED_PATHS = frozenset({"/", "/health"})
+
+
+def _traces_sampler(sampling_context):
+    scope = sampling_context.get("asgi_scope") or {}
+    if scope.get("path") in _UNTRACED_PATHS:
+        return 0.0
+    return settings.SENTRY_TRACES_SAMPLE_RATE
+
 
 if settings.SENTRY_DSN:
     sentry_sdk.init(
         dsn=settings.SENTRY_DSN,
-        traces_sample_rate=1.0,
-        profiles_sample_rate=1.0,
+        traces_sampler=_traces_sampler,
+        profiles_sample_rate=settings.SENTRY_PROFILES_SAMPLE_RATE,
+        send_default_pii=False,
     )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create tables automatically in development only; deployments migrate
+    # once via `python -m app.db.init_db` before the workers start
+    if settings.DEV_AUTOCREATE:
+        # This will fail if DB is not running, but that's expected for now
+        try:
+            async with async_engine.begin() as conn:
+                await conn.run_sync(SQLModel.metadata.create_all)
+        except Exception as e:
+            print(f"Warning: Could not connect to database to create tables. {e}")
+    
+    # Warm LLM clients so the first user request doesn't pay the handshake
+    await trends.prewarm_clients()
+    # Build the shared YouTube client (and its discovery imports) up front
+    get_youtube_connector()._get_client()
+    
+    yield
+    
+    await trends.close_clients()
+    await close_instagram_client()
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title="Creator OS API",
     description="Backend API for the Content Creator OS. \n\nFeatures:\n* **Multi-Platform Analytics** (YouTube, Instagram)\n* **AI Strategy Generation**\n* **Automated Content Scheduling**",
@@ -48,6 +89,8 @@ app = FastAPI(
     license_info={
         "name": "Proprietary",
     },
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
@@ -55,28 +98,37 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # Build allowed origins list from settings + always allow chrome extensions
 allowed_origins = [origin.strip() for origin in settings.ALLOWED_ORIGINS.split(",") if origin.strip()]
 
+class CachedCORSMiddleware(CORSMiddleware):
+    """
+    CORSMiddleware that remembers the allow decision per Origin. The extension
+    polls from the same few origins, so repeat checks skip the regex and list
+    scan entirely.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.is_allowed_origin = functools.lru_cache(maxsize=1024)(self.is_allowed_origin)
+
+
+# Request-scoped cache for agent memory reads
+app.add_middleware(MemoryCacheMiddleware)
+
 app.add_middleware(
-    CORSMiddleware,
+    CachedCORSMiddleware,
     allow_origins=allowed_origins,
-    allow_origin_regex=r"chrome-extension://.*",  # Always allow Chrome extensions
+    # Always allow Chrome extensions (ids are 32 chars a-p)
+    allow_origin_regex=r"chrome-extension://[a-p]{32}",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-@app.on_event("startup")
-def on_startup():
-    # Create tables automatically
-    # This will fail if DB is not running, but that's expected for now
-    try:
-        SQLModel.metadata.create_all(engine)
-    except Exception as e:
-        print(f"Warning: Could not connect to database to create tables. {e}")
-
 @app.get("/")
 def root():
     return {"status": "Creator OS is Online"}
 
+_HEALTH_BODY = b'{"status":"ok","service":"creator-os-backend"}'
+
+
 @app.get("/health")
 def health_check():
     """Health check endpoint for extension connectivity."""
@@ -104,7 +156,24 @@ app.include_router(scrape.router, prefix="/api/v1/scrape", tags=["scrape"])
 app.include_router(stream.router, prefix="/api/v1/stream", tags=["stream"])
 app.include_router(trends.router, prefix="/api/v1/trends", tags=["trends"])
 app.include_router(agents.router, prefix="/api/v1/agents", tags=["agents"])
-app.include_router(stream.router, prefix="/api/v1/stream", tags=["stream"])
 app.include_router(voice.router, prefix="/api/v1/voice", tags=["voice"])
 
 
+async def asgi_app(scope, receive, send):
+    """
+    Server entrypoint. Answers GET /health before CORS, rate limiting and
+    Sentry run, since probes call it every few seconds; everything else
+    (including lifespan) goes to the FastAPI app.
+    """
+    if scope["type"] == "http" and scope["path"] == "/health" and scope["method"] in ("GET", "HEAD"):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_HEALTH_BODY)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else _HEALTH_BODY})
+        return
+    await app(scope, receive, send)
@@ -4,13 +4,18 @@ Each row stores a ``user_id``, a ``key`` and a JSON ``value``.
 """
 
 from sqlmodel import SQLModel, Field
-from sqlalchemy import JSON
+from sqlalchemy import JSON, UniqueConstraint
+from app.models.base import utc_timestamp
 from datetime import datetime
 from typing import Any, Dict
 
 class AgentMemory(SQLModel, table=True):
+    # One value per key; conflict target for save_memory's upsert
+    __table_args__ = (UniqueConstraint("user_id", "key", name="uq_agentmemory_user_key"),)
+
     id: int | None = Field(default=None, primary_key=True)
-    user_id: str = Field(index=True)
-    key: str = Field(index=True)
+    # Both served by uq_agentmemory_user_key (user_id is its leading column)
+    user_id: str
+    key: str
     value: Dict = Field(sa_type=JSON)
-    timestamp: datetime = Field(default_factory=datetime.utcnow, index=True)
+    timestamp: datetime = utc_timestamp(index=True)
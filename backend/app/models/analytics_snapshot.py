@@ -0,0 +1,67 @@
+"""
+User Analytics Snapshot Model
+Denormalized copy of the agent's analytics summary, one row per user, so a
+new agent can answer with a primary-key read instead of re-scanning scraped
+analytics and content performance.
+"""
+from sqlmodel import SQLModel, Field, Session, delete
+from sqlalchemy import Column
+from sqlalchemy.types import JSON
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from app.models.base import utc_timestamp
+from datetime import datetime, timedelta
+from typing import Dict
+
+# Bump when the summary's shape changes; older rows are then recomputed
+SNAPSHOT_VERSION = 1
+
+# Invalidation deletes the row, which can't stop a summary that was being
+# computed at the time from being stored afterwards; the max age bounds how
+# long such a stale snapshot is served
+SNAPSHOT_MAX_AGE = timedelta(minutes=10)
+
+
+class UserAnalyticsSnapshot(SQLModel, table=True):
+    __tablename__ = "user_analytics_snapshot"
+
+    user_id: str = Field(primary_key=True)
+    data: Dict = Field(default_factory=dict, sa_column=Column(JSON().with_variant(JSONB, "postgresql")))
+    source_version: int = Field(default=SNAPSHOT_VERSION)
+    # When the source data was read (set by the writer, not the write time)
+    updated_at: datetime = utc_timestamp(onupdate=True)
+    
+    def is_current(self) -> bool:
+        return (
+            self.source_version == SNAPSHOT_VERSION
+            and datetime.utcnow() - self.updated_at < SNAPSHOT_MAX_AGE
+        )
+
+
+def invalidate_analytics_snapshot(db: Session, user_id: str) -> None:
+    """
+    Drop the user's snapshot when their analytics change. Runs in the caller's
+    transaction, so it commits together with the new data.
+    """
+    db.exec(delete(UserAnalyticsSnapshot).where(UserAnalyticsSnapshot.user_id == user_id))
+
+
+def store_analytics_snapshot(db: Session, user_id: str, data: Dict, computed_at: datetime) -> None:
+    """
+    Upsert the user's snapshot and commit. A plain ORM update would fail
+    (StaleDataError) if an invalidation deleted the row meanwhile; the upsert
+    just recreates it. A snapshot computed from newer data is never replaced.
+    """
+    stmt = pg_insert(UserAnalyticsSnapshot).values(
+        user_id=user_id, data=data, source_version=SNAPSHOT_VERSION, updated_at=computed_at
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserAnalyticsSnapshot.user_id],
+        set_={
+            "data": stmt.excluded.data,
+            "source_version": stmt.excluded.source_version,
+            "updated_at": stmt.excluded.updated_at,
+        },
+        where=UserAnalyticsSnapshot.updated_at < stmt.excluded.updated_at
+    )
+    db.execute(stmt)
+    db.commit()
@@ -1,8 +1,97 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy import BigInteger, Column, Enum as SAEnum, Identity, Integer
+from sqlalchemy.types import DateTime
 from datetime import datetime
+from enum import Enum
+import os
+import time
 import uuid
 
+
+class utcnow(FunctionElement):
+    """Naive UTC 'now', matching the datetime.utcnow values the app writes."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(JSONB, "sqlite")
+def _sqlite_jsonb(element, compiler, **kw):
+    # Lets Postgres-only JSONB columns create on the SQLite test database
+    return "JSON"
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "timezone('utc', now())"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+def utc_timestamp(onupdate: bool = False, **kwargs):
+    """
+    Timestamp field stamped in Python for ORM writes, with the same value as
+    a server default so bulk loads and raw SQL inserts get one too.
+    """
+    column_kwargs = {"server_default": utcnow()}
+    if onupdate:
+        column_kwargs["onupdate"] = datetime.utcnow
+    return Field(default_factory=datetime.utcnow, sa_column_kwargs=column_kwargs, **kwargs)
+
+
+def server_timestamp(onupdate: bool = False, **kwargs):
+    """
+    Timestamp stamped only by the database, for insert-heavy tables: no
+    Python clock call or bind value per row. Models using it set
+    ``eager_defaults`` so the value comes back via RETURNING on the INSERT.
+    """
+    column_kwargs = {"server_default": utcnow(), "nullable": False}
+    if onupdate:
+        column_kwargs["onupdate"] = utcnow()
+    return Field(default=None, sa_column_kwargs=column_kwargs, **kwargs)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7): 48-bit millisecond timestamp
+    followed by random bits. New primary keys land at the right edge of the
+    B-tree instead of splitting random pages like uuid4 does.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)    # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)    # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+def bigint_pk():
+    """
+    Internal BIGINT identity primary key: half the width of a UUID in the PK
+    index and every index or FK that references it. Rows keep a UUID
+    `public_id` for anything exposed through the API. (SQLite only
+    autoincrements INTEGER PRIMARY KEY, hence the variant for tests.)
+    """
+    return Field(default=None, sa_column=Column(
+        BigInteger().with_variant(Integer, "sqlite"), Identity(always=True), primary_key=True
+    ))
+
+
+def enum_field(enum_cls: type[Enum], name: str, default: Enum):
+    """
+    Column backed by a Postgres ENUM type (4 bytes per row instead of a text
+    value) holding the members' values. Other backends get a CHECK constraint.
+    """
+    return Field(default=default, sa_column=Column(
+        SAEnum(enum_cls, name=name, values_callable=lambda e: [m.value for m in e]),
+        nullable=False, server_default=default.value
+    ))
+
+
 class TimestampModel(SQLModel):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = utc_timestamp()
+    updated_at: datetime = utc_timestamp(onupdate=True)
@@ -2,11 +2,20 @@ from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, Dict, List
 from datetime import datetime
 import uuid
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.types import JSON
 from sqlalchemy.dialects.postgresql import JSONB
+from app.models.base import utc_timestamp
 
 class ContentPerformance(SQLModel, table=True):
+    # Append-only snapshots: BRIN on the insert-ordered timestamp stays tiny
+    __table_args__ = (
+        Index(
+            "ix_contentperformance_recorded_at_brin", "recorded_at",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32}
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     draft_id: uuid.UUID = Field(foreign_key="contentdraft.id", index=True)
     
@@ -17,12 +26,20 @@ class ContentPerformance(SQLModel, table=True):
     shares: int = 0
     
     # When did we capture this data?
-    recorded_at: datetime = Field(default_factory=datetime.utcnow)
+    recorded_at: datetime = utc_timestamp()
     
     # Link back to parent
     draft: "ContentDraft" = Relationship(back_populates="performance_history")
 
 class ContentDraft(SQLModel, table=True):
+    # jsonb_path_ops GIN: small index that serves ai_analysis @> '{...}' lookups
+    __table_args__ = (
+        Index(
+            "ix_contentdraft_ai_analysis_gin", "ai_analysis",
+            postgresql_using="gin", postgresql_ops={"ai_analysis": "jsonb_path_ops"}
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: str
     text_content: str
@@ -31,9 +48,9 @@ class ContentDraft(SQLModel, table=True):
     
     # Store AI Analysis as JSON
     # Pydantic doesn't validate JSONB contents by default, so we treat it as Dict
-    ai_analysis: Dict = Field(default={}, sa_column=Column(JSON().with_variant(JSONB, "postgresql")))
+    ai_analysis: Dict = Field(default_factory=dict, sa_column=Column(JSON().with_variant(JSONB, "postgresql")))
     
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = utc_timestamp()
     scheduled_for: Optional[datetime] = None  # New: Schedule post
     
     # Link to analytics
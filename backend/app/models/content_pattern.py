@@ -2,9 +2,10 @@ from sqlmodel import SQLModel, Field
 from typing import Dict, Optional
 from datetime import datetime
 import uuid
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.types import JSON
 from sqlalchemy.dialects.postgresql import JSONB
+from app.models.base import utc_timestamp
 
 
 class ContentPattern(SQLModel, table=True):
@@ -12,6 +13,15 @@ class ContentPattern(SQLModel, table=True):
     Stores detected patterns in content performance.
     Used by the Intelligence Layer for pattern detection and causal explanations.
     """
+    # jsonb_path_ops GIN: serves pattern_data @> '{"type": "..."}' lookups
+    __table_args__ = (
+        Index(
+            "ix_contentpattern_pattern_data_gin", "pattern_data",
+            postgresql_using="gin", postgresql_ops={"pattern_data": "jsonb_path_ops"}
+        ),
+        Index("ix_contentpattern_user_type_platform", "user_id", "pattern_type", "platform"),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: str = Field(index=True)
     
@@ -25,7 +35,7 @@ class ContentPattern(SQLModel, table=True):
     # - posting_time: {"optimal_hours": [20, 21], "optimal_days": ["tuesday", "thursday"]}
     # - caption_structure: {"style": "short", "max_chars": 150, "uses_emoji": true}
     # - engagement_velocity: {"first_hour_likes": 50, "correlation_score": 0.85}
-    pattern_data: Dict = Field(default={}, sa_column=Column(JSON().with_variant(JSONB, "postgresql")))
+    pattern_data: Dict = Field(default_factory=dict, sa_column=Column(JSON().with_variant(JSONB, "postgresql")))
     
     # Statistical Confidence
     confidence_score: float = Field(default=0.0)  # 0.0 to 1.0
@@ -39,8 +49,8 @@ class ContentPattern(SQLModel, table=True):
     explanation: str = Field(default="")  # e.g., "Reels with faces perform 2.3× better"
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = utc_timestamp()
+    updated_at: datetime = utc_timestamp(onupdate=True)
 
 
 class PatternRecommendation(SQLModel, table=True):
@@ -66,4 +76,4 @@ class PatternRecommendation(SQLModel, table=True):
     is_active: bool = Field(default=True)
     is_dismissed: bool = Field(default=False)
     
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = utc_timestamp()
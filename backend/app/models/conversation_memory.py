@@ -3,7 +3,9 @@ Conversation Memory Model
 Stores chat history and context for the AI Agent.
 """
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import JSON, Text
+from sqlalchemy import JSON, Index, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from app.models.base import utc_timestamp
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 import uuid
@@ -24,20 +26,39 @@ class Conversation(SQLModel, table=True):
     page_url: Optional[str] = None  # URL when conversation started
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    last_message_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = utc_timestamp()
+    last_message_at: datetime = utc_timestamp()
     
     # Status
     is_archived: bool = Field(default=False)
     message_count: int = Field(default=0)
+    
+    # Rolling summary of the messages up to summarized_through; only newer
+    # messages are sent to the model verbatim
+    rolling_summary: Optional[str] = Field(default=None, sa_column=Column(Text))
+    summarized_through: Optional[datetime] = None
 
 
 class Message(SQLModel, table=True):
     """A single message in a conversation."""
     __tablename__ = "messages"
+    # jsonb_path_ops GIN: serves tool_result @> '{...}' lookups
+    __table_args__ = (
+        Index(
+            "ix_messages_tool_result_gin", "tool_result",
+            postgresql_using="gin", postgresql_ops={"tool_result": "jsonb_path_ops"}
+        ),
+        Index(
+            "ix_messages_created_at_brin", "created_at",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32}
+        ),
+        # History, previews and transcripts all read one conversation in
+        # created_at order; also serves plain conversation_id lookups
+        Index("ix_messages_conversation_created", "conversation_id", "created_at"),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    conversation_id: uuid.UUID = Field(foreign_key="conversations.id", index=True)
+    conversation_id: uuid.UUID = Field(foreign_key="conversations.id")
     
     # Message content
     role: str = Field(index=True)  # user, assistant, tool, system
@@ -46,15 +67,15 @@ class Message(SQLModel, table=True):
     # For tool calls
     tool_name: Optional[str] = None
     tool_call_id: Optional[str] = None
-    tool_arguments: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
-    tool_result: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+    tool_arguments: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON().with_variant(JSONB, "postgresql")))
+    tool_result: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON().with_variant(JSONB, "postgresql")))
     
     # Metadata
     tokens_used: Optional[int] = None
     latency_ms: Optional[int] = None
     
     # Timestamp
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = utc_timestamp()
 
 
 class AgentContext(SQLModel, table=True):
@@ -73,7 +94,7 @@ class AgentContext(SQLModel, table=True):
     
     # TTL
     expires_at: Optional[datetime] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = utc_timestamp()
 
 
 # ===== Pydantic Models for API =====
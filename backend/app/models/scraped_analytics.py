@@ -3,7 +3,8 @@ Scraped Analytics Model
 Stores analytics data scraped via browser extension from YouTube Studio, Instagram Insights, etc.
 """
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index, text
+from app.models.base import utc_timestamp
 from datetime import datetime
 from typing import Optional, Dict, Any
 import uuid
@@ -15,6 +16,19 @@ class ScrapedAnalytics(SQLModel, table=True):
     This is used when OAuth is not available/desired.
     """
     __tablename__ = "scraped_analytics"
+    # Dashboard reads: one user's rows (optionally per platform), newest first.
+    # INCLUDE carries the latest-per-platform columns so those reads skip the heap.
+    __table_args__ = (
+        Index(
+            "ix_scraped_analytics_user_platform_scraped_at", "user_id", "platform", text("scraped_at DESC"),
+            postgresql_include=["views", "followers", "subscribers", "engagement_rate", "watch_time_minutes"]
+        ),
+        # Time-range scans across users (rows arrive in scraped_at order)
+        Index(
+            "ix_scraped_analytics_scraped_at_brin", "scraped_at",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32}
+        ),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: str = Field(index=True)
@@ -34,8 +48,8 @@ class ScrapedAnalytics(SQLModel, table=True):
     source_url: Optional[str] = None
     
     # Timestamps
-    scraped_at: datetime = Field(default_factory=datetime.utcnow)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    scraped_at: datetime = utc_timestamp()
+    created_at: datetime = utc_timestamp()
 
 
 class ScrapedAnalyticsSummary(SQLModel):
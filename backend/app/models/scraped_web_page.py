@@ -8,6 +8,7 @@ from typing import Optional, Dict, Any
 from sqlmodel import SQLModel, Field
 from sqlalchemy import Column
 from sqlalchemy.dialects.postgresql import JSON
+from app.models.base import utc_timestamp
 
 
 class ScrapedWebPage(SQLModel, table=True):
@@ -40,8 +41,8 @@ class ScrapedWebPage(SQLModel, table=True):
     detected_metrics: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON))
     
     # Timestamps
-    scraped_at: datetime = Field(default_factory=datetime.utcnow)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    scraped_at: datetime = utc_timestamp()
+    created_at: datetime = utc_timestamp()
     
     class Config:
         arbitrary_types_allowed = True
@@ -6,20 +6,66 @@ Supports: YouTube, Instagram, LinkedIn, Twitter, TikTok
 """
 
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index, UniqueConstraint, text
+from app.models.base import utc_timestamp
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 import uuid
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet
+import functools
 import os
 import base64
 
 
+def _to_fernet(key: str) -> Fernet:
+    # Ensure key is valid Fernet format (32 bytes, base64-encoded)
+    try:
+        return Fernet(key.encode())
+    except Exception:
+        # Fallback: generate valid key from input
+        padded_key = (key + "=" * 32)[:32]
+        valid_key = base64.urlsafe_b64encode(padded_key.encode())
+        return Fernet(valid_key)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_cipher_cached() -> MultiFernet:
+    """
+    Build the token cipher once per process.
+    TOKEN_ENCRYPTION_KEY may list several comma-separated keys: the first
+    encrypts, all of them decrypt, so keys can be rotated without a re-encrypt.
+    """
+    key = os.getenv("TOKEN_ENCRYPTION_KEY")
+    if not key:
+        if os.getenv("ENVIRONMENT") == "production":
+            raise ValueError("TOKEN_ENCRYPTION_KEY must be set in production!")
+        # Generate a default key for development
+        key = base64.urlsafe_b64encode(b"creator-os-dev-key-32b!").decode()
+    
+    return MultiFernet([_to_fernet(k.strip()) for k in key.split(",") if k.strip()])
+
+
 class SocialAccount(SQLModel, table=True):
     """
     Stores OAuth tokens for each user's connected social accounts.
     
     Security: Tokens are encrypted at rest using Fernet (AES-128).
     """
+    # Matches get_user_token's WHERE user_id = ? AND platform = ? AND is_active
+    __table_args__ = (
+        # One connection per platform; also the conflict target for save_social_account
+        UniqueConstraint("user_id", "platform", name="uq_socialaccount_user_platform"),
+        Index(
+            "ix_socialaccount_user_platform_active", "user_id", "platform",
+            postgresql_where=text("is_active")
+        ),
+        # Refresh sweep: only rows that can actually be refreshed are indexed
+        Index(
+            "ix_socialaccount_expiry_active", "expires_at",
+            postgresql_where=text("is_active AND refresh_token_encrypted IS NOT NULL")
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: str = Field(index=True)  # References user
     
@@ -45,8 +91,8 @@ class SocialAccount(SQLModel, table=True):
     sync_error: Optional[str] = None
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = utc_timestamp()
+    updated_at: datetime = utc_timestamp(onupdate=True)
     
     # ========================================
     # TOKEN ENCRYPTION
@@ -55,20 +101,7 @@ class SocialAccount(SQLModel, table=True):
     @staticmethod
     def _get_cipher():
         """Get Fernet cipher for encryption/decryption."""
-        key = os.getenv("TOKEN_ENCRYPTION_KEY")
-        if not key:
-            # Generate a default key for development
-            # In production, this MUST be set in environment
-            key = base64.urlsafe_b64encode(b"creator-os-dev-key-32b!").decode()
-        
-        # Ensure key is valid Fernet format (32 bytes, base64-encoded)
-        try:
-            return Fernet(key.encode() if isinstance(key, str) else key)
-        except Exception:
-            # Fallback: generate valid key from input
-            padded_key = (key + "=" * 32)[:32]
-            valid_key = base64.urlsafe_b64encode(padded_key.encode())
-            return Fernet(valid_key)
+        return _get_cipher_cached()
     
     def set_access_token(self, token: str):
         """Encrypt and store access token."""
@@ -100,6 +133,20 @@ class SocialAccount(SQLModel, table=True):
         except Exception:
             return None
     
+    @classmethod
+    def decrypt_many(cls, accounts) -> dict:
+        """Decrypt access tokens for many accounts with one cipher lookup: {id: token}."""
+        cipher = cls._get_cipher()
+        tokens = {}
+        for account in accounts:
+            if not account.access_token_encrypted:
+                continue
+            try:
+                tokens[account.id] = cipher.decrypt(account.access_token_encrypted.encode()).decode()
+            except Exception:
+                continue
+        return tokens
+    
     def is_expired(self) -> bool:
         """Check if access token is expired."""
         if not self.expires_at:
@@ -144,16 +191,51 @@ def get_user_token(db, user_id: str, platform: str) -> Optional[SocialAccount]:
     return db.exec(statement).first()
 
 
+async def get_user_token_async(db, user_id: str, platform: str) -> Optional[SocialAccount]:
+    """get_user_token for an AsyncSession (async endpoints)."""
+    from sqlmodel import select
+    
+    statement = select(SocialAccount).where(
+        SocialAccount.user_id == user_id,
+        SocialAccount.platform == platform,
+        SocialAccount.is_active
+    )
+    return (await db.exec(statement)).first()
+
+
 def get_user_platforms(db, user_id: str) -> list:
     """Get all connected platforms for a user."""
     from sqlmodel import select
     
-    statement = select(SocialAccount).where(
+    # Only the platform column; the encrypted token blobs aren't needed
+    statement = select(SocialAccount.platform).where(
         SocialAccount.user_id == user_id,
         SocialAccount.is_active
     )
-    accounts = db.exec(statement).all()
-    return [a.platform for a in accounts]
+    return list(db.exec(statement).all())
+
+
+async def get_user_platforms_async(db, user_id: str) -> list:
+    """get_user_platforms for an AsyncSession (async endpoints)."""
+    from sqlmodel import select
+    
+    statement = select(SocialAccount.platform).where(
+        SocialAccount.user_id == user_id,
+        SocialAccount.is_active
+    )
+    return list((await db.exec(statement)).all())
+
+
+def get_expiring_account_ids(db, within: timedelta = timedelta(minutes=10)) -> list:
+    """IDs of refreshable accounts whose access token expires within `within`."""
+    from sqlmodel import select
+    
+    statement = select(SocialAccount.id).where(
+        SocialAccount.is_active,
+        SocialAccount.refresh_token_encrypted.is_not(None),
+        SocialAccount.expires_at < datetime.utcnow() + within
+    )
+    return list(db.exec(statement).all())
 
 
 def save_social_account(
@@ -171,52 +253,57 @@ def save_social_account(
 ) -> SocialAccount:
     """
     Save or update a social account connection.
+    
+    Single INSERT ... ON CONFLICT (user_id, platform) DO UPDATE, so two
+    concurrent connects (e.g. from two tabs) can't race into duplicate rows.
     """
-    from sqlmodel import select
+    from sqlalchemy import func
+    from sqlalchemy.dialects.postgresql import insert
+    from app.core.token_cache import invalidate_token
     
-    # Check if account already exists
-    statement = select(SocialAccount).where(
-        SocialAccount.user_id == user_id,
-        SocialAccount.platform == platform
+    cipher = SocialAccount._get_cipher()
+    now = datetime.utcnow()
+    stmt = insert(SocialAccount).values(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        platform=platform,
+        account_id=account_id,
+        account_name=account_name,
+        account_email=account_email,
+        profile_picture=profile_picture,
+        access_token_encrypted=cipher.encrypt(access_token.encode()).decode(),
+        refresh_token_encrypted=cipher.encrypt(refresh_token.encode()).decode() if refresh_token else None,
+        token_type="Bearer",
+        scope=scope,
+        expires_at=expires_at,
+        is_active=True,
+        created_at=now,
+        updated_at=now
     )
-    existing = db.exec(statement).first()
-    
-    if existing:
-        # Update existing
-        existing.set_access_token(access_token)
-        if refresh_token:
-            existing.set_refresh_token(refresh_token)
-        existing.expires_at = expires_at
-        existing.account_id = account_id or existing.account_id
-        existing.account_name = account_name or existing.account_name
-        existing.account_email = account_email or existing.account_email
-        existing.profile_picture = profile_picture or existing.profile_picture
-        existing.scope = scope or existing.scope
-        existing.is_active = True
-        existing.updated_at = datetime.utcnow()
-        existing.sync_error = None
-        
-        db.add(existing)
-        db.commit()
-        db.refresh(existing)
-        return existing
-    else:
-        # Create new
-        account = SocialAccount(
-            user_id=user_id,
-            platform=platform,
-            account_id=account_id,
-            account_name=account_name,
-            account_email=account_email,
-            profile_picture=profile_picture,
-            expires_at=expires_at,
-            scope=scope
-        )
-        account.set_access_token(access_token)
-        if refresh_token:
-            account.set_refresh_token(refresh_token)
-        
-        db.add(account)
-        db.commit()
-        db.refresh(account)
-        return account
+    
+    # Keep stored values the provider didn't send again this time
+    current = SocialAccount.__table__.c
+    new = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_socialaccount_user_platform",
+        set_={
+            "access_token_encrypted": new.access_token_encrypted,
+            "refresh_token_encrypted": func.coalesce(new.refresh_token_encrypted, current.refresh_token_encrypted),
+            "expires_at": new.expires_at,
+            "account_id": func.coalesce(new.account_id, current.account_id),
+            "account_name": func.coalesce(new.account_name, current.account_name),
+            "account_email": func.coalesce(new.account_email, current.account_email),
+            "profile_picture": func.coalesce(new.profile_picture, current.profile_picture),
+            "scope": func.coalesce(new.scope, current.scope),
+            "is_active": True,
+            "updated_at": now,
+            "sync_error": None,
+        }
+    )
+    
+    account = db.scalars(
+        stmt.returning(SocialAccount), execution_options={"populate_existing": True}
+    ).one()
+    db.commit()
+    invalidate_token(user_id, platform)
+    return account
@@ -1,10 +1,31 @@
 from sqlmodel import SQLModel, Field
 from typing import Dict, Optional
 from datetime import datetime
+from enum import Enum
 import uuid
-from sqlalchemy import Column
-from sqlalchemy.types import JSON
+from sqlalchemy import Column, Index, event, text
 from sqlalchemy.dialects.postgresql import JSONB
+from app.models.base import bigint_pk, enum_field, server_timestamp, uuid7
+
+
+class ActionStatus(str, Enum):
+    PENDING = "pending"
+    TAKEN = "taken"
+    SKIPPED = "skipped"
+    EXPIRED = "expired"
+
+
+class ActionCategory(str, Enum):
+    CONTENT = "content"
+    TIMING = "timing"
+    PLATFORM = "platform"
+    ENGAGEMENT = "engagement"
+
+
+class PredictionStatus(str, Enum):
+    PREDICTED = "predicted"
+    POSTED = "posted"
+    MEASURED = "measured"
 
 
 class StrategyAction(SQLModel, table=True):
@@ -12,7 +33,33 @@ class StrategyAction(SQLModel, table=True):
     Tracks recommended actions and their outcomes for the feedback loop.
     This enables learning from what actions users take and how they perform.
     """
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    # jsonb_path_ops GIN: serves actual_outcome @> '{...}' lookups
+    __table_args__ = (
+        Index(
+            "ix_strategyaction_actual_outcome_gin", "actual_outcome",
+            postgresql_using="gin", postgresql_ops={"actual_outcome": "jsonb_path_ops"}
+        ),
+        # Open recommendations only; taken/skipped/expired rows aren't indexed
+        Index(
+            "ix_strategyaction_pending", "user_id", "recommended_time",
+            postgresql_where=text("status = 'pending'")
+        ),
+        # Expiration sweep: pending rows that carry a deadline
+        Index(
+            "ix_strategyaction_expiring", "expires_at",
+            postgresql_where=text("status = 'pending' AND expires_at IS NOT NULL")
+        ),
+        # Time-range scans; rows arrive in created_at order
+        Index(
+            "ix_strategyaction_created_at_brin", "created_at",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32}
+        ),
+    )
+    # Fetch server-stamped timestamps in the INSERT/UPDATE's RETURNING
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id: Optional[int] = bigint_pk()
+    public_id: uuid.UUID = Field(default_factory=uuid7, unique=True, index=True)
     user_id: str = Field(index=True)
     
     # Action Details
@@ -21,7 +68,7 @@ class StrategyAction(SQLModel, table=True):
     description: str                       # Detailed recommendation
     
     # State Machine
-    status: str = Field(default="pending")  # pending, taken, skipped, expired
+    status: ActionStatus = enum_field(ActionStatus, "action_status", ActionStatus.PENDING)
     
     # Prediction before action
     predicted_impact: str = Field(default="")  # "+50% engagement"
@@ -30,8 +77,14 @@ class StrategyAction(SQLModel, table=True):
     prediction_confidence: float = Field(default=0.0)  # 0-1
     
     # Actual outcome (filled after action is taken)
-    actual_outcome: Dict = Field(default={}, sa_column=Column(JSON().with_variant(JSONB, "postgresql")))
+    actual_outcome: Dict = Field(default_factory=dict, sa_column=Column(
+        JSONB, nullable=False, server_default=text("'{}'")
+    ))
     # Structure: {"views": 1200, "likes": 85, "comments": 12, "shares": 8}
+    # Typed copies of the hot outcome keys for range filters/sorts (btree
+    # instead of JSONB decomposition); kept in sync by _sync_outcome_columns
+    actual_views: Optional[int] = Field(default=None, index=True)
+    actual_likes: Optional[int] = None
     
     # Timing
     recommended_time: Optional[datetime] = None  # When to take the action
@@ -40,21 +93,49 @@ class StrategyAction(SQLModel, table=True):
     
     # Priority and category
     priority: int = Field(default=2)  # 1=high, 2=medium, 3=low
-    category: str = Field(default="content")  # content, timing, platform, engagement
+    category: ActionCategory = enum_field(ActionCategory, "action_category", ActionCategory.CONTENT)
     
     # Link to related pattern
     pattern_id: Optional[uuid.UUID] = Field(default=None, foreign_key="contentpattern.id")
     
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = server_timestamp()
     expires_at: Optional[datetime] = None  # When the recommendation expires
 
 
+@event.listens_for(StrategyAction, "before_insert")
+@event.listens_for(StrategyAction, "before_update")
+def _sync_outcome_columns(mapper, connection, target: StrategyAction) -> None:
+    outcome = target.actual_outcome or {}
+    target.actual_views = outcome.get("views")
+    target.actual_likes = outcome.get("likes")
+
+
 class ContentPrediction(SQLModel, table=True):
     """
     Stores predictions for content before it's posted.
     Used to compare predicted vs actual performance.
     """
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    # jsonb_path_ops GIN: serves prediction_factors @> '{...}' lookups
+    __table_args__ = (
+        Index(
+            "ix_contentprediction_prediction_factors_gin", "prediction_factors",
+            postgresql_using="gin", postgresql_ops={"prediction_factors": "jsonb_path_ops"}
+        ),
+        # Predictions still waiting for actuals
+        Index(
+            "ix_contentprediction_unmeasured", "user_id", "planned_post_time",
+            postgresql_where=text("status <> 'measured'")
+        ),
+        # created_at range scans
+        Index(
+            "ix_contentprediction_created_at_brin", "created_at",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32}
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id: Optional[int] = bigint_pk()
+    public_id: uuid.UUID = Field(default_factory=uuid7, unique=True, index=True)
     user_id: str = Field(index=True)
     
     # Content being predicted
@@ -70,7 +151,9 @@ class ContentPrediction(SQLModel, table=True):
     predicted_engagement_rate: float = Field(default=0.0)
     
     # Factors used for prediction
-    prediction_factors: Dict = Field(default={}, sa_column=Column(JSON().with_variant(JSONB, "postgresql")))
+    prediction_factors: Dict = Field(default_factory=dict, sa_column=Column(
+        JSONB, nullable=False, server_default=text("'{}'")
+    ))
     # Example: {"has_face": true, "is_peak_hour": true, "content_type": "thread"}
     
     # Confidence and accuracy
@@ -84,9 +167,9 @@ class ContentPrediction(SQLModel, table=True):
     prediction_accuracy: Optional[float] = None  # How close was the prediction
     
     # Status
-    status: str = Field(default="predicted")  # predicted, posted, measured
+    status: PredictionStatus = enum_field(PredictionStatus, "prediction_status", PredictionStatus.PREDICTED)
     
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = server_timestamp()
     posted_at: Optional[datetime] = None
     measured_at: Optional[datetime] = None
 
@@ -95,7 +178,22 @@ class WeeklyStrategy(SQLModel, table=True):
     """
     Weekly strategy summary for the user.
     """
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    # jsonb_path_ops GIN: serves insights @> '{...}' lookups
+    __table_args__ = (
+        Index(
+            "ix_weeklystrategy_insights_gin", "insights",
+            postgresql_using="gin", postgresql_ops={"insights": "jsonb_path_ops"}
+        ),
+        # created_at range scans
+        Index(
+            "ix_weeklystrategy_created_at_brin", "created_at",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32}
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id: Optional[int] = bigint_pk()
+    public_id: uuid.UUID = Field(default_factory=uuid7, unique=True, index=True)
     user_id: str = Field(index=True)
     
     # Week info
@@ -119,7 +217,9 @@ class WeeklyStrategy(SQLModel, table=True):
     
     # Summary (generated)
     summary: str = Field(default="")
-    insights: Dict = Field(default={}, sa_column=Column(JSON().with_variant(JSONB, "postgresql")))
+    insights: Dict = Field(default_factory=dict, sa_column=Column(
+        JSONB, nullable=False, server_default=text("'{}'")
+    ))
     
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = server_timestamp()
+    updated_at: Optional[datetime] = server_timestamp(onupdate=True)
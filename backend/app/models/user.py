@@ -1,11 +1,26 @@
-from .base import TimestampModel
+from .base import TimestampModel, enum_field
 from sqlmodel import Field
+from sqlalchemy import Index, text
 from typing import Optional
 from datetime import datetime
+from enum import Enum
+
+
+class UserTier(str, Enum):
+    FREE = "free"
+    PRO = "pro"
+    ENTERPRISE = "enterprise"
+
 
 class User(TimestampModel, table=True):
     """Enterprise User model with profile and subscription."""
-    email: str = Field(unique=True, index=True)
+    # Unique among active accounts only; a deactivated account frees its email.
+    # Email lookups filter on is_active so they can use this index.
+    __table_args__ = (
+        Index("uq_user_email_active", "email", unique=True, postgresql_where=text("is_active")),
+    )
+
+    email: str
     hashed_password: str
     full_name: str
     
@@ -27,7 +42,7 @@ class User(TimestampModel, table=True):
     onboarding_step: int = Field(default=0)
     
     # Subscription tier
-    tier: str = Field(default="free")  # free, pro, enterprise
+    tier: UserTier = enum_field(UserTier, "user_tier", UserTier.FREE)
     tier_expires_at: Optional[datetime] = None
     
     # Account status
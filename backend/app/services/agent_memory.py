@@ -3,30 +3,126 @@
 These are thin wrappers around the SQLModel ``AgentMemory`` table.
 """
 
+from contextvars import ContextVar
+from sqlalchemy import bindparam, cast
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 from sqlmodel import Session, select
 from ..models.agent_memory import AgentMemory
-from datetime import datetime
-from typing import Any, Optional
+from ..models.base import utcnow
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Per-request read cache: agents re-read the same keys several times while
+# handling one request. None (the default) means no request scope, e.g. in
+# Celery tasks, and every read goes to the database.
+_memory_cache: ContextVar[Optional[Dict[Tuple[str, str], Any]]] = ContextVar("agent_memory_cache", default=None)
+_MISS = object()
+
+# Built once; SQLAlchemy's compiled cache then reuses the rendered SQL
+_LOAD_STMT = select(AgentMemory.value).where(
+    AgentMemory.user_id == bindparam("uid"), AgentMemory.key == bindparam("k")
+)
+# Expanding IN: one cache entry however many keys are passed
+_LOAD_MANY_STMT = select(AgentMemory.key, AgentMemory.value).where(
+    AgentMemory.user_id == bindparam("uid"), AgentMemory.key.in_(bindparam("keys", expanding=True))
+)
+
+
+class MemoryCacheMiddleware:
+    """ASGI middleware giving each HTTP request its own load_memory cache."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _memory_cache.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _memory_cache.reset(token)
+
+
+def _forget(user_id: str, keys) -> None:
+    cache = _memory_cache.get()
+    if cache is not None:
+        for key in keys:
+            cache.pop((user_id, key), None)
+
+
+def _upsert(stmt):
+    # Unchanged values skip the UPDATE entirely: no new row version, no WAL.
+    # json has no equality operator, hence the jsonb casts.
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "key"],
+        set_={"value": stmt.excluded.value, "timestamp": stmt.excluded.timestamp},
+        where=cast(AgentMemory.value, JSONB).is_distinct_from(cast(stmt.excluded.value, JSONB)),
+    )
 
 
 def save_memory(session: Session, user_id: str, key: str, value: Any) -> None:
     """Insert or update a memory entry for a user.
-    If the key already exists, it is overwritten with a new timestamp.
+    If the key already exists with a different value, it is overwritten with
+    a new timestamp; saving an identical value is a no-op.
+    One atomic ``INSERT ... ON CONFLICT (user_id, key) DO UPDATE`` round-trip.
+    """
+    stmt = pg_insert(AgentMemory).values(user_id=user_id, key=key, value=value, timestamp=utcnow())
+    stmt = _upsert(stmt)
+    session.execute(stmt)
+    session.commit()
+    _forget(user_id, (key,))
+
+
+def save_memory_many(session: Session, user_id: str, items: Dict[str, Any]) -> None:
+    """Insert or update several memory entries for a user in one statement.
+    Same semantics as :func:`save_memory`, but N keys cost one round-trip.
     """
-    stmt = select(AgentMemory).where(AgentMemory.user_id == user_id, AgentMemory.key == key)
-    existing = session.exec(stmt).first()
-    if existing:
-        existing.value = value
-        existing.timestamp = datetime.utcnow()
-        session.add(existing)
-    else:
-        mem = AgentMemory(user_id=user_id, key=key, value=value)
-        session.add(mem)
+    if not items:
+        return
+    stmt = pg_insert(AgentMemory).values([
+        {"user_id": user_id, "key": key, "value": value, "timestamp": utcnow()}
+        for key, value in items.items()
+    ])
+    stmt = _upsert(stmt)
+    session.execute(stmt)
     session.commit()
+    _forget(user_id, items)
 
 
 def load_memory(session: Session, user_id: str, key: str) -> Optional[Any]:
     """Retrieve a memory entry for a user, or ``None`` if not present."""
-    stmt = select(AgentMemory.value).where(AgentMemory.user_id == user_id, AgentMemory.key == key)
-    result = session.exec(stmt).first()
+    cache = _memory_cache.get()
+    if cache is not None:
+        cached = cache.get((user_id, key), _MISS)
+        if cached is not _MISS:
+            return cached
+    # (user_id, key) is unique, so read the single scalar straight off the cursor
+    result = session.execute(_LOAD_STMT, {"uid": user_id, "k": key}).scalar_one_or_none()
+    if cache is not None:
+        cache[(user_id, key)] = result
     return result
+
+
+def load_memory_many(session: Session, user_id: str, keys: Iterable[str]) -> Dict[str, Any]:
+    """Retrieve several memory entries for a user in one query.
+    Returns ``{key: value}``; keys that aren't stored are left out.
+    """
+    cache = _memory_cache.get()
+    found: Dict[str, Any] = {}
+    missing = []
+    for key in dict.fromkeys(keys):
+        cached = cache.get((user_id, key), _MISS) if cache is not None else _MISS
+        if cached is _MISS:
+            missing.append(key)
+        elif cached is not None:
+            found[key] = cached
+    if not missing:
+        return found
+
+    rows = dict(session.execute(_LOAD_MANY_STMT, {"uid": user_id, "keys": missing}).all())
+    if cache is not None:
+        for key in missing:
+            cache[(user_id, key)] = rows.get(key)
+    found.update(rows)
+    return found
@@ -2,24 +2,205 @@
 Creator OS AI Agent Service
 Enterprise-grade AI agent with Gemini/OpenAI, function calling, and memory.
 """
-import google.generativeai as genai
-from google.generativeai.types import FunctionDeclaration, Tool
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Any, Optional, Tuple
 from datetime import datetime
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select, update
+from sqlalchemy.orm import aliased
+import asyncio
+import functools
 import json
+import logging
 import os
 import uuid
 
+# google.generativeai takes ~0.5s to import; load it when Gemini is first used
+if TYPE_CHECKING:
+    from google.generativeai.types import Tool
+
 # Models
 from app.models.conversation_memory import Conversation, Message
 from app.models.scraped_analytics import ScrapedAnalytics
 from app.models.content import ContentDraft, ContentPerformance
 from app.models.content_pattern import ContentPattern
+from app.models.analytics_snapshot import UserAnalyticsSnapshot, store_analytics_snapshot
 
 # Services
 from app.services.analysis_engine import AnalysisEngine
 from app.core.config import settings
+from app.core import response_cache
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# Newest messages always sent to the model verbatim; older ones are folded
+# into the conversation's rolling summary once SUMMARY_EVERY more pile up
+HISTORY_WINDOW = 8
+SUMMARY_EVERY = 8
+
+SUMMARY_PROMPT = """Update the running summary of a conversation between a content creator and their AI strategist.
+Keep the creator's goals, platforms, numbers that were discussed, advice given and any decisions made.
+Reply with the new summary only, in at most 150 words.
+
+Current summary:
+{summary}
+
+New messages:
+{transcript}"""
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_provider() -> Tuple[str, str, Optional[str], Optional[str]]:
+    """
+    Pick the LLM provider from the environment once per process.
+    Returns (provider, api_key, base_url, model_name).
+    """
+    # Try Hugging Face Router FIRST (OpenAI-compatible API)
+    hf_token = settings.HF_TOKEN or os.getenv("HF_TOKEN")
+    if hf_token:
+        print("✅ Using Hugging Face (Llama-3.2)")
+        return "openai", hf_token, "https://router.huggingface.co/v1", "meta-llama/Llama-3.2-3B-Instruct"  # Fast consistent model
+    
+    # Fall back to Gemini
+    gemini_key = settings.GEMINI_API_KEY or settings.GOOGLE_API_KEY or os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+    if gemini_key:
+        return "gemini", gemini_key, None, "gemini-2.0-flash"
+    
+    # Try OpenRouter (OpenAI-compatible API)
+    openrouter_key = os.getenv("OPENROUTER_API_KEY")
+    if openrouter_key:
+        return "openai", openrouter_key, "https://openrouter.ai/api/v1", os.getenv("OPENROUTER_MODEL", "openai/gpt-4o-mini")
+    
+    # Try DeepSeek (OpenAI-compatible API)
+    deepseek_key = os.getenv("DEEPSEEK_API_KEY")
+    if deepseek_key:
+        return "openai", deepseek_key, "https://api.deepseek.com", "deepseek-chat"
+    
+    # Fall back to OpenAI
+    openai_key = settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
+    if openai_key:
+        return "openai", openai_key, None, "gpt-4o-mini"
+    
+    raise ValueError("No AI API key configured. Set HF_TOKEN, GEMINI_API_KEY, OPENROUTER_API_KEY, DEEPSEEK_API_KEY, or OPENAI_API_KEY")
+
+
+# Process-wide clients: agents are per request, and a client per agent
+# would throw away its keep-alive connections (and TLS session) every chat
+
+@functools.lru_cache(maxsize=4)
+def _openai_client(api_key: str, base_url: Optional[str]):
+    try:
+        from openai import OpenAI
+    except ImportError:
+        raise ValueError("OpenAI package not installed. Run: pip install openai")
+    return OpenAI(api_key=api_key, base_url=base_url)
+
+
+@functools.lru_cache(maxsize=4)
+def _async_openai_client(api_key: str, base_url: Optional[str]):
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+
+@functools.lru_cache(maxsize=4)
+def _gemini_model(api_key: str, system_prompt: str):
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(
+        model_name="gemini-2.0-flash",
+        system_instruction=system_prompt,
+        tools=[CreatorAgent._build_tools()]
+    )
+
+
+# Conversations with a summary refresh running in this process
+_summarizing: set = set()
+_summary_tasks: set = set()
+
+
+def schedule_summary_refresh(conversation_id: uuid.UUID) -> None:
+    """Refresh the rolling summary in the background, after the reply is sent."""
+    if conversation_id in _summarizing:
+        return
+    _summarizing.add(conversation_id)
+    task = asyncio.create_task(_refresh_rolling_summary(conversation_id))
+    _summary_tasks.add(task)
+    task.add_done_callback(_summary_tasks.discard)
+
+
+def _summary_input(conversation_id: uuid.UUID) -> Tuple[Optional[str], Optional[datetime], List]:
+    """
+    The conversation's summary, its watermark and the unsummarized
+    user/assistant messages older than the history window, oldest first.
+    """
+    with Session(engine) as db:
+        conversation = db.get(Conversation, conversation_id)
+        if conversation is None:
+            return None, None, []
+        statement = select(Message.role, Message.content, Message.created_at).where(
+            Message.conversation_id == conversation_id,
+            Message.role.in_(["user", "assistant"])
+        )
+        if conversation.summarized_through:
+            statement = statement.where(Message.created_at > conversation.summarized_through)
+        rows = db.exec(
+            statement.order_by(Message.created_at.desc()).offset(HISTORY_WINDOW).limit(40)
+        ).all()
+        rows.reverse()
+        return conversation.rolling_summary, conversation.summarized_through, rows
+
+
+def _store_summary(conversation_id: uuid.UUID, previous_through: Optional[datetime],
+                   summary: str, through: datetime) -> bool:
+    """
+    Save the new summary unless another refresh got there first (the
+    watermark moved since it was read). Returns whether it was saved.
+    """
+    with Session(engine) as db:
+        result = db.exec(
+            update(Conversation)
+            .where(
+                Conversation.id == conversation_id,
+                Conversation.summarized_through.is_not_distinct_from(previous_through)
+            )
+            .values(rolling_summary=summary, summarized_through=through)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+
+async def _summarize(summary: Optional[str], transcript: str) -> str:
+    prompt = SUMMARY_PROMPT.format(summary=summary or "(none yet)", transcript=transcript)
+    provider, api_key, base_url, model_name = _resolve_provider()
+    if provider == "gemini":
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        response = await genai.GenerativeModel(model_name).generate_content_async(prompt)
+        return response.text
+    response = await _async_openai_client(api_key, base_url).chat.completions.create(
+        model=model_name,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=300,
+        temperature=0.3
+    )
+    return response.choices[0].message.content
+
+
+async def _refresh_rolling_summary(conversation_id: uuid.UUID) -> None:
+    # Each database step uses its own short session, so no connection is
+    # held (idle in transaction) during the LLM call
+    try:
+        summary, through, rows = await asyncio.to_thread(_summary_input, conversation_id)
+        if not rows:
+            return
+        transcript = "\n".join(f"{role}: {content}" for role, content, _ in rows)
+        new_summary = await _summarize(summary, transcript)
+        saved = await asyncio.to_thread(_store_summary, conversation_id, through, new_summary, rows[-1][2])
+        if not saved:
+            logger.info("Summary refresh for conversation %s lost to a concurrent one", conversation_id)
+    except Exception as e:
+        logger.warning("Summary refresh failed for conversation %s: %s", conversation_id, e)
+    finally:
+        _summarizing.discard(conversation_id)
 
 
 class CreatorAgent:
@@ -66,93 +247,57 @@ RULES:
 - If has_data is False or no platforms exist, never pretend data exists
 - Be proactive about identifying problems and opportunities when data IS available"""
 
+    # Tools the model may call; each is implemented by _tool_<name>
+    _TOOL_NAMES = frozenset({
+        "get_analytics_summary",
+        "get_top_posts",
+        "analyze_engagement_trend",
+        "get_optimal_posting_times",
+        "generate_content_ideas",
+        "get_platform_comparison",
+        "diagnose_problem",
+        "get_growth_report",
+    })
+    
+    # Start of the replies returned when the LLM call fails
+    ERROR_REPLY_PREFIX = "I encountered an error"
+
     def __init__(self, db: Session, user_id: str):
         self.db = db
         self.user_id = user_id
         self._model = None
         self._openai_client = None
+        self._openai_config = None
         self._use_openai = False
-        self._tools = self._build_tools()
+        # Rolling summary of the current conversation's older messages
+        self._history_summary: Optional[str] = None
+        # Tool results reused within one chat turn: the prompt context, the
+        # LLM's own tool calls and composite tools all ask for the same data
+        self._summary_cache: Dict[Tuple[int, str], Dict] = {}
+        self._trend_cache: Dict[int, Dict] = {}
         
     def _get_model(self):
         """Initialize AI model - prefers HuggingFace, falls back to Gemini/OpenRouter/OpenAI."""
-        if self._model is None:
-            # Try Hugging Face Router FIRST (OpenAI-compatible API)
-            hf_token = settings.HF_TOKEN or os.getenv("HF_TOKEN")
-            if hf_token:
-                try:
-                    from openai import OpenAI
-                    self._openai_client = OpenAI(
-                        api_key=hf_token,
-                        base_url="https://router.huggingface.co/v1"
-                    )
-                    self._use_openai = True
-                    self._model_name = "meta-llama/Llama-3.2-3B-Instruct"  # Fast consistent model
-                    print("✅ Using Hugging Face (Llama-3.2)")
-                    return None
-                except ImportError:
-                    raise ValueError("OpenAI package not installed. Run: pip install openai")
-            
-            # Fall back to Gemini
-            gemini_key = settings.GEMINI_API_KEY or settings.GOOGLE_API_KEY or os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-            if gemini_key:
-                genai.configure(api_key=gemini_key)
-                self._model = genai.GenerativeModel(
-                    model_name="gemini-2.0-flash",
-                    system_instruction=self.SYSTEM_PROMPT,
-                    tools=[self._tools]
-                )
+        if self._model is None and self._openai_client is None:
+            provider, api_key, base_url, model_name = _resolve_provider()
+            if provider == "gemini":
+                self._model = _gemini_model(api_key, self.SYSTEM_PROMPT)
                 self._use_openai = False
-                return self._model
-            
-            # Try OpenRouter (OpenAI-compatible API)
-            openrouter_key = os.getenv("OPENROUTER_API_KEY")
-            openrouter_model = os.getenv("OPENROUTER_MODEL", "openai/gpt-4o-mini")  # Default model
-            if openrouter_key:
-                try:
-                    from openai import OpenAI
-                    self._openai_client = OpenAI(
-                        api_key=openrouter_key,
-                        base_url="https://openrouter.ai/api/v1"
-                    )
-                    self._use_openai = True
-                    self._model_name = openrouter_model
-                    return None
-                except ImportError:
-                    raise ValueError("OpenAI package not installed. Run: pip install openai")
-            
-            # Try DeepSeek (OpenAI-compatible API)
-            deepseek_key = os.getenv("DEEPSEEK_API_KEY")
-            if deepseek_key:
-                try:
-                    from openai import OpenAI
-                    self._openai_client = OpenAI(
-                        api_key=deepseek_key,
-                        base_url="https://api.deepseek.com"
-                    )
-                    self._use_openai = True
-                    self._model_name = "deepseek-chat"
-                    return None
-                except ImportError:
-                    raise ValueError("OpenAI package not installed. Run: pip install openai")
-            
-            # Fall back to OpenAI
-            openai_key = settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
-            if openai_key:
-                try:
-                    from openai import OpenAI
-                    self._openai_client = OpenAI(api_key=openai_key)
-                    self._use_openai = True
-                    self._model_name = "gpt-4o-mini"
-                    return None
-                except ImportError:
-                    raise ValueError("OpenAI package not installed. Run: pip install openai")
-            
-            raise ValueError("No AI API key configured. Set HF_TOKEN, GEMINI_API_KEY, OPENROUTER_API_KEY, DEEPSEEK_API_KEY, or OPENAI_API_KEY")
+            else:
+                self._openai_config = (api_key, base_url)
+                self._openai_client = _openai_client(api_key, base_url)
+                self._use_openai = True
+                self._model_name = model_name
         return self._model
     
-    def _build_tools(self) -> Tool:
-        """Define function calling tools for the agent."""
+    @staticmethod
+    @functools.cache
+    def _build_tools() -> "Tool":
+        """
+        Define function calling tools for the agent. Built on first Gemini use
+        and shared by every agent afterwards (the declarations never change).
+        """
+        from google.generativeai.types import FunctionDeclaration, Tool
         
         get_analytics_summary = FunctionDeclaration(
             name="get_analytics_summary",
@@ -267,6 +412,28 @@ RULES:
             }
         )
         
+        get_growth_report = FunctionDeclaration(
+            name="get_growth_report",
+            description="Engagement trend, root-cause diagnosis and content ideas in one call. Use this instead of calling analyze_engagement_trend, diagnose_problem and generate_content_ideas separately when the user asks what is wrong and what to do about it.",
+            parameters={
+                "type": "object",
+                "properties": {
+                    "days": {
+                        "type": "integer",
+                        "description": "Number of days to analyze (default 30)"
+                    },
+                    "platform": {
+                        "type": "string",
+                        "description": "Target platform for the ideas"
+                    },
+                    "idea_count": {
+                        "type": "integer",
+                        "description": "Number of ideas to generate (default 3)"
+                    }
+                }
+            }
+        )
+        
         return Tool(function_declarations=[
             get_analytics_summary,
             get_top_posts,
@@ -274,7 +441,8 @@ RULES:
             get_optimal_posting_times,
             generate_content_ideas,
             get_platform_comparison,
-            diagnose_problem
+            diagnose_problem,
+            get_growth_report
         ])
     
     # ===== TOOL IMPLEMENTATIONS =====
@@ -282,66 +450,95 @@ RULES:
     def _execute_tool(self, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a tool and return the result."""
         
-        tool_map = {
-            "get_analytics_summary": self._tool_get_analytics_summary,
-            "get_top_posts": self._tool_get_top_posts,
-            "analyze_engagement_trend": self._tool_analyze_engagement_trend,
-            "get_optimal_posting_times": self._tool_get_optimal_posting_times,
-            "generate_content_ideas": self._tool_generate_content_ideas,
-            "get_platform_comparison": self._tool_get_platform_comparison,
-            "diagnose_problem": self._tool_diagnose_problem,
-        }
-        
-        if name not in tool_map:
+        if name not in self._TOOL_NAMES:
             return {"error": f"Unknown tool: {name}"}
         
         try:
-            return tool_map[name](**args)
+            return getattr(self, f"_tool_{name}")(**args)
         except Exception as e:
             return {"error": str(e)}
     
+    def _latest_performance(self):
+        """
+        ContentPerformance aliased over the newest snapshot of each of the
+        user's drafts (row_number window). Join it on
+        ``latest.draft_id == ContentDraft.id``.
+        """
+        ranked = select(
+            ContentPerformance,
+            func.row_number().over(
+                partition_by=ContentPerformance.draft_id,
+                order_by=ContentPerformance.recorded_at.desc()
+            ).label("rn")
+        ).join(ContentDraft, ContentDraft.id == ContentPerformance.draft_id).where(
+            ContentDraft.user_id == self.user_id
+        ).subquery()
+        newest = select(ranked).where(ranked.c.rn == 1).subquery()
+        return aliased(ContentPerformance, newest)
+    
     def _tool_get_analytics_summary(self, days: int = 30, platform: str = "all") -> Dict:
         """Get overall analytics summary."""
-        
-        # Get scraped analytics
-        statement = select(ScrapedAnalytics).where(
-            ScrapedAnalytics.user_id == self.user_id
-        )
+        key = (days, platform)
+        if key not in self._summary_cache:
+            self._summary_cache[key] = self._load_analytics_summary(days, platform)
+        return self._summary_cache[key]
+    
+    def _load_analytics_summary(self, days: int, platform: str) -> Dict:
+        """All-platform summaries come from the persisted snapshot when it is current."""
         if platform != "all":
-            statement = statement.where(ScrapedAnalytics.platform == platform.lower())
-        
-        statement = statement.order_by(ScrapedAnalytics.scraped_at.desc()).limit(10)
-        scraped = self.db.exec(statement).all()
-        
-        # Get content performance
-        content_statement = select(ContentDraft).where(ContentDraft.user_id == self.user_id)
-        drafts = self.db.exec(content_statement).all()
-        
-        total_views = 0
-        total_likes = 0
-        total_comments = 0
-        platforms_data = {}
-        
-        for s in scraped:
-            if s.platform not in platforms_data:
-                platforms_data[s.platform] = {"views": 0, "followers": 0, "subscribers": 0}
-            platforms_data[s.platform]["views"] += s.views or 0
-            platforms_data[s.platform]["followers"] = max(platforms_data[s.platform]["followers"], s.followers or 0)
-            platforms_data[s.platform]["subscribers"] = max(platforms_data[s.platform]["subscribers"], s.subscribers or 0)
-            total_views += s.views or 0
-        
-        for draft in drafts:
-            perf_stmt = select(ContentPerformance).where(
-                ContentPerformance.draft_id == draft.id
-            ).order_by(ContentPerformance.recorded_at.desc())
-            perf = self.db.exec(perf_stmt).first()
-            
-            if perf:
-                total_likes += perf.likes
-                total_comments += perf.comments
+            return self._compute_analytics_summary(days, platform)
+        
+        snapshot = self.db.get(UserAnalyticsSnapshot, self.user_id)
+        if snapshot and snapshot.is_current():
+            return snapshot.data
+        
+        # Stamp with the read time so the max age covers data that changed
+        # while the summary was being computed
+        computed_at = datetime.utcnow()
+        summary = self._compute_analytics_summary(days, platform)
+        store_analytics_snapshot(self.db, self.user_id, summary, computed_at)
+        return summary
+    
+    def _compute_analytics_summary(self, days: int, platform: str) -> Dict:
+        # Per-platform totals over the 10 newest scrapes, aggregated in SQL
+        recent = select(
+            ScrapedAnalytics.platform,
+            ScrapedAnalytics.views,
+            ScrapedAnalytics.followers,
+            ScrapedAnalytics.subscribers
+        ).where(ScrapedAnalytics.user_id == self.user_id)
+        if platform != "all":
+            recent = recent.where(ScrapedAnalytics.platform == platform.lower())
+        recent = recent.order_by(ScrapedAnalytics.scraped_at.desc()).limit(10).subquery()
+        
+        per_platform = self.db.exec(
+            select(
+                recent.c.platform,
+                func.coalesce(func.sum(recent.c.views), 0),
+                func.coalesce(func.max(recent.c.followers), 0),
+                func.coalesce(func.max(recent.c.subscribers), 0)
+            ).group_by(recent.c.platform)
+        ).all()
+        platforms_data = {
+            name: {"views": views, "followers": followers, "subscribers": subscribers}
+            for name, views, followers, subscribers in per_platform
+        }
+        total_views = sum(data["views"] for data in platforms_data.values())
+        
+        # Get content performance: draft count and latest-snapshot totals
+        latest = self._latest_performance()
+        posts_tracked, total_likes, total_comments = self.db.exec(
+            select(
+                func.count(ContentDraft.id),
+                func.coalesce(func.sum(latest.likes), 0),
+                func.coalesce(func.sum(latest.comments), 0)
+            ).select_from(ContentDraft).outerjoin(
+                latest, latest.draft_id == ContentDraft.id
+            ).where(ContentDraft.user_id == self.user_id)
+        ).one()
         
         # If no data, return mock
-        if not scraped and not drafts:
+        if not platforms_data and not posts_tracked:
             return {
                 "note": "No analytics data found yet. Visit YouTube Studio or Instagram with the extension to start tracking.",
                 "total_views": 0,
@@ -356,72 +553,79 @@ RULES:
             "total_comments": total_comments,
             "total_engagement": total_likes + total_comments,
             "platforms": platforms_data,
-            "posts_tracked": len(drafts),
+            "posts_tracked": posts_tracked,
             "has_data": True
         }
     
     def _tool_get_top_posts(self, limit: int = 5, platform: str = None, metric: str = "engagement") -> Dict:
         """Get top performing posts."""
         
-        statement = select(ContentDraft).where(ContentDraft.user_id == self.user_id)
+        latest = self._latest_performance()
+        sort_columns = {
+            "views": latest.views,
+            "likes": latest.likes,
+            "comments": latest.comments,
+            "shares": latest.shares
+        }
+        order = sort_columns.get(metric, latest.likes + latest.comments + latest.shares)
+        
+        # Ranked and limited in SQL; the window count still sees every measured draft
+        statement = select(ContentDraft, latest, func.count().over()).join(
+            latest, latest.draft_id == ContentDraft.id
+        ).where(ContentDraft.user_id == self.user_id)
         if platform:
             statement = statement.where(ContentDraft.platform == platform.lower())
+        rows = self.db.exec(statement.order_by(order.desc()).limit(limit)).all()
         
-        drafts = self.db.exec(statement).all()
-        
-        posts_with_performance = []
-        for draft in drafts:
-            perf_stmt = select(ContentPerformance).where(
-                ContentPerformance.draft_id == draft.id
-            ).order_by(ContentPerformance.recorded_at.desc())
-            perf = self.db.exec(perf_stmt).first()
-            
-            if perf:
-                engagement = perf.likes + perf.comments + perf.shares
-                posts_with_performance.append({
+        return {
+            "top_posts": [
+                {
                     "text_preview": draft.text_content[:100] if draft.text_content else "",
                     "platform": draft.platform,
                     "views": perf.views,
                     "likes": perf.likes,
                     "comments": perf.comments,
                     "shares": perf.shares,
-                    "engagement": engagement,
+                    "engagement": perf.likes + perf.comments + perf.shares,
                     "created_at": draft.created_at.isoformat() if draft.created_at else None
-                })
-        
-        # Sort by metric
-        sort_key = metric if metric in ["views", "likes", "comments", "shares", "engagement"] else "engagement"
-        posts_with_performance.sort(key=lambda x: x.get(sort_key, 0), reverse=True)
-        
-        return {
-            "top_posts": posts_with_performance[:limit],
-            "total_posts": len(posts_with_performance)
+                }
+                for draft, perf, _ in rows
+            ],
+            "total_posts": rows[0][2] if rows else 0
         }
     
     def _tool_analyze_engagement_trend(self, days: int = 30) -> Dict:
         """Analyze engagement trends."""
-        
-        # Get posts data
-        statement = select(ContentDraft).where(ContentDraft.user_id == self.user_id)
-        drafts = self.db.exec(statement).all()
-        
-        posts_data = []
-        for draft in drafts:
-            perf_stmt = select(ContentPerformance).where(
-                ContentPerformance.draft_id == draft.id
-            )
-            perfs = self.db.exec(perf_stmt).all()
-            
-            for perf in perfs:
-                posts_data.append({
-                    "platform": draft.platform,
-                    "views": perf.views,
-                    "likes": perf.likes,
-                    "comments": perf.comments,
-                    "shares": perf.shares,
-                    "engagement": perf.likes + perf.comments + perf.shares,
-                    "created_at": perf.recorded_at.isoformat()
-                })
+        if days not in self._trend_cache:
+            self._trend_cache[days] = self._load_engagement_trend(days)
+        return self._trend_cache[days]
+    
+    def _load_engagement_trend(self, days: int) -> Dict:
+        # Get posts data: every snapshot with its draft's platform, one query.
+        # Plain column tuples, so no ORM objects are built per snapshot
+        statement = select(
+            ContentDraft.platform,
+            ContentPerformance.views,
+            ContentPerformance.likes,
+            ContentPerformance.comments,
+            ContentPerformance.shares,
+            ContentPerformance.recorded_at
+        ).join(
+            ContentPerformance, ContentPerformance.draft_id == ContentDraft.id
+        ).where(ContentDraft.user_id == self.user_id)
+        
+        posts_data = [
+            {
+                "platform": platform,
+                "views": views,
+                "likes": likes,
+                "comments": comments,
+                "shares": shares,
+                "engagement": likes + comments + shares,
+                "created_at": recorded_at.isoformat()
+            }
+            for platform, views, likes, comments, shares, recorded_at in self.db.exec(statement).all()
+        ]
         
         if not posts_data:
             return {"note": "Not enough data to analyze trends yet."}
@@ -476,11 +680,11 @@ RULES:
     def _tool_generate_content_ideas(self, count: int = 3, platform: str = None, topic: str = None) -> Dict:
         """Generate content ideas based on what works."""
         
-        # Get top performing content
-        top_posts = self._tool_get_top_posts(limit=5, platform=platform)
+        # Only the best post and two patterns are used, so fetch no more
+        top_posts = self._tool_get_top_posts(limit=1, platform=platform)
         
         # Get patterns
-        patterns_stmt = select(ContentPattern).where(ContentPattern.user_id == self.user_id).limit(5)
+        patterns_stmt = select(ContentPattern).where(ContentPattern.user_id == self.user_id).limit(2)
         patterns = self.db.exec(patterns_stmt).all()
         
         # Build ideas based on patterns
@@ -495,7 +699,7 @@ RULES:
             })
         
         if patterns:
-            for p in patterns[:2]:
+            for p in patterns:
                 ideas.append({
                     "idea": f"Apply the '{p.pattern_type}' pattern that works for you",
                     "reason": p.explanation,
@@ -562,6 +766,19 @@ RULES:
             "recommendation": "Increase posting frequency and focus on your top-performing content types"
         }
     
+    def _tool_get_growth_report(self, days: int = 30, platform: str = None, idea_count: int = 3) -> Dict:
+        """
+        Trend, diagnosis and ideas together, so the model gets them in one
+        function-call round-trip instead of three.
+        """
+        trend = self._tool_analyze_engagement_trend(days=days)
+        
+        return {
+            "trend": trend,
+            "diagnosis": self._tool_diagnose_problem(),
+            "ideas": self._tool_generate_content_ideas(count=idea_count, platform=platform).get("ideas", [])
+        }
+    
     # ===== CHAT METHODS =====
     
     def chat(self, message: str, conversation_id: Optional[uuid.UUID] = None, 
@@ -579,6 +796,88 @@ RULES:
         """
         
         start_time = datetime.utcnow()
+        conversation, history, user_message = self._begin_turn(message, conversation_id, page_context)
+        
+        # Initialize model (sets _use_openai flag)
+        self._get_model()
+        
+        # Route to appropriate backend
+        if self._use_openai:
+            response_text = self._chat_openai(user_message, history)
+        else:
+            response_text = self._chat_gemini(user_message, history, conversation.id)
+        
+        return self._finish_turn(conversation, response_text, start_time)
+    
+    async def achat(self, message: str, conversation_id: Optional[uuid.UUID] = None, 
+                    page_context: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Async version of chat(). The LLM requests are awaited instead of
+        holding a worker thread for seconds; database work still goes through
+        the synchronous Session, so it runs in a thread between them.
+        """
+        result = None
+        async for event in self.astream_chat(message, conversation_id, page_context):
+            if "delta" not in event:
+                result = event
+        return result
+    
+    async def astream_chat(self, message: str, conversation_id: Optional[uuid.UUID] = None,
+                           page_context: Optional[Dict] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming version of achat(). Yields {"delta": text} as the reply is
+        generated, then the same result dict chat() returns once the reply
+        has been saved.
+        """
+        
+        start_time = datetime.utcnow()
+        conversation, history, user_message = await asyncio.to_thread(
+            self._begin_turn, message, conversation_id, page_context
+        )
+        
+        # Opening questions without page context depend only on the user's
+        # analytics, so a repeat of one can reuse the earlier reply
+        cache_key = None
+        if not history and not page_context:
+            analytics = await asyncio.to_thread(self._tool_get_analytics_summary)
+            cache_key = response_cache.response_key(self.user_id, message, analytics)
+            cached = await response_cache.get_cached_response(cache_key)
+            if cached is not None:
+                yield {"delta": cached}
+                yield await asyncio.to_thread(self._finish_turn, conversation, cached, start_time)
+                return
+        
+        # Initialize model (sets _use_openai flag; first Gemini use imports the SDK)
+        await asyncio.to_thread(self._get_model)
+        
+        # Route to appropriate backend
+        if self._use_openai:
+            parts = []
+            try:
+                async for piece in self._astream_openai(user_message, history):
+                    parts.append(piece)
+                    yield {"delta": piece}
+                response_text = "".join(parts)
+            except Exception as e:
+                response_text = f"I encountered an error: {str(e)}. Please check your OpenAI API key configuration."
+                yield {"delta": response_text}
+        else:
+            # Function calling needs the whole response, so Gemini replies arrive in one piece
+            response_text = await self._achat_gemini(user_message, history, conversation.id)
+            yield {"delta": response_text}
+        
+        if cache_key and not response_text.startswith(self.ERROR_REPLY_PREFIX):
+            await response_cache.cache_response(cache_key, response_text)
+        
+        result = await asyncio.to_thread(self._finish_turn, conversation, response_text, start_time)
+        # history is every unsummarized message before this turn's two
+        if len(history) + 2 >= HISTORY_WINDOW + SUMMARY_EVERY:
+            schedule_summary_refresh(conversation.id)
+        yield result
+    
+    def _begin_turn(self, message: str, conversation_id: Optional[uuid.UUID],
+                    page_context: Optional[Dict]) -> Tuple[Conversation, List, str]:
+        """Resolve the conversation, load its history and save the user message."""
         
         # Get or create conversation
         if conversation_id:
@@ -589,7 +888,7 @@ RULES:
             conversation = self._create_conversation(message, page_context)
         
         # Load conversation history
-        history = self._load_history(conversation.id)
+        self._history_summary, history = self._load_history(conversation)
         
         # Add page context to message if available
         user_message = message
@@ -602,14 +901,10 @@ RULES:
         # Save user message
         self._save_message(conversation.id, "user", user_message)
         
-        # Initialize model (sets _use_openai flag)
-        self._get_model()
-        
-        # Route to appropriate backend
-        if self._use_openai:
-            response_text = self._chat_openai(user_message, history)
-        else:
-            response_text = self._chat_gemini(user_message, history, conversation.id)
+        return conversation, history, user_message
+    
+    def _finish_turn(self, conversation: Conversation, response_text: str, start_time: datetime) -> Dict[str, Any]:
+        """Save the assistant reply and update the conversation."""
         
         # Calculate latency
         latency_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
@@ -626,6 +921,10 @@ RULES:
         self.db.add(conversation)
         self.db.commit()
         
+        # Next turn may follow new tracking data
+        self._summary_cache.clear()
+        self._trend_cache.clear()
+        
         return {
             "message_id": str(msg.id),
             "conversation_id": str(conversation.id),
@@ -633,31 +932,39 @@ RULES:
             "latency_ms": latency_ms
         }
     
+    def _openai_messages(self, message: str, history: List) -> List[Dict]:
+        """Build the OpenAI-style message list, including the analytics context."""
+        
+        # Build messages with history
+        messages = [{"role": "system", "content": self.SYSTEM_PROMPT}]
+        if self._history_summary:
+            messages.append({"role": "system", "content": f"[Summary of the earlier conversation: {self._history_summary}]"})
+        
+        for h in history:
+            role = "user" if h["role"] == "user" else "assistant"
+            messages.append({"role": role, "content": h["parts"][0] if h["parts"] else ""})
+        
+        messages.append({"role": "user", "content": message})
+        
+        # ALWAYS inject analytics context - crucial to prevent hallucination
+        analytics = self._tool_get_analytics_summary()
+        if analytics.get("has_data"):
+            messages.append({
+                "role": "system", 
+                "content": f"[User Analytics Data: {json.dumps(analytics)}]"
+            })
+        else:
+            # Explicitly tell the AI there's no data to prevent hallucination
+            messages.append({
+                "role": "system", 
+                "content": "[CRITICAL: This user has NO analytics data yet. has_data=False. platforms={empty}. Do NOT make up any numbers, statistics, views, subscribers, or engagement metrics. Tell the user they need to visit YouTube Studio or Instagram with the extension active to start collecting data.]"
+            })
+        return messages
+    
     def _chat_openai(self, message: str, history: List) -> str:
         """Chat using OpenAI API."""
         try:
-            # Build messages with history
-            messages = [{"role": "system", "content": self.SYSTEM_PROMPT}]
-            
-            for h in history:
-                role = "user" if h["role"] == "user" else "assistant"
-                messages.append({"role": role, "content": h["parts"][0] if h["parts"] else ""})
-            
-            messages.append({"role": "user", "content": message})
-            
-            # ALWAYS inject analytics context - crucial to prevent hallucination
-            analytics = self._tool_get_analytics_summary()
-            if analytics.get("has_data"):
-                messages.append({
-                    "role": "system", 
-                    "content": f"[User Analytics Data: {json.dumps(analytics)}]"
-                })
-            else:
-                # Explicitly tell the AI there's no data to prevent hallucination
-                messages.append({
-                    "role": "system", 
-                    "content": "[CRITICAL: This user has NO analytics data yet. has_data=False. platforms={empty}. Do NOT make up any numbers, statistics, views, subscribers, or engagement metrics. Tell the user they need to visit YouTube Studio or Instagram with the extension active to start collecting data.]"
-                })
+            messages = self._openai_messages(message, history)
             
             # Call OpenAI/DeepSeek
             model_name = getattr(self, '_model_name', 'gpt-4o-mini')
@@ -673,10 +980,28 @@ RULES:
         except Exception as e:
             return f"I encountered an error: {str(e)}. Please check your OpenAI API key configuration."
     
+    async def _astream_openai(self, message: str, history: List) -> AsyncIterator[str]:
+        """Stream a reply from the shared async client for the same provider as _openai_client."""
+        messages = await asyncio.to_thread(self._openai_messages, message, history)
+        
+        model_name = getattr(self, '_model_name', 'gpt-4o-mini')
+        stream = await _async_openai_client(*self._openai_config).chat.completions.create(
+            model=model_name,
+            messages=messages,
+            max_tokens=500,
+            temperature=0.7,
+            stream=True
+        )
+        
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
     def _chat_gemini(self, message: str, history: List, conversation_id: uuid.UUID) -> str:
         """Chat using Gemini API with function calling."""
+        import google.generativeai as genai
         try:
-            chat = self._model.start_chat(history=history)
+            chat = self._model.start_chat(history=self._gemini_history(history))
             response = chat.send_message(message)
             
             # Handle function calls
@@ -716,6 +1041,66 @@ RULES:
         except Exception as e:
             return f"I encountered an error: {str(e)}. Let me try a simpler approach."
     
+    async def _achat_gemini(self, message: str, history: List, conversation_id: uuid.UUID) -> str:
+        """
+        Async Gemini chat. Every function call the model emits in a turn is
+        answered in one follow-up request, not one round-trip per call.
+        """
+        import google.generativeai as genai
+        try:
+            chat = self._model.start_chat(history=self._gemini_history(history))
+            response = await chat.send_message_async(message)
+            
+            # Handle function calls
+            while True:
+                calls = [
+                    part.function_call for part in response.candidates[0].content.parts
+                    if hasattr(part, 'function_call') and part.function_call
+                ]
+                if not calls:
+                    break
+                
+                results = await asyncio.to_thread(self._run_tool_calls, calls, conversation_id)
+                
+                # Continue with all tool results at once
+                response = await chat.send_message_async(
+                    genai.protos.Content(
+                        parts=[
+                            genai.protos.Part(
+                                function_response=genai.protos.FunctionResponse(
+                                    name=fn_call.name,
+                                    response={"result": tool_result}
+                                )
+                            )
+                            for fn_call, tool_result in zip(calls, results)
+                        ]
+                    )
+                )
+            
+            return response.text
+            
+        except Exception as e:
+            return f"I encountered an error: {str(e)}. Let me try a simpler approach."
+    
+    def _run_tool_calls(self, calls: List, conversation_id: uuid.UUID) -> List[Dict]:
+        """
+        Execute function calls and save each as a tool message. They share
+        this agent's Session, so they run one after another, not in parallel.
+        """
+        results = []
+        for fn_call in calls:
+            args = dict(fn_call.args)
+            tool_result = self._execute_tool(fn_call.name, args)
+            self._save_message(
+                conversation_id, "tool", 
+                json.dumps(tool_result),
+                tool_name=fn_call.name,
+                tool_arguments=args,
+                tool_result=tool_result
+            )
+            results.append(tool_result)
+        return results
+    
     def _create_conversation(self, first_message: str, page_context: Optional[Dict] = None) -> Conversation:
         """Create a new conversation."""
         
@@ -748,26 +1133,41 @@ RULES:
         
         return conversation
     
-    def _load_history(self, conversation_id: uuid.UUID, limit: int = 20) -> List:
-        """Load conversation history for Gemini."""
+    def _load_history(self, conversation: Conversation, limit: int = 20) -> Tuple[Optional[str], List]:
+        """
+        Load the conversation's rolling summary and the messages it doesn't
+        cover yet, in Gemini's history format.
+        """
         
-        statement = select(Message).where(
-            Message.conversation_id == conversation_id,
+        # Only role and content are needed; skip hydrating the tool JSON columns
+        statement = select(Message.role, Message.content).where(
+            Message.conversation_id == conversation.id,
             Message.role.in_(["user", "assistant"])
-        ).order_by(Message.created_at.desc()).limit(limit)
+        )
+        if conversation.summarized_through:
+            statement = statement.where(Message.created_at > conversation.summarized_through)
         
-        messages = self.db.exec(statement).all()
+        messages = self.db.exec(statement.order_by(Message.created_at.desc()).limit(limit)).all()
         messages.reverse()  # Chronological order
         
         history = []
-        for msg in messages:
-            role = "user" if msg.role == "user" else "model"
+        for msg_role, content in messages:
+            role = "user" if msg_role == "user" else "model"
             history.append({
                 "role": role,
-                "parts": [msg.content]
+                "parts": [content]
             })
         
-        return history
+        return conversation.rolling_summary, history
+    
+    def _gemini_history(self, history: List) -> List:
+        """Gemini has no per-turn system message, so the summary opens the history instead."""
+        if not self._history_summary:
+            return history
+        return [
+            {"role": "user", "parts": [f"[Summary of our earlier conversation: {self._history_summary}]"]},
+            {"role": "model", "parts": ["Got it."]},
+        ] + history
     
     def _save_message(self, conversation_id: uuid.UUID, role: str, content: str,
                       tool_name: str = None, tool_arguments: Dict = None,
@@ -1,6 +1,5 @@
 """Simple LLM wrapper for agents."""
 import os
-import google.generativeai as genai
 from app.core.config import settings
 from typing import Optional
 
@@ -13,6 +12,7 @@ async def call_llm(prompt: str) -> str:
     # 1. Try Gemini
     if GEMINI_KEY:
         try:
+            import google.generativeai as genai
             genai.configure(api_key=GEMINI_KEY)
             model = genai.GenerativeModel('gemini-2.0-flash')
             resp = model.generate_content(prompt)
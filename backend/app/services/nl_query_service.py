@@ -21,7 +21,6 @@ from app.models.content_pattern import ContentPattern
 from app.core.config import settings
 from app.services.analysis_engine import AnalysisEngine
 import re
-import google.generativeai as genai
 
 
 class NLQueryService:
@@ -106,6 +105,7 @@ class NLQueryService:
         gemini_key = settings.GEMINI_API_KEY or settings.GOOGLE_API_KEY or os.getenv("GEMINI_API_KEY")
         if gemini_key and not self._gemini_model:
             try:
+                import google.generativeai as genai
                 genai.configure(api_key=gemini_key)
                 self._gemini_model = genai.GenerativeModel('gemini-2.0-flash')
                 self._model_provider = "gemini"
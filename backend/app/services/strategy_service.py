@@ -7,11 +7,13 @@ Decision Intelligence layer that provides:
 - Feedback loop for continuous learning
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from sqlmodel import Session
+from sqlmodel import Session, func, select, update
+from app.models.strategy import ActionCategory, ActionStatus, StrategyAction, WeeklyStrategy
 from app.services.intelligence_service import IntelligenceService
 import statistics
+import uuid
 
 
 class StrategyService:
@@ -170,67 +172,57 @@ class StrategyService:
         
         # Action 1: Repeat top content
         actions.append({
-            "id": "action-1",
             "action_type": "repeat_post",
             "title": "Repurpose Your Top Thread",
             "description": "Your Twitter threads get 1.6× more shares. Turn your best-performing thread into a LinkedIn carousel.",
             "priority": 1,
             "category": "content",
             "predicted_impact": "+60% engagement",
-            "status": "pending",
             "recommended_time": self._get_next_optimal_slot([20], ["tuesday", "wednesday"]),
         })
         
         # Action 2: Optimal timing
         optimal = self.get_optimal_posting_window()
         actions.append({
-            "id": "action-2",
             "action_type": "change_timing",
             "title": "Post at Peak Time",
             "description": f"Schedule your next post for {optimal['next_optimal_slot']}. Posts at this time get 1.8× more reach.",
             "priority": 1,
             "category": "timing",
             "predicted_impact": "+80% reach",
-            "status": "pending",
             "recommended_time": optimal['next_optimal_slot'],
         })
         
         # Action 3: Content type suggestion
         actions.append({
-            "id": "action-3",
             "action_type": "post_content",
             "title": "Create Story-Driven Content",
             "description": "Posts with personal stories perform 2.3× better. Share a lesson learned or behind-the-scenes moment.",
             "priority": 2,
             "category": "content",
             "predicted_impact": "+130% engagement",
-            "status": "pending",
             "recommended_time": None,
         })
         
         # Action 4: Platform focus
         actions.append({
-            "id": "action-4",
             "action_type": "switch_platform",
             "title": "Focus on Your Winning Platform",
             "description": "Twitter is your best-performing platform. Cross-post your LinkedIn insights there.",
             "priority": 2,
             "category": "platform",
             "predicted_impact": "+40% overall reach",
-            "status": "pending",
             "recommended_time": None,
         })
         
         # Action 5: Engagement technique
         actions.append({
-            "id": "action-5",
             "action_type": "post_content",
             "title": "End Posts with Questions",
             "description": "Posts with questions drive 1.6× more comments. Add a thought-provoking question to your next post.",
             "priority": 3,
             "category": "engagement",
             "predicted_impact": "+60% comments",
-            "status": "pending",
             "recommended_time": None,
         })
         
@@ -242,11 +234,21 @@ class StrategyService:
             "key_objective": "Increase engagement through story-driven content"
         }
         
+        # Stored rows give the actions ids the feedback endpoints accept
+        week = self._persist_plan(actions)
+        
+        # Stored totals, kept current by _transition_action
+        progress = {
+            "actions_taken": week.actions_taken if week else 0,
+            "actions_skipped": week.actions_skipped if week else 0,
+        }
+        
         return {
             "status": "success",
             "week_of": datetime.now().strftime("%B %d, %Y"),
             "actions": actions,
             "goals": weekly_goals,
+            "progress": progress,
             "total_actions": len(actions),
             "high_priority": len([a for a in actions if a["priority"] == 1]),
             "prediction_confidence": 0.75
@@ -256,9 +258,127 @@ class StrategyService:
     # FEEDBACK LOOP
     # ========================================
     
-    def record_action_taken(self, action_id: str) -> Dict[str, Any]:
-        """Mark an action as taken."""
-        # In production, update DB
+    @staticmethod
+    def _week_bounds() -> Tuple[datetime, datetime]:
+        """Monday 00:00 UTC of the current week and the Monday after."""
+        now = datetime.utcnow()
+        start = datetime(now.year, now.month, now.day) - timedelta(days=now.weekday())
+        return start, start + timedelta(days=7)
+    
+    def _persist_plan(self, actions: List[Dict[str, Any]]) -> WeeklyStrategy:
+        """
+        Store this week's WeeklyStrategy and one StrategyAction per planned
+        action (matched by title, so regenerating the plan reuses them), then
+        fill in each action's public id and current status.
+        """
+        week_start, week_end = self._week_bounds()
+        week = self._current_week()
+        if week is None:
+            week = WeeklyStrategy(user_id=self.user_id, week_start=week_start, week_end=week_end)
+            self.db.add(week)
+        
+        rows = {
+            row.title: row
+            for row in self.db.exec(
+                select(StrategyAction).where(
+                    StrategyAction.user_id == self.user_id,
+                    StrategyAction.created_at >= week_start
+                )
+            ).all()
+        }
+        for action in actions:
+            if action["title"] not in rows:
+                row = StrategyAction(
+                    user_id=self.user_id,
+                    action_type=action["action_type"],
+                    title=action["title"],
+                    description=action["description"],
+                    priority=action["priority"],
+                    category=ActionCategory(action["category"]),
+                    predicted_impact=action["predicted_impact"],
+                    expires_at=week_end
+                )
+                self.db.add(row)
+                rows[row.title] = row
+        if self.db.new:
+            self.db.commit()
+        
+        for action in actions:
+            row = rows[action["title"]]
+            action["id"] = str(row.public_id)
+            action["status"] = ActionStatus(row.status).value
+        return week
+    
+    def _current_week(self) -> Optional[WeeklyStrategy]:
+        now = datetime.utcnow()
+        return self.db.exec(
+            select(WeeklyStrategy).where(
+                WeeklyStrategy.user_id == self.user_id,
+                WeeklyStrategy.week_start <= now,
+                WeeklyStrategy.week_end > now
+            )
+        ).first()
+    
+    def get_action_status(self, action_id: str) -> Optional[ActionStatus]:
+        """Status of one of the user's actions, or None if it doesn't exist."""
+        try:
+            action_uuid = uuid.UUID(action_id)
+        except ValueError:
+            return None
+        return self.db.exec(
+            select(StrategyAction.status).where(
+                StrategyAction.public_id == action_uuid,
+                StrategyAction.user_id == self.user_id
+            )
+        ).first()
+    
+    def _transition_action(self, action_id: str, status: str, counter: str) -> bool:
+        """
+        Move a pending StrategyAction to `status` and bump the matching
+        WeeklyStrategy counter in the same transaction, so the weekly summary
+        reads stored totals instead of re-aggregating actions.
+        Returns False if the action doesn't exist or was already resolved.
+        """
+        try:
+            action_uuid = uuid.UUID(action_id)
+        except ValueError:
+            return False
+        
+        now = datetime.utcnow()
+        values = {"status": status}
+        if status == "taken":
+            values["taken_at"] = now
+        result = self.db.exec(
+            update(StrategyAction)
+            .where(
+                StrategyAction.public_id == action_uuid,
+                StrategyAction.user_id == self.user_id,
+                StrategyAction.status == "pending"
+            )
+            .values(**values)
+        )
+        if result.rowcount != 1:
+            self.db.rollback()
+            return False
+        
+        # Relative UPDATE so concurrent transitions compose
+        column = getattr(WeeklyStrategy, counter)
+        self.db.exec(
+            update(WeeklyStrategy)
+            .where(
+                WeeklyStrategy.user_id == self.user_id,
+                WeeklyStrategy.week_start <= now,
+                WeeklyStrategy.week_end > now
+            )
+            .values({counter: func.coalesce(column, 0) + 1})
+        )
+        self.db.commit()
+        return True
+    
+    def record_action_taken(self, action_id: str) -> Optional[Dict[str, Any]]:
+        """Mark a pending action as taken. Returns None if it wasn't pending."""
+        if not self._transition_action(action_id, "taken", "actions_taken"):
+            return None
         return {
             "status": "success",
             "action_id": action_id,
@@ -266,6 +386,16 @@ class StrategyService:
             "message": "Action recorded! Record the outcome after 24-48 hours for better predictions."
         }
     
+    def record_action_skipped(self, action_id: str) -> Optional[Dict[str, Any]]:
+        """Mark a pending action as skipped. Returns None if it wasn't pending."""
+        if not self._transition_action(action_id, "skipped", "actions_skipped"):
+            return None
+        return {
+            "status": "success",
+            "action_id": action_id,
+            "message": "Action skipped. We'll weigh similar recommendations lower."
+        }
+    
     def record_outcome(
         self, 
         action_id: str, 
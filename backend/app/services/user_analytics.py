@@ -4,7 +4,7 @@ Provides per-user, isolated analytics with AI-powered insights.
 """
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
 from pydantic import BaseModel
 
 from app.models.user import User
@@ -78,6 +78,28 @@ class UserAnalyticsService:
         self.user = user
         self.user_id = str(user.id)
     
+    def _latest_per_platform(self) -> list:
+        """
+        Newest scrape per platform in one query. Only reads columns carried by
+        ix_scraped_analytics_user_platform_scraped_at, so Postgres can answer
+        it with an index-only scan.
+        """
+        ranked = select(
+            ScrapedAnalytics.platform,
+            ScrapedAnalytics.views,
+            ScrapedAnalytics.followers,
+            ScrapedAnalytics.subscribers,
+            ScrapedAnalytics.engagement_rate,
+            ScrapedAnalytics.watch_time_minutes,
+            ScrapedAnalytics.scraped_at,
+            func.row_number().over(
+                partition_by=ScrapedAnalytics.platform,
+                order_by=ScrapedAnalytics.scraped_at.desc()
+            ).label("rn")
+        ).where(ScrapedAnalytics.user_id == self.user_id).subquery()
+        
+        return self.db.exec(select(*ranked.c).where(ranked.c.rn == 1)).all()
+    
     def get_dashboard_data(self, days: int = 30) -> DashboardData:
         """Get complete dashboard data for the user."""
         
@@ -104,26 +126,10 @@ class UserAnalyticsService:
         """Calculate overall metrics summary."""
         
         # Get latest scraped data per platform
-        platforms_statement = select(ScrapedAnalytics.platform).where(
-            ScrapedAnalytics.user_id == self.user_id
-        ).distinct()
-        platforms = self.db.exec(platforms_statement).all()
-        
-        total_views = 0
-        total_followers = 0
+        platforms = self._latest_per_platform()
         
-        for platform in platforms:
-            latest = self.db.exec(
-                select(ScrapedAnalytics)
-                .where(ScrapedAnalytics.user_id == self.user_id)
-                .where(ScrapedAnalytics.platform == platform)
-                .order_by(ScrapedAnalytics.scraped_at.desc())
-                .limit(1)
-            ).first()
-            
-            if latest:
-                total_views += latest.views or 0
-                total_followers += latest.followers or 0
+        total_views = sum(latest.views or 0 for latest in platforms)
+        total_followers = sum(latest.followers or 0 for latest in platforms)
         
         # Get content performance
         drafts = self.db.exec(
@@ -184,48 +190,35 @@ class UserAnalyticsService:
     def _get_platform_metrics(self) -> List[PlatformMetrics]:
         """Get metrics for each connected platform."""
         
-        platforms_statement = select(ScrapedAnalytics.platform).where(
-            ScrapedAnalytics.user_id == self.user_id
-        ).distinct()
-        platforms = self.db.exec(platforms_statement).all()
-        
         metrics = []
         
-        for platform in platforms:
-            latest = self.db.exec(
-                select(ScrapedAnalytics)
+        for latest in self._latest_per_platform():
+            platform = latest.platform
+            # Calculate growth for this platform
+            seven_days_ago = datetime.utcnow() - timedelta(days=7)
+            week_old_views = self.db.exec(
+                select(ScrapedAnalytics.views)
                 .where(ScrapedAnalytics.user_id == self.user_id)
                 .where(ScrapedAnalytics.platform == platform)
+                .where(ScrapedAnalytics.scraped_at <= seven_days_ago)
                 .order_by(ScrapedAnalytics.scraped_at.desc())
                 .limit(1)
             ).first()
             
-            if latest:
-                # Calculate growth for this platform
-                seven_days_ago = datetime.utcnow() - timedelta(days=7)
-                week_old = self.db.exec(
-                    select(ScrapedAnalytics)
-                    .where(ScrapedAnalytics.user_id == self.user_id)
-                    .where(ScrapedAnalytics.platform == platform)
-                    .where(ScrapedAnalytics.scraped_at <= seven_days_ago)
-                    .order_by(ScrapedAnalytics.scraped_at.desc())
-                    .limit(1)
-                ).first()
-                
-                growth = 0.0
-                if week_old and week_old.views and latest.views:
-                    growth = round(((latest.views - week_old.views) / week_old.views) * 100, 1)
-                
-                metrics.append(PlatformMetrics(
-                    platform=platform,
-                    views=latest.views or 0,
-                    followers=latest.followers or 0,
-                    subscribers=latest.subscribers or 0,
-                    engagement_rate=latest.engagement_rate or 0.0,
-                    watch_time_hours=(latest.watch_time_minutes or 0) / 60,
-                    last_updated=latest.scraped_at,
-                    growth_percent=growth
-                ))
+            growth = 0.0
+            if week_old_views and latest.views:
+                growth = round(((latest.views - week_old_views) / week_old_views) * 100, 1)
+            
+            metrics.append(PlatformMetrics(
+                platform=platform,
+                views=latest.views or 0,
+                followers=latest.followers or 0,
+                subscribers=latest.subscribers or 0,
+                engagement_rate=latest.engagement_rate or 0.0,
+                watch_time_hours=(latest.watch_time_minutes or 0) / 60,
+                last_updated=latest.scraped_at,
+                growth_percent=growth
+            ))
         
         return metrics
     
@@ -1,5 +1,4 @@
 from typing import Dict, Any
-import google.generativeai as genai
 from app.core.config import settings
 import base64
 import json
@@ -22,6 +21,7 @@ class VisionAIService:
                     "market_prediction": "Configuration Error"
                 }
 
+            import google.generativeai as genai
             genai.configure(api_key=api_key)
             # Use Gemini 2.0 Flash for stability and speed
             model = genai.GenerativeModel('gemini-2.0-flash')
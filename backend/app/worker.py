@@ -57,15 +57,14 @@ def publish_post(draft_id: str):
 
         # Get OAuth Token
         account = get_user_token(db, draft.user_id, draft.platform)
-        if not account or not account.get_access_token():
+        token = account.get_access_token() if account else None
+        if not token:
             logger.error(f"No active OAuth token for user {draft.user_id} on {draft.platform}")
             draft.status = "failed"
             draft.ai_analysis = {"error": "Missing or expired OAuth token"}
             db.add(draft)
             db.commit()
             return "missing_token"
-            
-        token = account.get_access_token()
 
         # Platform specific publishing logic
         try:
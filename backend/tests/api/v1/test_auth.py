@@ -1,6 +1,15 @@
+import asyncio
+import time
+import uuid
+from unittest.mock import MagicMock
 
+import pytest
 from fastapi.testclient import TestClient
 
+from app.core import cache, security
+from app.core.dependencies import AuthError, get_token_user, get_user_from_header
+from app.models.user import User
+
 def test_register_user(client: TestClient):
     response = client.post(
         "/api/v1/auth/register",
@@ -50,3 +59,92 @@ def test_login_invalid_credentials(client: TestClient):
         }
     )
     assert response.status_code == 401
+
+
+def _claims_token(active=True):
+    return security.create_access_token(
+        subject="claims@example.com",
+        claims={"uid": str(uuid.uuid4()), "tier": "pro", "active": active},
+    )
+
+
+def _token_user(token):
+    return asyncio.run(get_token_user(token, db=None))
+
+
+def test_token_user_from_claims():
+    cache.redis_client.mget.return_value = [None, None]
+    user = _token_user(_claims_token())
+    assert user.email == "claims@example.com"
+    assert user.tier == "pro"
+
+
+def test_token_user_rejects_revoked_jti():
+    cache.redis_client.mget.return_value = [b"1", None]
+    with pytest.raises(AuthError, match="revoked"):
+        _token_user(_claims_token())
+
+
+def test_token_user_rejects_inactive_claim():
+    cache.redis_client.mget.return_value = [None, None]
+    with pytest.raises(AuthError, match="disabled"):
+        _token_user(_claims_token(active=False))
+
+
+def test_token_user_rejects_tokens_issued_before_account_change():
+    cache.redis_client.mget.return_value = [None, str(int(time.time() * 1000) + 1).encode()]
+    with pytest.raises(AuthError, match="revoked"):
+        _token_user(_claims_token())
+
+
+def test_token_user_accepts_token_issued_right_after_account_change():
+    changed_at_ms = int(time.time() * 1000)
+    time.sleep(0.002)
+    token = _claims_token()
+    cache.redis_client.mget.return_value = [None, str(changed_at_ms).encode()]
+    assert _token_user(token).email == "claims@example.com"
+
+
+def test_deactivating_user_invalidates_tokens(session, monkeypatch):
+    sync_redis = MagicMock()
+    monkeypatch.setattr(cache, "sync_redis_client", sync_redis)
+    user = User(email="deactivate@example.com", full_name="Deactivated User", hashed_password="x")
+    session.add(user)
+    session.commit()
+    sync_redis.set.assert_not_called()
+
+    user.is_active = False
+    session.add(user)
+    session.commit()
+    assert sync_redis.set.call_args.args[0] == f"auth:user_changed:{user.id}"
+
+
+def test_me_rejects_revoked_token(client: TestClient):
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": "me@example.com", "password": "mepassword", "full_name": "Me User"}
+    )
+    token = client.post(
+        "/api/v1/auth/login", data={"username": "me@example.com", "password": "mepassword"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    cache.redis_client.mget.return_value = [None, None]
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    cache.redis_client.mget.return_value = [b"1", None]
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
+
+
+def test_header_user_rejects_revoked_token(session, monkeypatch):
+    sync_redis = MagicMock()
+    sync_redis.mget.return_value = [b"1", None]
+    monkeypatch.setattr(cache, "sync_redis_client", sync_redis)
+    user = User(email="header@example.com", full_name="Header User", hashed_password="x")
+    session.add(user)
+    session.commit()
+    token = security.create_access_token(subject=user.email, claims={"uid": str(user.id)})
+
+    assert get_user_from_header(f"Bearer {token}", session) is None
+    sync_redis.mget.return_value = [None, None]
+    assert get_user_from_header(f"Bearer {token}", session).id == user.id
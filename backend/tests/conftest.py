@@ -4,7 +4,7 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session, create_engine, SQLModel
 from app.main import app
 from app.db.session import get_session
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock
 from sqlalchemy.pool import StaticPool
 # Import all models to ensure they are registered with SQLModel
 
@@ -49,8 +49,8 @@ def mock_dependencies(monkeypatch):
     """
     Mock external dependencies like Redis and Rate Limiter.
     """
-    # Mock Redis for Cache
-    mock_redis = MagicMock()
+    # Mock Redis for Cache (async client)
+    mock_redis = AsyncMock()
     mock_redis.get.return_value = None
     monkeypatch.setattr("app.core.cache.redis_client", mock_redis)
 
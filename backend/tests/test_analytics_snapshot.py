@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from app.models.analytics_snapshot import SNAPSHOT_MAX_AGE, UserAnalyticsSnapshot, invalidate_analytics_snapshot
+from app.models.scraped_analytics import ScrapedAnalytics
+from app.services.agent_service import CreatorAgent
+
+
+def _summary(session):
+    return CreatorAgent(session, "u1")._load_analytics_summary(30, "all")
+
+
+def test_snapshot_is_recomputed_after_invalidation(session):
+    assert _summary(session)["has_data"] is False
+    assert session.get(UserAnalyticsSnapshot, "u1") is not None
+
+    session.add(ScrapedAnalytics(user_id="u1", platform="youtube", views=120))
+    invalidate_analytics_snapshot(session, "u1")
+    session.commit()
+
+    summary = _summary(session)
+    assert summary["has_data"] is True
+    assert summary["total_views"] == 120
+
+
+def test_snapshot_past_max_age_is_recomputed(session):
+    _summary(session)
+    # Data that landed without an invalidation, e.g. while the summary was computed
+    session.add(ScrapedAnalytics(user_id="u1", platform="youtube", views=50))
+    session.commit()
+    assert _summary(session)["has_data"] is False
+
+    snapshot = session.get(UserAnalyticsSnapshot, "u1")
+    snapshot.updated_at = datetime.utcnow() - SNAPSHOT_MAX_AGE
+    session.add(snapshot)
+    session.commit()
+    assert _summary(session)["total_views"] == 50
+
+
+def test_snapshot_deleted_while_recomputing_is_recreated(session):
+    _summary(session)
+    snapshot = session.get(UserAnalyticsSnapshot, "u1")
+    snapshot.updated_at = datetime.utcnow() - SNAPSHOT_MAX_AGE
+    session.add(snapshot)
+    session.commit()
+
+    agent = CreatorAgent(session, "u1")
+    compute = agent._compute_analytics_summary
+
+    def compute_during_invalidation(days, platform):
+        # A sync request invalidates between the snapshot read and the write
+        invalidate_analytics_snapshot(session, "u1")
+        session.commit()
+        return compute(days, platform)
+
+    agent._compute_analytics_summary = compute_during_invalidation
+    assert agent._load_analytics_summary(30, "all")["has_data"] is False
+    assert session.get(UserAnalyticsSnapshot, "u1").is_current()
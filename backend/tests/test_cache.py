@@ -0,0 +1,124 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import orjson
+from sqlmodel import Session
+
+from app.core import cache
+from app.core.cache import build_cache_key, cache_response
+
+
+class FakePipeline:
+    """Async-context stand-in for redis_client.pipeline() that records SETs."""
+
+    def __init__(self, stored):
+        self.stored = stored
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, **kwargs):
+        self.stored[key] = value
+
+    def delete(self, key):
+        pass
+
+    async def execute(self):
+        return []
+
+
+def test_cache_key_varies_by_endpoint_and_params():
+    base = build_cache_key("app.api.v1.strategy.get_optimal_window", (), {"user_id": "u1", "platform": "all", "db": object()})
+    same = build_cache_key("app.api.v1.strategy.get_optimal_window", (), {"user_id": "u1", "platform": "all", "db": object()})
+    other_param = build_cache_key("app.api.v1.strategy.get_optimal_window", (), {"user_id": "u1", "platform": "youtube"})
+    other_endpoint = build_cache_key("app.api.v1.strategy.get_weekly_plan", (), {"user_id": "u1", "platform": "all"})
+
+    assert base == same
+    assert base != other_param
+    assert base != other_endpoint
+    assert ":u1:" in base
+
+
+def test_cache_response_returns_cached_payload():
+    cache.redis_client.get.return_value = orjson.dumps({"data": {"cached": True}, "stale_at": time.time() + 60})
+
+    @cache_response(expire_seconds=60)
+    async def endpoint(user_id: str):
+        return {"cached": False}
+
+    assert asyncio.run(endpoint(user_id="u1")) == {"cached": True}
+
+
+def test_cache_response_collapses_concurrent_misses():
+    calls = 0
+
+    @cache_response(expire_seconds=60)
+    async def endpoint(user_id: str):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"calls": calls}
+
+    async def burst():
+        # The first caller computes; the rest wait on it and re-read the cache
+        stored = {}
+
+        async def fake_get(key):
+            return stored.get(key)
+
+        cache.redis_client.pipeline = MagicMock(return_value=FakePipeline(stored))
+        cache.redis_client.set.return_value = True
+        cache.redis_client.get.side_effect = fake_get
+        try:
+            return await asyncio.gather(*(endpoint(user_id="u1") for _ in range(5)))
+        finally:
+            cache.redis_client.get.side_effect = None
+
+    results = asyncio.run(burst())
+    assert calls == 1
+    assert all(r == {"calls": 1} for r in results)
+
+
+def test_cache_dumps_pydantic_and_decimal_like_fastapi():
+    from decimal import Decimal
+    from pydantic import BaseModel
+
+    class Point(BaseModel):
+        x: int
+        label: str
+
+    payload = cache.dumps({"points": [Point(x=1, label="a")], "score": Decimal("1.5")})
+    assert orjson.loads(payload) == {"points": [{"x": 1, "label": "a"}], "score": 1.5}
+
+
+def test_stale_refresh_uses_its_own_session():
+    request_db = Session(cache.engine)
+    seen = []
+
+    @cache_response(expire_seconds=60)
+    async def endpoint(user_id: str, db: Session):
+        seen.append(db)
+        return {"fresh": True}
+
+    stored = {}
+
+    async def serve_stale():
+        cache.redis_client.pipeline = MagicMock(return_value=FakePipeline(stored))
+        cache.redis_client.get.return_value = orjson.dumps({"data": {"fresh": False}, "stale_at": time.time() - 1})
+        cache.redis_client.set.return_value = True
+        try:
+            result = await endpoint(user_id="u1", db=request_db)
+            await asyncio.gather(*cache._refresh_tasks)
+        finally:
+            cache.redis_client.get.return_value = None
+        return result
+
+    assert asyncio.run(serve_stale()) == {"fresh": False}
+    assert len(seen) == 1
+    assert isinstance(seen[0], Session) and seen[0] is not request_db
+    key = build_cache_key(f"{endpoint.__module__}.{endpoint.__qualname__}", (), {"user_id": "u1", "db": request_db})
+    assert orjson.loads(stored[key])["data"] == {"fresh": True}
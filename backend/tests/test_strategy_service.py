@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+from sqlmodel import select
+
+from app.models.strategy import ActionStatus, StrategyAction, WeeklyStrategy
+from app.services.strategy_service import StrategyService
+
+
+def _seed(session, user_id="u1"):
+    now = datetime.utcnow()
+    action = StrategyAction(user_id=user_id, action_type="post_content", title="Post", description="Post a thread")
+    week = WeeklyStrategy(user_id=user_id, week_start=now - timedelta(days=1), week_end=now + timedelta(days=6))
+    session.add(action)
+    session.add(week)
+    session.commit()
+    return str(action.public_id), week.id
+
+
+def test_record_action_taken_updates_action_and_weekly_counter(session):
+    action_id, week_id = _seed(session)
+    service = StrategyService(session, "u1")
+
+    assert service.record_action_taken(action_id)["status"] == "success"
+
+    session.expire_all()
+    action = session.exec(select(StrategyAction)).one()
+    assert action.status == ActionStatus.TAKEN
+    assert action.taken_at is not None
+    assert session.get(WeeklyStrategy, week_id).actions_taken == 1
+
+    # Already resolved, and other users can't touch it
+    assert service.record_action_taken(action_id) is None
+    assert service.record_action_skipped(action_id) is None
+    assert StrategyService(session, "u2").record_action_taken(action_id) is None
+    session.expire_all()
+    assert session.get(WeeklyStrategy, week_id).actions_taken == 1
+    assert service.generate_weekly_strategy()["progress"] == {"actions_taken": 1, "actions_skipped": 0}
+
+
+def test_record_action_skipped_updates_weekly_counter(session):
+    action_id, week_id = _seed(session)
+    service = StrategyService(session, "u1")
+
+    assert service.record_action_skipped(action_id)["status"] == "success"
+
+    session.expire_all()
+    assert service.get_action_status(action_id) == ActionStatus.SKIPPED
+    assert session.get(WeeklyStrategy, week_id).actions_skipped == 1
+
+
+def test_weekly_plan_persists_actions_with_usable_ids(session):
+    service = StrategyService(session, "u1")
+    plan = service.generate_weekly_strategy()
+    ids = [action["id"] for action in plan["actions"]]
+    assert len(set(ids)) == len(ids) == 5
+
+    # Regenerating reuses the stored actions
+    assert [action["id"] for action in service.generate_weekly_strategy()["actions"]] == ids
+
+    assert service.record_action_taken(ids[0])["status"] == "success"
+    plan = service.generate_weekly_strategy()
+    assert plan["actions"][0]["status"] == "taken"
+    assert plan["progress"] == {"actions_taken": 1, "actions_skipped": 0}
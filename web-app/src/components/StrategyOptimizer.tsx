@@ -1,5 +1,6 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useMemo } from 'react';
 import axios from 'axios';
+import { useAuth } from '../AuthContext';
 import {
     Target, Zap, Clock, TrendingUp, CheckCircle2,
     Sparkles, BarChart3, Brain,
@@ -49,16 +50,22 @@ interface StrategyOptimizerProps {
 }
 
 export default function StrategyOptimizer({ userId }: StrategyOptimizerProps) {
+    const { token } = useAuth();
     const [weeklyPlan, setWeeklyPlan] = useState<WeeklyPlan | null>(null);
     const [learning, setLearning] = useState<LearningProgress | null>(null);
     const [loading, setLoading] = useState(true);
     const [actionStates, setActionStates] = useState<Record<string, string>>({});
 
+    const authHeaders = useMemo(
+        () => (token ? { Authorization: `Bearer ${token}` } : {}),
+        [token]
+    );
+
     const fetchData = useCallback(async () => {
         setLoading(true);
         try {
             const [planRes, learningRes] = await Promise.all([
-                axios.get(`${API_BASE}/strategy/weekly-plan/${userId}`),
+                axios.get(`${API_BASE}/strategy/weekly-plan/${userId}`, { headers: authHeaders }),
                 axios.get(`${API_BASE}/strategy/learning/${userId}`)
             ]);
             setWeeklyPlan(planRes.data);
@@ -68,7 +75,7 @@ export default function StrategyOptimizer({ userId }: StrategyOptimizerProps) {
         } finally {
             setLoading(false);
         }
-    }, [userId]);
+    }, [userId, authHeaders]);
 
     useEffect(() => {
         fetchData();
@@ -77,14 +84,19 @@ export default function StrategyOptimizer({ userId }: StrategyOptimizerProps) {
     const handleActionTaken = async (actionId: string) => {
         setActionStates(prev => ({ ...prev, [actionId]: 'taken' }));
         try {
-            await axios.post(`${API_BASE}/strategy/actions/${actionId}/taken`);
+            await axios.post(`${API_BASE}/strategy/actions/${actionId}/taken`, null, { headers: authHeaders });
         } catch (error) {
             console.error('Failed to record action:', error);
         }
     };
 
-    const handleActionSkipped = (actionId: string) => {
+    const handleActionSkipped = async (actionId: string) => {
         setActionStates(prev => ({ ...prev, [actionId]: 'skipped' }));
+        try {
+            await axios.post(`${API_BASE}/strategy/actions/${actionId}/skipped`, null, { headers: authHeaders });
+        } catch (error) {
+            console.error('Failed to record skipped action:', error);
+        }
     };
 
     const getCategoryIcon = (category: string) => {
@@ -181,7 +193,8 @@ export default function StrategyOptimizer({ userId }: StrategyOptimizerProps) {
                 </div>
 
                 {weeklyPlan?.actions?.map((action) => {
-                    const state = actionStates[action.id];
+                    // Local choice first; the plan carries statuses saved earlier
+                    const state = actionStates[action.id] ?? action.status;
                     const isCompleted = state === 'taken';
                     const isSkipped = state === 'skipped';
 